@@ -2,9 +2,13 @@
     Put this script in the root folder of your repo and it will
     zip up all addon folders, create a new zip in your zips folder
     and then update the md5 and addons.xml file
+
+    Run with --reproducible to get byte-identical zips for unchanged
+    addons and a zips.json sha256 manifest next to addons.xml
 """
 
 import hashlib
+import json
 import os
 import shutil
 import sys
@@ -23,6 +27,11 @@ IGNORE = [
     ".idea",
     "venv",
 ]
+# Used by the reproducible mode so identical sources give byte-identical zips
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ZIP_FILE_MODE = 0o644
+ZIP_COMPRESS_LEVEL = 9
+MANIFEST_NAME = "zips.json"
 _COLOR_ESCAPE = "\x1b[{}m"
 _COLORS = {
     "black": "30",
@@ -138,11 +147,13 @@ class Generator:
     the checked-out repo.
     """
 
-    def __init__(self, release):
+    def __init__(self, release, reproducible=False):
         self.release_path = release
+        self.reproducible = reproducible
         self.zips_path = os.path.join(self.release_path, "zips")
         addons_xml_path = os.path.join(self.zips_path, "addons.xml")
         md5_path = os.path.join(self.zips_path, "addons.xml.md5")
+        manifest_path = os.path.join(self.zips_path, MANIFEST_NAME)
 
         if not os.path.exists(self.zips_path):
             os.makedirs(self.zips_path)
@@ -157,6 +168,13 @@ class Generator:
             if self._generate_md5_file(addons_xml_path, md5_path):
                 print("Successfully updated {}".format(color_text(md5_path, 'yellow')))
 
+        if self.reproducible and self._generate_manifest_file(
+            addons_xml_path, manifest_path
+        ):
+            print(
+                "Successfully updated {}".format(color_text(manifest_path, 'yellow'))
+            )
+
     def _remove_binaries(self):
         """
         Removes any and all compiled Python files before operations.
@@ -207,32 +225,17 @@ class Generator:
 
         final_zip = os.path.join(zip_folder, "{0}-{1}.zip".format(addon_id, version))
         if not os.path.exists(final_zip):
-            zip = zipfile.ZipFile(final_zip, "w", compression=zipfile.ZIP_DEFLATED)
             root_len = len(os.path.dirname(os.path.abspath(addon_folder)))
+            entries = self._collect_files(addon_folder, root_len)
 
-            for root, dirs, files in os.walk(addon_folder):
-                # remove any unneeded artifacts
-                for i in IGNORE:
-                    if i in dirs:
-                        try:
-                            dirs.remove(i)
-                        except:
-                            pass
-                    for f in files:
-                        if f.startswith(i):
-                            try:
-                                files.remove(f)
-                            except:
-                                pass
-
-                archive_root = os.path.abspath(root)[root_len:]
-
-                for f in files:
-                    fullpath = os.path.join(root, f)
-                    archive_name = os.path.join(archive_root, f)
+            if self.reproducible:
+                self._write_reproducible_zip(final_zip, entries)
+            else:
+                zip = zipfile.ZipFile(final_zip, "w", compression=zipfile.ZIP_DEFLATED)
+                for fullpath, archive_name in entries:
                     zip.write(fullpath, archive_name, zipfile.ZIP_DEFLATED)
+                zip.close()
 
-            zip.close()
             size = convert_bytes(os.path.getsize(final_zip))
             print(
                 "Zip created for {} ({}) - {}".format(
@@ -242,6 +245,56 @@ class Generator:
                 )
             )
 
+    def _collect_files(self, addon_folder, root_len):
+        """
+        Returns (fullpath, archive_name) pairs for every file of an addon folder.
+        Entries are sorted by archive name when running in reproducible mode.
+        """
+        entries = []
+        for root, dirs, files in os.walk(addon_folder):
+            # remove any unneeded artifacts
+            for i in IGNORE:
+                if i in dirs:
+                    try:
+                        dirs.remove(i)
+                    except:
+                        pass
+                for f in files[:]:
+                    if f.startswith(i):
+                        try:
+                            files.remove(f)
+                        except:
+                            pass
+
+            archive_root = os.path.abspath(root)[root_len:]
+
+            for f in files:
+                fullpath = os.path.join(root, f)
+                archive_name = os.path.join(archive_root, f)
+                entries.append((fullpath, archive_name))
+
+        if self.reproducible:
+            entries.sort(key=lambda entry: entry[1].replace(os.sep, "/"))
+        return entries
+
+    def _write_reproducible_zip(self, final_zip, entries):
+        """
+        Writes a zip whose bytes only depend on the file names and contents:
+        sorted entries, fixed timestamps and permissions and a fixed
+        compression level.
+        """
+        with zipfile.ZipFile(final_zip, "w", compression=zipfile.ZIP_DEFLATED) as zip:
+            for fullpath, archive_name in entries:
+                info = zipfile.ZipInfo(
+                    archive_name.replace(os.sep, "/").lstrip("/"), ZIP_DATE_TIME
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.create_system = 3
+                info.external_attr = (0o100000 | ZIP_FILE_MODE) << 16
+                with open(fullpath, "rb") as f:
+                    data = f.read()
+                zip.writestr(info, data, compresslevel=ZIP_COMPRESS_LEVEL)
+
     def _copy_meta_files(self, addon_id, addon_folder):
         """
         Copy the addon.xml and relevant art files into the relevant folders in the repository.
@@ -358,6 +411,46 @@ class Generator:
                 )
             )
 
+    def _generate_manifest_file(self, addons_xml_path, manifest_path):
+        """
+        Generates a manifest with the sha256 of the current zip of every addon
+        listed in addons.xml, so mirrors and clients can skip identical archives.
+        """
+        try:
+            addons_root = ElementTree.parse(addons_xml_path).getroot()
+            manifest = {}
+            for addon in addons_root.findall("addon"):
+                id = addon.get("id")
+                version = addon.get("version")
+                name = "{0}-{1}.zip".format(id, version)
+                zip_path = os.path.join(self.zips_path, id, name)
+                if not os.path.exists(zip_path):
+                    continue
+
+                sha256 = hashlib.sha256()
+                with open(zip_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        sha256.update(chunk)
+
+                manifest[id] = {
+                    "version": version,
+                    "path": "{0}/{1}".format(id, name),
+                    "size": os.path.getsize(zip_path),
+                    "sha256": sha256.hexdigest(),
+                }
+
+            self._save_file(
+                json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                file=manifest_path,
+            )
+            return True
+        except Exception as e:
+            print(
+                "An error occurred updating {}!\n{}".format(
+                    color_text(manifest_path, 'yellow'), color_text(e, 'red')
+                )
+            )
+
     def _save_file(self, data, file):
         """
         Saves a file.
@@ -374,5 +467,6 @@ class Generator:
 
 
 if __name__ == "__main__":
+    reproducible = "--reproducible" in sys.argv[1:]
     for release in [r for r in KODI_VERSIONS if os.path.exists(r)]:
-        Generator(release)
+        Generator(release, reproducible=reproducible)
@@ -0,0 +1,69 @@
+"""
+    Compares the crypto backends of resolveurl.lib.crypto.
+
+    Run from the repo root:  python benchmarks/crypto_backends.py [size_kb]
+
+    The resolveurl package __init__ needs Kodi, so the package is registered
+    as a bare namespace and only resolveurl.lib.crypto and the pure python
+    code it falls back to are imported.
+"""
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOLVEURL = os.path.join(ROOT, 'repo', 'script.module.resolveurl', 'lib', 'resolveurl')
+
+for name, path in (('resolveurl', RESOLVEURL), ('resolveurl.lib', os.path.join(RESOLVEURL, 'lib'))):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [path]
+        sys.modules[name] = module
+
+from resolveurl.lib import crypto  # noqa: E402
+
+
+def _time(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 64 * 1024
+    key, iv, nonce = os.urandom(32), os.urandom(16), os.urandom(12)
+    data = os.urandom(size)
+    cbc = crypto.aes_cbc_encrypt(key, iv, data, backend=crypto.BACKEND_PYTHON)
+    gcm = crypto.aes_gcm_encrypt(key, nonce, data, backend=crypto.BACKEND_PYTHON)
+    evp = crypto.evp_encrypt(data, 'passphrase', backend=crypto.BACKEND_PYTHON)
+
+    cases = [
+        ('aes-cbc decrypt', lambda b: crypto.aes_cbc_decrypt(key, iv, cbc, backend=b)),
+        ('aes-gcm decrypt', lambda b: crypto.aes_gcm_decrypt(key, nonce, gcm, backend=b)),
+        ('evp decrypt', lambda b: crypto.evp_decrypt(evp, 'passphrase', backend=b)),
+    ]
+    backends = [crypto.BACKEND_PYTHON]
+    if crypto.BACKEND != crypto.BACKEND_PYTHON:
+        backends.insert(0, crypto.BACKEND)
+    else:
+        print('No native backend importable, install pycryptodome(x) or cryptography to compare')
+
+    print('payload: {0} KB'.format(size // 1024))
+    for label, func in cases:
+        results = []
+        for backend in backends:
+            assert func(backend) == data, '{0} {1} mismatch'.format(backend, label)
+            results.append((backend, _time(lambda: func(backend), 1 if backend == crypto.BACKEND_PYTHON else 3)))
+        line = ', '.join('{0}: {1:.1f} ms'.format(b, t * 1000) for b, t in results)
+        if len(results) > 1 and results[0][1]:
+            line += ' ({0:.0f}x)'.format(results[-1][1] / results[0][1])
+        print('{0:<16} {1}'.format(label, line))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+    Times resolveurl.lib.deobfuscate over the pages in deobfuscate_corpus/.
+
+    Run from the repo root:  python benchmarks/deobfuscate.py [rounds]
+
+    For every page it reports the old way (each decoder run on the whole
+    page, as the resolvers did), the first scan with an empty cache and a
+    scan of the same page again. The corpus pages are synthetic embed pages
+    built around the samples that ship with the decoders, padded with
+    ordinary markup to a typical page size.
+"""
+import os
+import re
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOLVEURL = os.path.join(ROOT, 'repo', 'script.module.resolveurl', 'lib', 'resolveurl')
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'deobfuscate_corpus')
+
+for name, path in (('resolveurl', RESOLVEURL), ('resolveurl.lib', os.path.join(RESOLVEURL, 'lib'))):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [path]
+        sys.modules[name] = module
+
+from resolveurl.lib import deobfuscate, jsunhunt, jsunpack, unjuice, unwise  # noqa: E402
+
+
+def legacy(html):
+    data = ''
+    for match in re.finditer(r'''(eval\s*\(function\(p,a,c,k,e,.*?)</script>''', html, re.DOTALL | re.I):
+        r = match.group(1)
+        t = re.findall(r'(eval\s*\(function\(p,a,c,k,e,)', r, re.DOTALL | re.IGNORECASE)
+        parts = [r] if len(t) == 1 else ['eval' + x for x in r.split('eval') if x]
+        for r in parts:
+            if jsunpack.detect(r):
+                data += jsunpack.unpack(r)
+    for match in re.finditer(r'(JuicyCodes\.Run.+?[;\n<])', html, re.DOTALL | re.I):
+        if unjuice.test(match.group(1)):
+            data += unjuice.run(match.group(1))
+    if jsunhunt.detect(html):
+        data += jsunhunt.unhunt(html)
+    data += unwise.unwise_process(html)
+    return data
+
+
+def _time(func, rounds):
+    start = time.time()
+    for _ in range(rounds):
+        func()
+    return (time.time() - start) * 1000.0 / rounds
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print('{0:<20} {1:>8} {2:>10} {3:>10} {4:>10}'.format('page', 'KB', 'old ms', 'cold ms', 'warm ms'))
+    totals = [0.0, 0.0, 0.0]
+    for name in sorted(os.listdir(CORPUS)):
+        with open(os.path.join(CORPUS, name), 'rb') as f:
+            html = f.read().decode('utf-8')
+
+        def cold():
+            deobfuscate.clear_cache()
+            deobfuscate.scan(html)
+
+        times = [_time(lambda: legacy(html), rounds), _time(cold, rounds)]
+        deobfuscate.scan(html)
+        times.append(_time(lambda: deobfuscate.scan(html), rounds))
+        totals = [a + b for a, b in zip(totals, times)]
+        print('{0:<20} {1:>8.1f} {2:>10.2f} {3:>10.2f} {4:>10.2f}'.format(name, len(html) / 1024.0, *times))
+    print('{0:<20} {1:>8} {2:>10.2f} {3:>10.2f} {4:>10.2f}'.format('total', '', *totals))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+    Measures pyjsparser parse throughput in KB/s.
+
+    Run from the repo root:  python benchmarks/pyjsparser_throughput.py [rounds]
+
+    The scripts are the player scripts found in the pages of
+    deobfuscate_corpus/ plus the code they unpack to, which is what the
+    extractors hand to the parser. For every script it reports a full parse,
+    extract() of the literal/assignment/call nodes and a parse() that hits
+    the memo, which still copies the tree. extract() is checked against the
+    same nodes picked out of the full parse.
+"""
+import json
+import os
+import re
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'deobfuscate_corpus')
+RESOLVEURL = os.path.join(ROOT, 'repo', 'script.module.resolveurl', 'lib', 'resolveurl')
+sys.path.insert(0, os.path.join(ROOT, 'repo', 'script.module.pyjsparser', 'lib'))
+
+for name, path in (('resolveurl', RESOLVEURL), ('resolveurl.lib', os.path.join(RESOLVEURL, 'lib'))):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [path]
+        sys.modules[name] = module
+
+import pyjsparser  # noqa: E402
+from resolveurl.lib import deobfuscate  # noqa: E402
+
+
+def load_scripts():
+    scripts = []
+    for name in sorted(os.listdir(CORPUS)):
+        with open(os.path.join(CORPUS, name), 'rb') as f:
+            html = f.read().decode('utf-8')
+        for i, script in enumerate(re.findall(r'<script[^>]*>(.*?)</script>', html, re.S)):
+            scripts.append(('{0}#{1}'.format(name, i), script))
+        for kind, text in deobfuscate.iter_blocks(html):
+            scripts.append(('{0}:{1}'.format(name, kind), text))
+    return scripts
+
+
+def _picked(node, types, found):
+    # post order, the order extract() returns nodes in
+    if isinstance(node, list):
+        for e in node:
+            _picked(e, types, found)
+    elif isinstance(node, dict):
+        for v in node.values():
+            _picked(v, types, found)
+        if node.get('type') in types:
+            found.append(node)
+    return found
+
+
+def check_extract(script):
+    key = lambda n: json.dumps(n, sort_keys=True)
+    expected = _picked(pyjsparser.PyJsParser().parse(script), pyjsparser.parser.EXTRACT_TYPES, [])
+    return sorted(map(key, expected)) == sorted(map(key, pyjsparser.extract(script)))
+
+
+def _rate(func, size, rounds):
+    start = time.time()
+    for _ in range(rounds):
+        func()
+    elapsed = (time.time() - start) / rounds
+    return size / 1024.0 / max(elapsed, 1e-9)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print('{0:<28} {1:>8} {2:>12} {3:>12} {4:>12} {5:>6}'.format(
+        'script', 'KB', 'parse KB/s', 'extract KB/s', 'memo KB/s', 'same'))
+    total = 0
+    totals = [0.0, 0.0, 0.0]
+    mismatched = 0
+    for name, script in load_scripts():
+        try:
+            pyjsparser.PyJsParser().parse(script)
+        except Exception:
+            continue  # not valid javascript on its own, e.g. unwise leftovers
+        size = len(script)
+
+        def full():
+            pyjsparser.PyJsParser().parse(script)
+
+        def subset():
+            pyjsparser.clear_cache()
+            pyjsparser.extract(script)
+
+        same = check_extract(script)
+        mismatched += not same
+        pyjsparser.parse(script)
+        rates = [_rate(full, size, rounds), _rate(subset, size, rounds),
+                 _rate(lambda: pyjsparser.parse(script), size, rounds * 20)]
+        total += size
+        totals = [t + size / 1024.0 / r for t, r in zip(totals, rates)]
+        print('{0:<28} {1:>8.1f} {2:>12.0f} {3:>12.0f} {4:>12.0f} {5:>6}'.format(
+            name, size / 1024.0, *(rates + ['yes' if same else 'NO'])))
+    print('{0:<28} {1:>8.1f} {2:>12.0f} {3:>12.0f} {4:>12.0f}'.format(
+        'overall', total / 1024.0, *[total / 1024.0 / t for t in totals]))
+    if mismatched:
+        print('extract() differs from the full parse on %d scripts' % mismatched)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
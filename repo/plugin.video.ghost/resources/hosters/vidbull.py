@@ -5,13 +5,13 @@ from resources.lib.handler.requestHandler import cRequestHandler
 from resources.lib.parser import cParser
 from resources.hosters.hoster import iHoster
 from resources.lib.packer import cPacker
+import binascii
 import re
 
 #import resources.lib.pyaes as pyaes (no module name pyaes found)
 
 #import resources.lib.GKDecrypter
 #from resources.lib.GKDecrypter import decryptKey
-from resources.lib.GKDecrypter import GKDecrypter
 
 #https://forums.tvaddons.ag/tknorris-release-repository/10792-debugging-daclips-2.html
 
@@ -91,8 +91,9 @@ class cHoster(iHoster):
                     if (EncodedLink):
 
                         Key = "a949376e37b369" + "f17bc7d3c7a04c5721"
-                        x = GKDecrypter(128, 128)
-                        sUrl = x.decrypt(EncodedLink.group(1), Key.decode("hex"), "ECB").split('\0')[0]
+                        from resolveurl.lib import crypto
+                        sUrl = crypto.aes_ecb_decrypt(binascii.unhexlify(Key), binascii.unhexlify(EncodedLink.group(1)))
+                        sUrl = sUrl.decode('utf-8', 'ignore').split('\0')[0]
 
                         #Si utilise pyaes
                         #import resources.lib.pyaes as pyaes
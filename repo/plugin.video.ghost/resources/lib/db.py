@@ -6,6 +6,7 @@ import xbmcvfs
 from resources.lib.handler.inputParameterHandler import cInputParameterHandler
 from resources.lib.util import QuotePlus, Unquote
 from resources.lib.comaddon import dialog, addon, VSlog, VSPath
+from resources.modules import storage
 
 SITE_IDENTIFIER = 'cDb'
 SITE_NAME = 'DB'
@@ -30,9 +31,9 @@ class cDb:
 
         try:
             if not xbmcvfs.exists(self.DB):
-                self.db = sqlite.connect(self.REALDB)
-                self.db.row_factory = sqlite.Row
+                self.db = storage.connect(self.REALDB)
                 self.dbcur = self.db.cursor()
+                self.dbcur.row_factory = sqlite.Row
                 self._create_tables()
                 return
         except:
@@ -40,9 +41,9 @@ class cDb:
             pass
 
         try:
-            self.db = sqlite.connect(self.REALDB)
-            self.db.row_factory = sqlite.Row
+            self.db = storage.connect(self.REALDB)
             self.dbcur = self.db.cursor()
+            self.dbcur.row_factory = sqlite.Row
         except:
             VSlog('Error: Unable to access to %s' % self.REALDB)
             pass
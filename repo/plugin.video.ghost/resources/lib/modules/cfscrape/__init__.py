@@ -12,7 +12,7 @@ from copy import deepcopy
 from requests.adapters import HTTPAdapter
 from requests.sessions import Session
 #from requests_toolbelt.utils import dump
-import dump
+from . import dump
 from time import sleep
 
 # ------------------------------------------------------------------------------- #
@@ -55,6 +55,7 @@ from .exceptions import (
 from .interpreters import JavaScriptInterpreter
 from .captcha import Captcha
 from .user_agent import User_Agent
+from .clearance import CLEARANCE_COOKIES, ClearanceStore
 
 # ------------------------------------------------------------------------------- #
 
@@ -140,6 +141,9 @@ class CloudScraper(Session):
         self._solveDepthCnt = 0
         self.solveDepth = kwargs.pop('solveDepth', 3)
 
+        self.clearanceStore = ClearanceStore() if kwargs.pop('clearance', True) else None
+        self._clearanceLoaded = set()
+
         super(CloudScraper, self).__init__(*args, **kwargs)
 
         # pylint: disable=E0203
@@ -232,6 +236,47 @@ class CloudScraper(Session):
 
         return resp
 
+    # ------------------------------------------------------------------------------- #
+    # Load / save clearance cookies from the store shared between sessions
+    # ------------------------------------------------------------------------------- #
+
+    def loadClearance(self, url):
+        domain = urlparse(url).hostname
+        if not self.clearanceStore or not domain or domain in self._clearanceLoaded:
+            return
+
+        self._clearanceLoaded.add(domain)
+        for cookie in self.clearanceStore.get(domain, self.headers.get('User-Agent')):
+            self.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie['domain'],
+                path=cookie.get('path', '/'),
+                expires=cookie.get('expires')
+            )
+
+    # ------------------------------------------------------------------------------- #
+
+    def saveClearance(self, url):
+        domain = urlparse(url).hostname
+        if not self.clearanceStore or not domain:
+            return
+
+        cookies = [
+            {
+                'name': c.name,
+                'value': c.value,
+                'domain': c.domain,
+                'path': c.path,
+                'expires': c.expires
+            }
+            for c in self.cookies
+            if c.name in CLEARANCE_COOKIES and ('.' + domain).endswith('.' + c.domain.lstrip('.'))
+        ]
+
+        if any(c['name'] == 'cf_clearance' for c in cookies):
+            self.clearanceStore.set(domain, self.headers.get('User-Agent'), cookies)
+
     # ------------------------------------------------------------------------------- #
     # Our hijacker request function
     # ------------------------------------------------------------------------------- #
@@ -254,6 +299,12 @@ class CloudScraper(Session):
                 **kwargs
             )
 
+        # ------------------------------------------------------------------------------- #
+        # Reuse a clearance solved earlier, by this or another add-on.
+        # ------------------------------------------------------------------------------- #
+
+        self.loadClearance(url)
+
         # ------------------------------------------------------------------------------- #
         # Make the request via requests.
         # ------------------------------------------------------------------------------- #
@@ -295,6 +346,7 @@ class CloudScraper(Session):
             self._solveDepthCnt += 1
 
             response = self.Challenge_Response(response, **kwargs)
+            self.saveClearance(response.url)
         else:
             if not response.is_redirect and response.status_code not in [429, 503]:
                 self._solveDepthCnt = 0
@@ -165,6 +165,10 @@ if Addon.getSetting("full_db")=='true':
 elapsed_time = time.time() - start_time_start
 time_data.append(elapsed_time)
 from  resources.modules import cache
+from resources.modules import jen_lists
+from resources.modules import storage
+from resources.modules import title_match
+from resources.modules.title_match import clean_marks
 elapsed_time = time.time() - start_time_start
 time_data.append(elapsed_time)
 
@@ -5140,17 +5144,6 @@ def get_title(title):
         text =text3.group(1)
     log.warning('text:'+text)
     return text.replace("."," ").strip()
-def clean_marks(title):
-    regex=r'\[(.+?)\]'
-    m=re.compile(regex).findall(title)
-    
-    for items in m:
-        title=title.replace('[%s]'%items,'')
-    regex='[0-9]{1,2}x[0-9]*'
-    m=re.compile(regex).findall(title)
-    if len(m)>0:
-        title=title.replace(m[0],'').strip()
-    return title
 def get_all_trakt_resume(tv_movie):
             
             all_w={}
@@ -5326,226 +5319,11 @@ if Addon.getSetting("full_db")=='true':
     else:
         dp_full.update(0, 'Please wait','Level 12...', '' )
 def check_rejected(name,show_original_year,season,episode,original_title,tv_movie,heb_name,filter_lang,one_click=False):
-       try:
-        
-        hebrew_title=False
-        rejedcted=False
-        cl_name=clean_marks(name)
-        c_name=cl_name.replace('%27','').replace("'",'').replace('%20',' ').replace('and','').replace('.&.','').replace(' & ','').replace(' and ','').replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
-        heb_name=heb_name.replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
-        
-            
-        
-        '''
-        info=(PTN.parse(c_name))
-        try:
-            info['title'] = re.findall("[a-zA-Z0-9. -_]+",info['title'])[0].encode('utf-8')
-        except:
-            pass
-        try:
-            info['title']=info['title'].encode('utf-8')
-        except:
-            pass
-        '''
-        original_title=original_title.replace('%27','').replace("'",'').replace('%20',' ').replace('and','').replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
-     
-        original_title_alt=original_title.replace('%20',' ').replace('and','').replace('.&.','').replace(' & ','').replace(' and ','').replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
-        #c_name=c_name.replace('&','').replace('and','')
-        if 'stargirl' in original_title.lower():
-            original_title=original_title.replace("dcs.",'')
-            original_title=original_title.replace("dc%27s.",'')
-        reject=False
-        if KODI_VERSION<=18:
-            h_name=heb_name.decode('utf-8').replace('.','')
-            cc_name=c_name.decode('utf-8').replace('.','')
-        else:
-            h_name=heb_name.replace('.','')
-            cc_name=c_name.replace('.','')
-        if tv_movie=='movie':
-            if original_title not in c_name and original_title_alt not in c_name:
-                #log.warning('c_name:'+c_name)
-                #log.warning('original_title:'+original_title)
-                reject=True
-        else:
-            clean_title_pre=re.compile(r'(.*?)?(\.|-)s?(\d{1,2})?e?(\d{2})\.(.*)').findall(cl_name.lower().replace(' ','.').replace('-','.'))
-          
-            
-            clean_title=None
-            try:
-                if len(clean_title_pre)>0:
-                    
-                    clean_title=clean_title_pre[0][0]
-            except:
-                pass
-            
-            
-            
-            if len(season)==1:
-              season_n="0"+season
-            else:
-              season_n=season
-            if len(episode)==1:
-              episode_n="0"+episode
-            else:
-              episode_n=episode
-              
-            if clean_title:
-                clean_title=clean_title.replace('.and.','').replace('.&.','').replace('.','').replace('&amp;','')
-            original_title=original_title.replace('.and.','').replace('.&.','').replace('.','')
-            if not clean_title and not hebrew_title: 
-            #if original_title.replace('.','') not in c_name.replace('.','') and original_title_alt.replace('.','') not in c_name.replace('.',''):
-            #if original_title.replace('.','') != c_name.replace('.','') and original_title_alt.replace('.','') != c_name.replace('.',''):
-                log.warning('r1')
-                reject=True
-            
-                
-            elif clean_title.lower()!=original_title:
-                #log.warning(clean_title)
-                #log.warning(original_title)
-                #log.warning('r0')
-                reject=True
-            elif 's%se%s.'%(season_n,episode_n) in c_name or 's%se%s###'%(season_n,episode_n) in c_name+'###'  or 's%se%s###'%(season,episode) in c_name+'###' or 's%se%s.'%(season,episode) in c_name:
-                
-                reject=False
-            elif 'season' in c_name:
-              
-              if 'season.%s.'%season not in c_name.lower() and 'season.%s$$$'%season not in (c_name.lower()+'$$$') and 'season.%s$$$'%season_n not in (c_name.lower()+'$$$') and 'season.%s.'%season_n not in c_name.lower() and 'season %s'%season_n not in c_name and 'season %s '%season not in c_name and 's%s '%season not in c_name:
-                #log.warning('r3')
-                reject=True
-            elif '.s%s.'%season_n in c_name:
-                #log.warning('r4')
-                reject=False
-            else:
-                #log.warning('r5')
-                reject=True
-            
-        if ' 3d' in original_title.lower() and '3d' not in name.lower():
-             reject=True
-        if filter_lang:
-            all_lang=['rus','russian','fr','french','TrueFrench','ita','italiano','castellano','spanish','swedish','dk','danish','german','nordic','exyu','chs','hindi','polish','mandarin','kor','korean']
-            for itt in all_lang:
-                if '.'+itt+'.' in c_name and '.en.' not in c_name and '.eng.' not in c_name and '.english.' not in c_name:
-                    reject=True
-                    break
-        
-        
-        if h_name in cc_name and hebrew_title:
-            
-            if tv_movie=='tv':
-                heb_name=heb_name.replace('.','').replace(' ','').replace('"','')
-                c_name=c_name.replace('.','').replace(' ','').replace('"','')
-                options=[heb_name+' ע%s פ%s'%(season,episode),heb_name+' ע%sפ%s'%(season,episode),heb_name+' עונה %s פרק %s'%(season,episode),original_title.replace('%20','.').replace(' ','.').replace('%27',"'").replace('%3a',":")+'.S%sE%s'%(season_n,episode_n)]
-                
-                if tv_movie=='tv':
-                   reject=True
-                   for it in options:
-                    
-                    if it.replace(' ','.').replace('.','').replace(' ','').lower() in c_name.replace(' ','.').replace('.','').replace(' ','').lower():
-                        
-                        reject=False
-                        break
-            
-           
-        return reject
-        #info['title']=get_title(name)
-        
-        
-        
-        
-        reject=False
-        if tv_movie=='movie':
-            
-            
-            if 'year' in info:
-                if str(info['year'])==str(info['title']):
-                  reject=False
-                elif str(info['year'])!=show_original_year:
-                    
-                    reject=True
-        else:
-            if len(season)==1:
-              season_n="0"+season
-            else:
-              season_n=season
-            if len(episode)==1:
-              episode_n="0"+episode
-            else:
-              episode_n=episode
-            if 'year' in info:
-                if str(info['year'])!=show_original_year:
-                    reject=True
-            if 'season' in info and 'episode' in info:
-                if str(info['season'])!=season or str(info['episode'])!=episode:
-                    reject=True
-            
-            elif 'season' in c_name.lower():
-                
-                if 'season %s'%season not in c_name.lower().replace('.','') and 'season %s'%season_n not in c_name.lower().replace('.',''):
-                    reject=True
-            elif ' s%s '%season_n in name.lower().replace('.',' '):
-                
-                reject=False
-            else:
-                
-                reject=True
-            if one_click:
-                if 's%se%s'%(season_n,episode_n) not in name.lower():
-                    reject=True
-        try:
-            o_name=clean_name(original_title,1).encode('utf-8').lower().replace('\'','').replace('&','and').replace(':',' ').replace('%3a',' ').replace('view ','').replace('(',' ').replace(')',' ').replace('.',' ').replace('  ',' ').replace('!','').replace('3d','').strip()
-
-            m_name=(info['title'].lower().replace('\'','').replace('&','and').replace(':',' ').replace('%3a',' ').replace('view ','').replace('[I]','').replace('.',' ').replace('(',' ').replace(')',' ').replace('  ',' ').replace('!','')).replace('3d','').strip()
-            heb_name=heb_name.lower().replace('\'','').replace('&','and').replace(':',' ').replace('%3a',' ').replace('view ','').replace('[I]','').replace('.',' ').replace('(',' ').replace(')',' ').replace('  ',' ').replace('!','').replace('3d','').strip()
-        except:
-             return False
-        '''
-        import difflib
-
-        cases=[(o_name,m_name)] 
-
-        for a,b in cases:     
-            log.warning('{} => {}'.format(a,b))  
-            for i,s in enumerate(difflib.ndiff(a, b)):
-                if s[0]==' ': continue
-                elif s[0]=='-':
-                    log.warning(u'Delete "{}" from position {}'.format(s[-1],i))
-                elif s[0]=='+':
-                    log.warning(u'Add "{}" to position {}'.format(s[-1],i))    
-        '''
-        if ' 3d' in original_title.lower() and '3d' not in name.lower():
-             rejedcted=True
-        if filter_lang:
-            
-            if 'language' in info:
-                
-                if 'English' not in info['language'] and 'english' not in info['language']:
-                    
-                    reject=True
-       
-        if o_name != m_name or reject:
-            
-            rejedcted=True
-        
-        if heb_name in m_name:#mando ok 
-            rejedcted=False
-       
-        
-
-        return rejedcted
-       
-       except Exception as e:
-        import linecache
-        sources_searching=False
-        exc_type, exc_obj, tb = sys.exc_info()
-        f = tb.tb_frame
-        lineno = tb.tb_lineno
-        filename = f.f_code.co_filename
-        linecache.checkcache(filename)
-        line = linecache.getline(filename, lineno, f.f_globals)
-        log.warning('ERROR IN rejedcted IN:'+str(lineno))
-        log.warning('inline:'+line)
-        log.warning('Error:'+str(e))
-       
+    try:
+        matcher=title_match.matcher(show_original_year,season,episode,original_title,tv_movie,heb_name,filter_lang)
+        return matcher.rejected(name,one_click=one_click)
+    except Exception as e:
+        log.warning('ERROR IN rejedcted:'+str(e))
         return True
 def check_forbiden(nm):
     forbidden_words=[' xxx ',' cock ',' lesbian ',' horny ',' ass ',' gay ',' porn ','adulttime','fuck','brazzers','cock',' anal ','mature','pornstar',' sucking ','bigtits','boobs','masturbate',' milf ']
@@ -6459,22 +6237,16 @@ def get_sources(name,url,iconimage,fanart,description,data,original_title,id,sea
                     return 0
 
 def ClearCache():
-    try:
-        from sqlite3 import dbapi2 as database
-    except:
-        from pysqlite2 import dbapi2 as database
     log.warning('Clear')
     cache.clear(['cookies', 'pages','posters','last_view','sources'])
     cacheFile=os.path.join(user_dataDir,'database.db')
-    dbcon = database.connect(cacheFile)
-
-    dbcur = dbcon.cursor()
-    dbcur.execute("CREATE TABLE IF NOT EXISTS %s ( ""url TEXT, ""all_results TEXT, ""all_ids TEXT, ""main_data TEXT,""added TEXT, ""free TEXT);" % 'local_cache')
-    
-    dbcur.execute("DELETE FROM local_cache")
-    dbcon.commit()
-    dbcur.close()
-    dbcon.close()
+    with storage.transaction(cacheFile) as dbcon:
+        dbcon.execute("CREATE TABLE IF NOT EXISTS %s ( ""url TEXT, ""all_results TEXT, ""all_ids TEXT, ""main_data TEXT,""added TEXT, ""free TEXT);" % 'local_cache')
+        dbcon.execute("DELETE FROM local_cache")
+    # registers the jen meta TTL so maintain() purges it too
+    jen_lists.MetaCache()
+    stats=storage.maintain()
+    log.warning('Clear: %d databases, %d expired rows purged in %.2fs' % (stats['databases'], stats['purged'], stats['seconds']))
     xbmcgui.Window(10000).clearProperties()
     xbmc.executebuiltin((u'Notification(%s,%s)' % (Addon.getAddonInfo('name'),  Addon.getLocalizedString(32092))))
 def post_trk(id,season,episode,progress=False,len_progress='',type_progress='',tvdb_id=''):
@@ -13432,30 +13204,7 @@ def GET_M3U_LIST(response):
         url = url.replace('\\n','').replace('\n','').replace('\\r','').replace('\\t','').replace('\r','').replace('\t','').replace(' ','').replace('m3u8','m3u8')
         all_chan.append((name,url,logo))
     return all_chan
-def get_all_imdb_items(imdb_scan,link,season,episode,get_movies):
-    global all_results_imdb
-    url2='https://www.imdb.com/title/%s/'%imdb_scan
-    pre_id=get_html(url2).json()
-    regex='name="description" content="(.+?)"'
-    
-    
-    url2=f'https://api.themoviedb.org/3/find/%s?api_key={tmdb_key}&external_source=imdb_id&language=%s'%(imdb_scan,lang)
-       
-    pre_id=get_html(url2).json()
-    tmdb_id=pre_id['movie_results'][0]['id']
-    try:
-        season=int(season)
-        tv_movie='tv'
-    except:
-        tv_movie='movie'
-    if tv_movie=='movie':
-        url2=f'https://api.themoviedb.org/3/movie/%s?api_key={tmdb_key}&language=%s'%(tmdb_id,lang)
-        
-      
-        all_results_imdb.append(get_movies(url2,return_results=True))
-        
 def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False,next_episode='0',search=False,mypass=""):
-    global all_results_imdb
     not_found=True
     all_plugins=[]
     plugin_dir = os.path.join(addonPath, 'resources', 'plugins')
@@ -13481,8 +13230,8 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
             return 0
     
                               
+    resolver=jen_lists.Resolver(lang,tmdb_key)
     try:
-        all_imdb_scan=[]
         o_url=url
         log.warning('o_url:'+o_url)
         if "plugin:" in url:
@@ -13498,7 +13247,7 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
         if ".m3u8" in url:
             x=get_html(url,headers=headers).content()
             all_chan=GET_M3U_LIST(x)
-            all_d=[]
+            all_d=jen_lists.DirectoryBatch(int(sys.argv[1]))
             for title,url,icon in all_chan:
                 
                 aa=addLink(title,url,6,False,icon,icon,' ',original_title=title,place_control=True)
@@ -13573,13 +13322,13 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
                 dp.close()
             else:
                 
-                x=get_html(url,headers=headers).json()
-                
-        
-            
+                x=jen_lists.fetch(url,headers,as_json=True)
             
-            all_d=[]
+            # an episode lookup returns before the directory is shown
+            all_d=jen_lists.DirectoryBatch(int(sys.argv[1]),batch_size=0 if get_episode_link else jen_lists.BATCH_SIZE)
             added_link='Direct_link$$$resolveurl'
+            if not get_episode_link:
+                resolver.prefetch([(items.get("imdb",""),jen_lists.media_type(items.get("season"," "))) for items in x['items']])
             
             for items in x['items']:
                 
@@ -13595,10 +13344,17 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
                 original_title=items.get("tvshowtitle",title)
                 plot=items.get("summary"," ")
                 year=items.get("year","")
-                if season!=' ':
-                    tv_movie='tv'
-                else:
-                    tv_movie='movie'
+                tv_movie=jen_lists.media_type(season)
+                meta=resolver.get(imdb,tv_movie) if imdb else {}
+                if meta:
+                    if not items.get("thumbnail"):
+                        icon=meta['icon'] or icon
+                    if not items.get("fanart"):
+                        fanart=meta['fanart'] or fanart
+                    if not items.get("summary"):
+                        plot=meta['plot'] or plot
+                    if not year:
+                        year=meta['year']
                 trailer=''
                 if imdb!='':
                     trailer = "plugin://%s?mode=25&id=%s&url=%s" % (addon_id,imdb,tv_movie)
@@ -13652,28 +13408,25 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
                         all_d.append(aa)
                     else:
                         log.warning(f_link)
-                        if 0:#'tt' in imdb:
-                            all_imdb_scan.append((imdb,lk,season,episode,title))
+                        mode=6
+                        if (url=='clear_cache'):
+                            aa=addNolink(title, url,35,False,fanart=fanart, iconimage=icon,plot=plot,dont_place=True)
+                    
+                            all_d.append(aa)
+                        elif (url=='settings'):
+                            aa=addNolink(title, url,151,False,fanart=fanart, iconimage=icon,plot=plot,dont_place=True)
+                    
+                            all_d.append(aa)
+                        elif (f_link=='Direct_link$$$resolveurlsearch') or (f_link=='Direct_link$$$resolveurlsearchsd') or (f_link=='Direct_link$$$resolveurlsearch$$$$Direct_link$$$resolveurlsearchsd'):
+                            
+                            aa=addDir3(title,url,15,icon,fanart,plot,data=year,original_title=title,id=imdb)
+                            all_d.append(aa)
+            
+                            
+          
                         else:
-                            mode=6
-                            if (url=='clear_cache'):
-                                aa=addNolink(title, url,35,False,fanart=fanart, iconimage=icon,plot=plot,dont_place=True)
-                        
-                                all_d.append(aa)
-                            elif (url=='settings'):
-                                aa=addNolink(title, url,151,False,fanart=fanart, iconimage=icon,plot=plot,dont_place=True)
-                        
-                                all_d.append(aa)
-                            elif (f_link=='Direct_link$$$resolveurlsearch') or (f_link=='Direct_link$$$resolveurlsearchsd') or (f_link=='Direct_link$$$resolveurlsearch$$$$Direct_link$$$resolveurlsearchsd'):
-                                
-                                aa=addDir3(title,url,15,icon,fanart,plot,data=year,original_title=title,id=imdb)
-                                all_d.append(aa)
-                
-                                
-              
-                            else:
-                                aa=addLink(title,lk,mode,False,icon,fanart,plot,original_title=title,tmdb=imdb,season=season,episode=episode,trailer=trailer,place_control=True,from_seek=search)
-                                all_d.append(aa)
+                            aa=addLink(title,lk,mode,False,icon,fanart,plot,original_title=title,tmdb=imdb,season=season,episode=episode,trailer=trailer,place_control=True,from_seek=search)
+                            all_d.append(aa)
                 else:
                     if 'message' in f_link:
                         aa=addNolink(title, f_link,194,False,fanart=fanart, iconimage=icon,plot=plot,dont_place=True)
@@ -13691,59 +13444,11 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
                                 aa=addDir3(title,url,189,icon,fanart,plot,id=imdb,trailer=trailer)
                         all_d.append(aa)
         
-        '''
-        dp = xbmcgui . DialogProgress ( )
-        if KODI_VERSION>18:
-            dp.create('Please wait','Scaning Items...')
-            dp.update(0, 'Please wait'+'\n'+'Scaning Items...'+'\n'+ '' )
-        else:
-            dp.create('Please wait','Scaning Items...', '','')
-            dp.update(0, 'Please wait','Scaning Items...', '' )
-        thread=[]
-  
-        from resources.modules.tmdb import get_movies
-        for imdb_scan,link,season,episode,title in all_imdb_scan:
-            #get_all_imdb_items(imdb_scan,link,season,episode)
-            thread.append(Thread(get_all_imdb_items,imdb_scan,link,season,episode,get_movies))
-            thread[len(thread)-1].setName(title)
-    
-            thread[len(thread)-1].start()
-        if len(thread)>0:
-            while (1):
-                num_live=0
-                still_alive=0
-                is_alives=[]
-                for ites in thread:
-                    
-                    if trd_alive(ites):
-                          num_live+=1
-                          is_alives.append(ites.name)
-                    else:
-                          still_alive=1
-                if KODI_VERSION>18:
-                    
-                    dp.update(int(((num_live* 100.0)/(len(thread))) ), 'Please wait'+'\n'+'Scaning Items..'+str(num_live)+'/'+str(len(thread))+'\n'+ ",".join(is_alives) )
-                else:
-                    
-                    dp.update(int(((num_live* 100.0)/(len(thread))) ), 'Please wait','Scaning Items.'+str(num_live)+'/'+str(len(thread)),  ",".join(is_alives)  )
-                
-                if still_alive==0 or num_live==0:
-                        break
-                xbmc.sleep(100)
-        dp.close()
-        
-        log.warning('all_results_imdb:'+str(len(all_results_imdb)))
-        
-        for itt in all_results_imdb:
-            for name,url,mode,icon,fan,plot,year,original_name,id,added_res_trakt,rating,new_name,year,genere,trailer,watched,fav_status,collect_all,all_w in itt:
-                aa=addDir3(name,url,mode,icon,fan,plot,data=year,original_title=original_name,id=id,all_w_trk=added_res_trakt,rating=rating,heb_name=new_name,show_original_year=year,generes=genere,trailer=trailer,watched=watched,fav_status=fav_status,collect_all=True,all_w=all_w)
-                all_d.append(aa)
-        '''
         if len(search_db)>0 and not search:
             aa=addDir3('[COLOR lightblue][B]Search[/B][/COLOR]',o_url,207,icon,fanart,'Search',search_db=search_db)
             all_d.append(aa)
             
-        xbmcplugin .addDirectoryItems(int(sys.argv[1]),all_d,len(all_d))
+        all_d.flush()
         if not_found:
             return False,''
     except  Exception as e:
@@ -13761,6 +13466,8 @@ def populate_json_playlist(url,iconimage,fanart,search_db,get_episode_link=False
    
 
         return ''
+    finally:
+        resolver.close()
 def populate_playlist(url,iconimage,o_fanart,search_db,search=False,mypass=""):
     global from_seek
     from_seek=False
@@ -13833,10 +13540,10 @@ def populate_playlist(url,iconimage,o_fanart,search_db,search=False,mypass=""):
             x=x+y
     else:
         log.warning(url)
-        x=get_html(url,headers=base_header).content()
+        x=jen_lists.fetch(url,base_header)
         o_url=url
     
-    all_d=[]
+    all_d=jen_lists.DirectoryBatch(int(sys.argv[1]))
     all_plugins=[]
     plugin_dir = os.path.join(addonPath, 'resources', 'plugins')
     for f in listdir(plugin_dir):
@@ -13848,6 +13555,14 @@ def populate_playlist(url,iconimage,o_fanart,search_db,search=False,mypass=""):
     
     regex='<((?:item|dir|plugin))>(.+?)</(?:item|dir|plugin)>'
     m=re.compile(regex,re.DOTALL).findall(x)
+    resolver=jen_lists.Resolver(lang,tmdb_key)
+    all_ids=[]
+    for type_record,items in m:
+        imdb_id=re.compile('<imdb>(.+?)</imdb>').findall(items)
+        if imdb_id:
+            season=re.compile('<season>(.+?)</season>').findall(items)
+            all_ids.append((imdb_id[0],jen_lists.media_type(season[0] if season else ' ')))
+    resolver.prefetch(all_ids)
     mode=6
     for type_record,items in m:
         
@@ -13891,10 +13606,7 @@ def populate_playlist(url,iconimage,o_fanart,search_db,search=False,mypass=""):
             episode=' '
         else:
             episode=episode[0]
-        if season!=' ':
-            tv_movie='tv'
-        else:
-            tv_movie='movie'
+        tv_movie=jen_lists.media_type(season)
         regex='<sublink>(.+?)</sublink>'
         links=re.compile(regex).findall(items)
         f_link_arr=[]
@@ -13948,6 +13660,16 @@ def populate_playlist(url,iconimage,o_fanart,search_db,search=False,mypass=""):
             plot=" "
         else:
             plot=summary[0]
+        meta=resolver.get(imdb_id,tv_movie) if imdb_id else {}
+        if meta:
+            if '<thumbnail>' not in items:
+                icon=meta['icon'] or icon
+            if '<fanart>' not in items:
+                fanart=meta['fanart'] or fanart
+            if '<summary>' not in items:
+                plot=meta['plot'] or plot
+            if not year:
+                year=meta['year']
         trailer=''
         if imdb_id!='':
             trailer = "plugin://%s?mode=25&id=%s&url=%s" % (addon_id,imdb_id,tv_movie)
@@ -14003,7 +13725,8 @@ def populate_playlist(url,iconimage,o_fanart,search_db,search=False,mypass=""):
         aa=addDir3('[COLOR lightblue][B]Search[/B][/COLOR]',o_url,191,icon,fanart,'Search',search_db=search_db)
         all_d.append(aa)
     
-    xbmcplugin .addDirectoryItems(int(sys.argv[1]),all_d,len(all_d))
+    resolver.close()
+    all_d.flush()
     
 
 def play_list(name,url,iconimage,fanart,id,show_original_year,season,episode):
@@ -14095,7 +13818,7 @@ def get_jen_files(url,dp,start_time_start):
     global all_jen_links
     url=url.replace(' ','%20')
     log.warning('URL:'+url)
-    x=get_html(url,headers=base_header).content()
+    x=jen_lists.fetch(url,base_header)
     regex='<dir>(.+?)</dir>'
     try:
         m=re.compile(regex,re.DOTALL).findall(x)
@@ -14123,10 +13846,11 @@ def get_jen_files(url,dp,start_time_start):
         regex='<link>(.+?)</link>'
         links=re.compile(regex).findall(items)
         for itt in links:
-            
+            if itt in all_jen_links:
+                continue
             all_jen_links.append(itt)
             
-            get_jen_files(itt,dp)
+            get_jen_files(itt,dp,start_time_start)
 def download_db(url,nm,extract=False,headers={}):
    try:
     file=os.path.join(user_dataDir,nm)
@@ -19,13 +19,9 @@
 '''
 
 from resources.modules import log
+from resources.modules import storage
 import xbmc,re,hashlib,time,os,logging
 
-try:
-    from sqlite3 import dbapi2 as database
-except:
-    from pysqlite2 import dbapi2 as database
-
 try:
     import xbmcaddon
 except:
@@ -85,7 +81,8 @@ def get(function, timeout, *args, **table):
           os.mkdir(mypath)
     
            
-        dbcon = database.connect(os.path.join(mypath,'sources.db'))
+        dbFile = os.path.join(mypath,'sources.db')
+        dbcon = storage.connect(dbFile)
         dbcur = dbcon.cursor()
         dbcur.execute("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='%s';"%table)
         match = dbcur.fetchone()
@@ -142,10 +139,10 @@ def get(function, timeout, *args, **table):
         r = repr(r)
         t = int(time.time())
       
-        dbcur.execute("CREATE TABLE IF NOT EXISTS %s (""func TEXT, ""args TEXT, ""response TEXT, ""added TEXT, ""UNIQUE(func, args)"");" % table)
-        dbcur.execute("DELETE FROM %s WHERE func = '%s' AND args = '%s'" % (table, f, a))
-        dbcur.execute("INSERT INTO %s Values (?, ?, ?, ?)" % table, (f, a, r, t))
-        dbcon.commit()
+        with storage.transaction(dbFile) as dbcon:
+            dbcon.execute("CREATE TABLE IF NOT EXISTS %s (""func TEXT, ""args TEXT, ""response TEXT, ""added TEXT, ""UNIQUE(func, args)"");" % table)
+            dbcon.execute("DELETE FROM %s WHERE func = '%s' AND args = '%s'" % (table, f, a))
+            dbcon.execute("INSERT INTO %s Values (?, ?, ?, ?)" % table, (f, a, r, t))
     except Exception as e:
         exc_type, exc_obj, tb = sys.exc_info()
         fail = tb.tb_frame
@@ -191,16 +188,17 @@ def clear(table=None):
         mypath=os.path.join(dataPath,'cache_f')
         if not os.path.exists(mypath):
           os.mkdir(mypath)
-        dbcon = database.connect(os.path.join(mypath,'sources.db'))
+        dbFile = os.path.join(mypath,'sources.db')
+        dbcon = storage.connect(dbFile)
         dbcur = dbcon.cursor()
 
         for t in table:
             try:
                 dbcur.execute("DROP TABLE IF EXISTS %s" % t)
-                dbcur.execute("VACUUM")
                 dbcon.commit()
             except:
                 pass
+        storage.incremental_vacuum(dbFile)
     except Exception as e:
         log.error('Error cleaning: '+str(e))
         
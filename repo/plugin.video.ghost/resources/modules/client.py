@@ -2,9 +2,121 @@
 
 import urllib,xbmc
 import logging,json
+import threading,time
+from collections import OrderedDict
 from resources.modules import log
 KODI_VERSION = int(xbmc.getInfoLabel("System.BuildVersion").split('.', 1)[0])
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from http.cookiejar import DefaultCookiePolicy
+    from urllib.parse import urlencode, urlparse
+except ImportError:
+    requests = None
+try:
+    try:
+        import brotlicffi
+    except ImportError:
+        import brotli
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# one keep-alive session per host, the least recently used is dropped past MAX_SESSIONS
+MAX_SESSIONS = 32
+POOL_MAXSIZE = 10
+RETRIES = 2
+BACKOFF = 0.5
+# no 503: that is what a Cloudflare challenge answers, retrying it only waits longer
+RETRY_STATUS = (429, 500, 502, 504)
+
+_sessions = OrderedDict()
+_stats = {}
+_lock = threading.Lock()
+
+
+def _retry():
+    # a Retry-After of minutes would hang the caller, the backoff bounds the wait instead
+    kwargs = dict(total=RETRIES, connect=RETRIES, read=1, backoff_factor=BACKOFF,
+                  status_forcelist=RETRY_STATUS, raise_on_status=False,
+                  respect_retry_after_header=False)
+    methods = frozenset(['GET', 'HEAD', 'OPTIONS'])
+    try:
+        return Retry(allowed_methods=methods, **kwargs)
+    except TypeError:
+        # urllib3 < 1.26
+        return Retry(method_whitelist=methods, **kwargs)
+
+
+def _host(url):
+    return urlparse(url).netloc.lower()
+
+
+def get_session(url):
+    '''
+    Returns the shared requests session for the host of url. Sessions are
+    safe to use from several threads: they keep up to POOL_MAXSIZE idle
+    connections, retry GET/HEAD on connection errors and RETRY_STATUS with
+    backoff, and never keep cookies between requests.
+    '''
+    host = _host(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is not None:
+            _sessions.move_to_end(host)
+            return session
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=_retry())
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        # every get_html starts without cookies, as with urllib
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        _sessions[host] = session
+        if len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+        return session
+
+
+def _count(url, seconds, error=False):
+    host = _host(url)
+    with _lock:
+        entry = _stats.get(host)
+        if entry is None:
+            entry = _stats[host] = {'requests': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+        entry['requests'] += 1
+        entry['errors'] += int(error)
+        entry['seconds'] += seconds
+        entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+
+def stats():
+    '''
+    Per host: requests, errors, avg_ms and max_ms of get_html calls, plus
+    the connections opened and the requests that reused one.
+    '''
+    with _lock:
+        hosts = dict((host, dict(entry)) for host, entry in _stats.items())
+        sessions = list(_sessions.items())
+    for host, session in sessions:
+        opened = sent = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+        entry = hosts.setdefault(host, {'requests': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+        entry['connections'] = opened
+        entry['reused'] = max(sent - opened, 0)
+    for entry in hosts.values():
+        entry['avg_ms'] = int(entry.pop('seconds') * 1000 / max(entry['requests'], 1))
+        entry['max_ms'] = int(entry.pop('max_seconds') * 1000)
+    return hosts
+
 base_header={
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -48,6 +160,74 @@ class get_html():
         else:
             self.result=''
     def result(self):
+        if requests is not None and KODI_VERSION>18:
+            return self.session_result()
+        return self.urllib_result()
+    def session_result(self):
+        added_params=''
+        headers=dict(self.head)
+        # a jar rather than a Cookie header, requests drops the header on redirects
+        cookies=dict((str(x),str(y)) for x,y in self.cookies.items())
+        if self.params!='':
+            try:
+                added_params='?'+urlencode( self.params )
+            except:
+                added_params='?'+( self.params )
+        data=None
+        if self.data!={}:
+            try:
+                data=urlencode(self.data).encode("utf-8")
+            except:
+                data=self.data.encode("utf-8")
+        elif self.json_data!={}:
+            data=json.dumps(self.json_data).encode("utf-8")
+        if data is not None and not any(k.lower()=='content-type' for k in headers):
+            # what urllib sent for any body
+            headers['Content-Type']='application/x-www-form-urlencoded'
+        if self.post:
+            method='POST'
+        elif self.put:
+            method='PUT'
+        elif self.delete:
+            method='DELETE'
+        elif data is None:
+            method='GET'
+        else:
+            method='POST'
+        url=self.url+added_params
+        started=time.time()
+        try:
+            response=get_session(url).request(method,url,headers=headers,cookies=cookies,data=data,verify=self.verify,timeout=self.timeout,stream=self.stream)
+        except Exception:
+            _count(url,time.time()-started,error=True)
+            raise
+        _count(url,time.time()-started,error=response.status_code>=400)
+        self.final_url=response.url
+        self.status_code=response.status_code
+        if response.status_code>=400:
+            response.close()
+            return {'error_code':response.status_code}
+        self.headers_return_dict=dict(response.headers)
+        if self.stream==False:
+            html=response.content.decode('utf-8','ignore')
+            try:
+                html=json.loads(str(html))
+            except:
+                pass
+        else:
+            html=''
+            response.close()
+        cookie_new={}
+        for r in response.history+[response]:
+            for cook in r.cookies:
+                cookie_new[cook.name]=cook.value
+        self.cookies_get=cookie_new
+        self.html_in=html
+        if self.get_cookies:
+            return html,cookie_new
+        else:
+            return html
+    def urllib_result(self):
        if KODI_VERSION>18:
             import urllib.error
             err_url=urllib.error
@@ -23,9 +23,14 @@ import time
 import tools
 
 try:
-    from sqlite3 import dbapi2 as db, OperationalError, IntegrityError
+    from resources.modules import storage
 except ImportError:
-    from pysqlite2 import dbapi2 as db, OperationalError, IntegrityError
+    import storage
+
+try:
+    from sqlite3 import OperationalError, IntegrityError
+except ImportError:
+    from pysqlite2.dbapi2 import OperationalError, IntegrityError
 
 cache_table = 'cache'
 
@@ -124,6 +129,7 @@ def cache_insert(key, value):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -142,10 +148,10 @@ def cache_clear():
         for t in [cache_table, 'rel_list', 'rel_lib']:
             try:
                 cursor.execute("DROP TABLE IF EXISTS %s" % t)
-                cursor.execute("VACUUM")
                 cursor.connection.commit()
             except:
                 pass
+        storage.incremental_vacuum(tools.cacheFile)
         tools.showDialog.notification('{}: {}'.format(tools.addonName, tools.lang(40306)), tools.lang(32078), time=5000)
     except:
         pass
@@ -159,14 +165,15 @@ def cache_clear_all():
 
 def _get_connection_cursor(filepath):
     conn = _get_connection(filepath)
-    return conn.cursor()
+    # on the cursor, the connection is shared with other users of the file
+    cursor = conn.cursor()
+    cursor.row_factory = _dict_factory
+    return cursor
 
 
 def _get_connection(filepath):
     tools.makeFile(tools.dataPath)
-    conn = db.connect(filepath)
-    conn.row_factory = _dict_factory
-    return conn
+    return storage.connect(filepath)
 
 
 def getSearchHistory(media_type):
@@ -191,6 +198,7 @@ def getSearchHistory(media_type):
         return filter
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -219,6 +227,7 @@ def addSearchHistory(search_string, media_type):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -247,6 +256,7 @@ def clearSearchHistory():
         tools.showDialog.notification(tools.addonName, tools.lang(40259), time=5000)
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -291,6 +301,7 @@ def getTorrents(item_meta):
 
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -357,6 +368,7 @@ def addTorrent(item_meta, torrent_objects):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -377,12 +389,13 @@ def torrent_cache_clear():
         for t in [cache_table, 'rel_list', 'rel_lib']:
             try:
                 cursor.execute("DROP TABLE IF EXISTS %s" % t)
-                cursor.execute("VACUUM")
                 cursor.connection.commit()
             except:
                 pass
+        storage.incremental_vacuum(tools.torrentScrapeCacheFile)
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -404,6 +417,7 @@ def get_assist_torrents():
         return results
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -427,6 +441,7 @@ def clear_non_active_assist():
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -458,6 +473,7 @@ def add_assist_torrent(debrid_id, provider, status, release_title, progress):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -475,13 +491,14 @@ def clear_assist_torrents():
         for t in [cache_table, 'rel_list', 'rel_lib']:
             try:
                 cursor.execute("DROP TABLE IF EXISTS torrents")
-                cursor.execute("VACUUM")
                 cursor.connection.commit()
                 cursor.close()
             except:
                 pass
+        storage.incremental_vacuum(tools.activeTorrentsDBFile)
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -505,6 +522,7 @@ def get_single_provider(provider_name, package, country):
         return sources
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -525,6 +543,7 @@ def get_providers():
         return sources
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -554,6 +573,7 @@ def get_provider_packages():
         return packages
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -578,6 +598,7 @@ def add_provider_package(pack_name, author, remote_meta, version):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -597,6 +618,7 @@ def remove_provider_package(pack_name):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -629,6 +651,7 @@ def add_provider(provider_name, package, status, language, provider_type):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -651,6 +674,7 @@ def adjust_provider_status(provider_name, package_name, state):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -671,6 +695,7 @@ def remove_individual_provider(provider_name, package_name):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -689,6 +714,7 @@ def remove_package_providers(package_name):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -705,20 +731,20 @@ def clear_providers():
         for t in [cache_table, 'rel_list', 'rel_lib']:
             try:
                 cursor.execute("DROP TABLE IF EXISTS providers")
-                cursor.execute("VACCUM")
             except:
                 pass
 
             try:
                 cursor.execute("DROP TABLE IF EXISTS packages")
-                cursor.execute("VACUUM")
             except:
                 pass
 
         cursor.connection.commit()
         cursor.close()
+        storage.incremental_vacuum(tools.providersDB)
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -741,6 +767,7 @@ def get_premiumize_transfers():
         return transfers
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -760,6 +787,7 @@ def add_premiumize_transfer(transfer_id):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
@@ -778,6 +806,7 @@ def remove_premiumize_transfer(transfer_id):
         cursor.close()
     except:
         try:
+            cursor.connection.rollback()
             cursor.close()
         except:
             pass
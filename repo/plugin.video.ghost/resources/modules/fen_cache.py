@@ -10,6 +10,7 @@ import datetime
 import time
 import sqlite3,sys
 from functools import reduce
+from resources.modules import storage
 # from modules.utils import logger
 
 ADDON_ID = sys.argv[0]
@@ -171,7 +172,8 @@ class FenCache(object):
                 self._log_msg("delete from db %s" % cache_data[0])
 
         # compact db
-        self._execute_sql("VACUUM")
+        try: storage.incremental_vacuum(self._get_database_file())
+        except sqlite3.Error: pass
 
         # remove task from list
         self._busy_tasks.remove(__name__)
@@ -179,8 +181,7 @@ class FenCache(object):
         self._win.clearProperty("fencachecleanbusy")
         self._log_msg("Auto cleanup done")
 
-    def _get_database(self):
-        '''get reference to our sqllite _database - performs basic integrity check'''
+    def _get_database_file(self):
         addon = xbmcaddon.Addon()
         dbpath = addon.getAddonInfo('profile')
         try: dbfile = xbmc.translatePath("%s/fen_cache.db" % dbpath).decode('utf-8')
@@ -188,16 +189,23 @@ class FenCache(object):
         if not xbmcvfs.exists(dbpath):
             xbmcvfs.mkdirs(dbpath)
         del addon
+        return dbfile
+
+    def _get_database(self):
+        '''get reference to our sqllite _database - performs basic integrity check'''
+        dbfile = self._get_database_file()
         try:
-            connection = sqlite3.connect(dbfile, timeout=30, isolation_level=None)
+            connection = storage.connect(dbfile, isolation_level=None)
             connection.execute('SELECT * FROM fencache LIMIT 1')
             return connection
         except Exception as error:
             # our _database is corrupt or doesn't exist yet, we simply try to recreate it
-            if xbmcvfs.exists(dbfile):
-                xbmcvfs.delete(dbfile)
+            storage.reset(dbfile)
+            for suffix in ('', '-wal', '-shm'):
+                if xbmcvfs.exists(dbfile + suffix):
+                    xbmcvfs.delete(dbfile + suffix)
             try:
-                connection = sqlite3.connect(dbfile, timeout=30, isolation_level=None)
+                connection = storage.connect(dbfile, isolation_level=None)
                 connection.execute(
                     """CREATE TABLE IF NOT EXISTS fencache(
                     id TEXT UNIQUE, expires INTEGER, data TEXT, checksum INTEGER)""")
@@ -58,6 +58,7 @@ except:
 all_colors=['aliceblue', 'anitquewhite', 'aqua', 'aquamarine', 'azure', 'beige', 'bisque', 'black', 'blanchedalmond', 'blue', 'blueviolet', 'brown', 'burlywood', 'cadetblue', 'chartreuse', 'chocolate', 'coral', 'cornflowerblue', 'cornsilk', 'crimson', 'cyan', 'darkblue', 'darkcyan', 'darkgoldenrod', 'darkgray', 'darkgreen', 'darkkhaki', 'darkmagenta', 'darkolivegreen', 'darkorange', 'darkorchid', 'darkred', 'darksalmon', 'darkseagreen', 'darkslateblue', 'darkslategray', 'darkturquoise', 'darkviolet', 'deeppink', 'deepskyblue', 'dimgray', 'dodgerblue', 'firebrick', 'floralwhite', 'forestgreen', 'fuchsia', 'gainsboro', 'ghostwhite', 'gold', 'goldenrod', 'gray', 'green', 'greenyellow', 'honeydew', 'hotpink', 'indianred ', 'indigo  ', 'ivory', 'khaki', 'kodi', 'lavender', 'lavenderblush', 'lawngreen', 'lemonchiffon', 'lightblue', 'lightcoral', 'lightcyan', 'lightgoldenrodyellow', 'lightgray', 'lightgreen', 'lightpink', 'lightsalmon', 'lightseagreen', 'lightskyblue', 'lightslategray', 'lightsteelblue', 'lightyellow', 'lime', 'limegreen', 'linen', 'magenta', 'maroon', 'mediumaquamarine', 'mediumblue', 'mediumorchid', 'mediumpurple', 'mediumseagreen', 'mediumslateblue', 'mediumspringgreen', 'mediumturquoise', 'mediumvioletred', 'midnightblue', 'mintcream', 'mistyrose', 'moccasin', 'navajowhite', 'navy', 'none', 'oldlace', 'olive', 'olivedrab', 'orange', 'orangered', 'orchid', 'palegoldenrod', 'palegreen', 'paleturquoise', 'palevioletred', 'papayawhip', 'peachpuff', 'peru', 'pink', 'plum', 'powderblue', 'purple', 'red', 'rosybrown', 'royalblue', 'saddlebrown', 'salmon', 'sandybrown', 'seagreen', 'seashell', 'sienna', 'silver', 'skyblue', 'slateblue', 'slategray', 'snow', 'springgreen', 'steelblue', 'tan', 'teal', 'thistle', 'tomato', 'turquoise', 'violet', 'white', 'whitesmoke', 'yellow', 'yellowgreen']
 from resources.modules.public import get_html_g
 from  resources.modules.client import get_html
+from resources.modules import link_probe
 html_g_tv,html_g_movie=cache.get(get_html_g,72, table='posters')
 rd_sources=Addon.getSetting("rdsource")
 allow_debrid = rd_sources == "true" 
@@ -854,15 +855,9 @@ def get_vidcloud(url):
         return urls,headers
                         
 def server_data(f_link,original_title,direct='NO',c_head={'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101 Firefox/58.0'},check_now=False):
-       import PTN
-       
-       time.sleep(0.01)
-       not_working_servers=['database.gdriveplayer.us','vidoza','streamcherry','verystream','openload','oload.','streamango','rapidvideo','vidup.me','vidup.me','hqq.','vidup.tv','vidup.io','vidtodo.com','xn--4dbx','thefile.me','videoweed.es','watchvideo17.us','vodlocker.com','bitvid.sx','waaw','flashx.pw','thevideo.me','vev.io','movpod.in','daclips.in','dl8.heyserver.in','cloudtime.to','speedvid.net','watchers.to','vidzella.me','not_found.php','nitroflare','nitrobit','youtube','vidto.me','vidzi.tv','vidoza.net','nowvideo.sx','vidzi.nu','estream','streamcherry.com']
+       if link_probe.is_blocked(f_link):
+           return original_title,' ',' ',False
        try:
-          for items in not_working_servers:
-            if items in f_link:
-               
-                return original_title,' ',' ',False
           if not('openload' in f_link or 'oload.stream' in f_link or 'oload.download' in f_link or 'streamango' in f_link or 'megaxfer' in f_link or 'verystream.com' in f_link):
            if '//' in f_link and allow_debrid and 'streamango' not in f_link and 'nitroflare' not in f_link:
             host = f_link.split('//')[1].replace('www.','')
@@ -1057,54 +1052,25 @@ def server_data(f_link,original_title,direct='NO',c_head={'User-Agent': 'Mozilla
         #  return original_title,'estream',' ',True
         if  resolvable==False and a==False:
           log.warning('RETURN NON RESO')
-          try:
-              try_head = requests.head(f_link,headers=c_head, stream=True,verify=False,timeout=15)
-              
-              check=(try_head.status_code)
-          except:
+          probe=link_probe.get().probe(f_link,c_head)
+          if not probe.status:
                 return original_title,' ',' ',False
           regex_s="//(.+?)/"
           match_s=re.compile(regex_s).findall(f_link)[0]
-          f_size2='0.0 GB'
-          s_name=match_s
-          if 'Location' in try_head.headers:
-             try:
-                  try_head = requests.head(try_head.headers['Location'],headers=c_head, stream=True,verify=False,timeout=15)
-                  
-                  check=(try_head.status_code)
-             except:
-                    return original_title,' ',' ',False
-             
-          if 'Content-Length' in try_head.headers:
-          
-                if int(try_head.headers['Content-Length'])>(1024*1024):
-                    f_size2=str(round(float(try_head.headers['Content-Length'])/(1024*1024*1024), 2))+' GB'
-                if f_size2!='0.0 GB':
-                    s_name=match_s+' - '+f_size2
-                else:
-                    s_name=match_s
+          f_size2=link_probe.format_size(probe.size)
+          if f_size2:
+              s_name=match_s+' - '+f_size2
+          else:
+              s_name=match_s
           return original_title,s_name,' ',True
         direct='yes'
        
         if direct=='yes':
            
-           try_head = get_html(f_link,headers=c_head, stream=True,verify=False,timeout=15)
-           #if try_head.url!=f_link:
-           #     
-           #     try_head = get_html(try_head.url,headers=c_head, stream=True,verify=False,timeout=10)
-           f_size2='0.0 GB'
-           
-           if 'Content-Length' in try_head.headers:
-               if int(try_head.headers['Content-Length'])>(1024*1024):
-                f_size2=str(round(float(try_head.headers['Content-Length'])/(1024*1024*1024), 2))+' GB'
+           probe=link_probe.get().probe(f_link,c_head)
+           f_size2=link_probe.format_size(probe.size) or '0.0 GB'
            
-           
-           
-         
-           
-           if 'Content-Type' in try_head.headers:
-              
-             if 'stream'  in try_head.headers['Content-Type'] or 'application' in try_head.headers['Content-Type'] or 'video' in try_head.headers['Content-Type'] or 'mp4' in try_head.headers['Content-Type']:
+           if link_probe.is_media(probe):
                 if "HD" in f_link:
                   res="720"
                 elif "720" in f_link:
@@ -1126,10 +1092,10 @@ def server_data(f_link,original_title,direct='NO',c_head={'User-Agent': 'Mozilla
                     s_name=match_s[0]
       
                 return original_title,s_name,res,True
-           html2=''
-           for chunk in try_head.iter_content(chunk_size=1024): 
-                if chunk: # filter out keep-alive new chunks
-                    html2+=chunk
+           # not a file, read the page for its title and size
+           html2=get_html(f_link,headers=c_head,verify=False,timeout=15).content()
+           if not isinstance(html2,str):
+                html2=''
           #if 'thevideo' in f_link or 'vev.io' in f_link:
           #  html2=get_html(f_link,headers=c_head,timeout=10,verify=False).content
           #else:
@@ -1205,6 +1171,7 @@ def server_data(f_link,original_title,direct='NO',c_head={'User-Agent': 'Mozilla
         if len(match4)>0:
               name1=match4[0]
               try:
+                  import PTN
                   info=(PTN.parse(match4[0]))
                   
                   if 'resolution' in info:
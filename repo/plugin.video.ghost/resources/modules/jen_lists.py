@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+'''
+    Jen list population helpers.
+
+    Remote Jen XML/JSON lists are downloaded once per LIST_TTL_HOURS through
+    the add-on cache. Entries carrying an imdb id get their metadata from
+    TMDB: every id is resolved once per list by a bounded thread pool, with
+    the results kept in jen_meta.db, so opening the list again costs no
+    TMDB calls at all. Directory items are handed to Kodi in batches while
+    later entries are still being resolved.
+'''
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import xbmcaddon
+import xbmcplugin
+
+from resources.modules import cache
+from resources.modules import log
+from resources.modules import storage
+from resources.modules.client import get_html
+
+LIST_TTL_HOURS = 1
+META_TTL = 7 * 24 * 60 * 60
+MAX_WORKERS = 8
+BATCH_SIZE = 50
+
+TMDB_FIND = 'https://api.themoviedb.org/3/find/%s?api_key=%s&external_source=imdb_id&language=%s'
+TMDB_IMAGE = 'https://image.tmdb.org/t/p/original/'
+
+
+def _get(url, headers, as_json):
+    html = get_html(url, headers=headers)
+    if as_json:
+        return html.json()
+    return html.content()
+
+
+def fetch(url, headers, as_json=False):
+    '''Returns the list at url, downloaded at most once per LIST_TTL_HOURS.'''
+    downloaded = {}
+
+    def _download(url, headers, as_json):
+        try:
+            downloaded['result'] = _get(url, headers, as_json)
+        except Exception as e:
+            downloaded['error'] = e
+            raise
+        return downloaded['result']
+
+    result = cache.get(_download, LIST_TTL_HOURS, url, headers, as_json, table='jen_lists')
+    if result is None:
+        # cache.get logs and swallows download errors, and returns None for a
+        # list it could not store, neither is worth downloading again
+        if 'error' in downloaded:
+            raise downloaded['error']
+        result = downloaded.get('result')
+    return result
+
+
+def media_type(season):
+    '''tv_movie of a list entry, season is ' ' when the entry has none.'''
+    return 'movie' if season == ' ' else 'tv'
+
+
+def _db_file():
+    try:
+        from resources.modules.cache import xbmc_tranlate_path
+        data_path = xbmc_tranlate_path(xbmcaddon.Addon().getAddonInfo('profile'))
+    except Exception:
+        data_path = os.path.dirname(os.path.realpath(__file__))
+    if not os.path.exists(data_path):
+        os.makedirs(data_path)
+    return os.path.join(data_path, 'jen_meta.db')
+
+
+class MetaCache(object):
+    '''TMDB metadata per imdb id and language, kept for META_TTL seconds.'''
+
+    def __init__(self, path=None):
+        self.path = path or _db_file()
+        with storage.transaction(self.path) as dbcon:
+            dbcon.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, data TEXT, added INTEGER)")
+        # expired rows go when the cache is cleared, see storage.maintain()
+        storage.register_ttl(self.path, 'meta', 'added', META_TTL)
+
+    def get_many(self, keys):
+        found = {}
+        if not keys:
+            return found
+        dbcon = storage.connect(self.path)
+        keys = list(keys)
+        expired = int(time.time()) - META_TTL
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = dbcon.execute("SELECT key, data FROM meta WHERE added >= ? AND key IN (%s)" % ','.join('?' * len(chunk)),
+                                 [expired] + chunk)
+            for key, data in rows:
+                found[key] = json.loads(data)
+        return found
+
+    def set(self, key, data):
+        with storage.transaction(self.path) as dbcon:
+            dbcon.execute("INSERT OR REPLACE INTO meta VALUES (?, ?, ?)", (key, json.dumps(data), int(time.time())))
+
+
+def _image(path):
+    return TMDB_IMAGE + path if path else ''
+
+
+def resolve_imdb(imdb_id, tv_movie, lang, tmdb_key):
+    '''Returns {id, title, plot, icon, fanart, year, rating} for an imdb id, {} if TMDB has none.'''
+    html = get_html(TMDB_FIND % (imdb_id, tmdb_key, lang)).json()
+    order = ['tv_results', 'movie_results'] if tv_movie == 'tv' else ['movie_results', 'tv_results']
+    for results in order:
+        if html.get(results):
+            item = html[results][0]
+            date = item.get('release_date') or item.get('first_air_date') or ''
+            return {
+                'id': str(item.get('id', '')),
+                'title': item.get('title') or item.get('name', ''),
+                'plot': item.get('overview', ''),
+                'icon': _image(item.get('poster_path')),
+                'fanart': _image(item.get('backdrop_path')),
+                'year': date.split('-')[0],
+                'rating': item.get('vote_average', 0),
+            }
+    return {}
+
+
+class Resolver(object):
+    '''
+    Resolves the imdb ids of a list in the background. prefetch() takes every
+    (imdb_id, tv_movie) of the list once, get() waits for a single one.
+    '''
+
+    def __init__(self, lang, tmdb_key, max_workers=MAX_WORKERS):
+        self.lang = lang
+        self.tmdb_key = tmdb_key
+        self.max_workers = max_workers
+        self.meta_cache = None
+        self.executor = None
+        self.results = {}
+        self.futures = {}
+
+    def key(self, imdb_id, tv_movie):
+        return '%s|%s|%s' % (imdb_id, tv_movie, self.lang)
+
+    def _resolve(self, imdb_id, tv_movie):
+        try:
+            meta = resolve_imdb(imdb_id, tv_movie, self.lang, self.tmdb_key)
+        except Exception as e:
+            log.warning('Jen meta failed %s: %s' % (imdb_id, e))
+            return {}
+        # ids TMDB doesn't know are cached as {} too
+        self.meta_cache.set(self.key(imdb_id, tv_movie), meta)
+        return meta
+
+    def prefetch(self, ids):
+        wanted = {}
+        for imdb_id, tv_movie in ids:
+            if imdb_id and imdb_id.startswith('tt'):
+                wanted[self.key(imdb_id, tv_movie)] = (imdb_id, tv_movie)
+        if not wanted:
+            return
+        if self.meta_cache is None:
+            self.meta_cache = MetaCache()
+        self.results.update(self.meta_cache.get_many(wanted.keys()))
+        missing = [k for k in wanted if k not in self.results and k not in self.futures]
+        if missing and self.tmdb_key:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)))
+            for k in missing:
+                self.futures[k] = self.executor.submit(self._resolve, *wanted[k])
+        log.debug('Jen meta: %d ids, %d cached, %d to fetch' % (len(wanted), len(wanted) - len(missing), len(missing)))
+
+    def get(self, imdb_id, tv_movie):
+        k = self.key(imdb_id, tv_movie)
+        if k not in self.results:
+            future = self.futures.pop(k, None)
+            if future is None:
+                return {}
+            try:
+                self.results[k] = future.result()
+            except Exception:
+                self.results[k] = {}
+        return self.results[k]
+
+    def close(self):
+        for future in self.futures.values():
+            future.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+class DirectoryBatch(object):
+    '''
+    Hands list items to Kodi BATCH_SIZE at a time instead of all at the end.
+    With a batch_size of 0 nothing is added before flush().
+    '''
+
+    def __init__(self, handle, batch_size=BATCH_SIZE):
+        self.handle = handle
+        self.batch_size = batch_size
+        self.items = []
+        self.count = 0
+
+    def append(self, item):
+        self.items.append(item)
+        if self.batch_size and len(self.items) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.items:
+            xbmcplugin.addDirectoryItems(self.handle, self.items, len(self.items))
+            self.count += len(self.items)
+            self.items = []
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+'''
+    Size/type probes for direct links, used by general.server_data.
+
+    A link is probed with HEAD, or with a one byte ranged GET when the
+    server refuses HEAD, through the pooled per host sessions of client,
+    so nothing but headers is downloaded. Results, (size, type, status), are kept in
+    memory and in link_probe.db for PROBE_TTL seconds: a link found by
+    several scrapers, or again in the next search, is probed once. probe()
+    runs in the scraper thread that asks, a second thread asking for the
+    same link waits for that probe instead of starting its own.
+'''
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+import xbmcaddon
+
+from resources.modules import client
+from resources.modules import log
+from resources.modules import storage
+
+PROBE_TTL = 6 * 60 * 60
+FAILED_TTL = 10 * 60
+TIMEOUT = 15
+
+# hosts that are gone or never give a playable file, matched anywhere in the link
+BLOCKED_HOSTS = ('database.gdriveplayer.us', 'vidoza', 'streamcherry', 'verystream', 'openload', 'oload.', 'streamango',
+                 'rapidvideo', 'vidup.me', 'hqq.', 'vidup.tv', 'vidup.io', 'vidtodo.com', 'xn--4dbx', 'thefile.me',
+                 'videoweed.es', 'watchvideo17.us', 'vodlocker.com', 'bitvid.sx', 'waaw', 'flashx.pw', 'thevideo.me',
+                 'vev.io', 'movpod.in', 'daclips.in', 'dl8.heyserver.in', 'cloudtime.to', 'speedvid.net', 'watchers.to',
+                 'vidzella.me', 'not_found.php', 'nitroflare', 'nitrobit', 'youtube', 'vidto.me', 'vidzi.tv',
+                 'vidoza.net', 'nowvideo.sx', 'vidzi.nu', 'estream', 'streamcherry.com')
+BLOCKED = re.compile('|'.join(re.escape(host) for host in sorted(set(BLOCKED_HOSTS), key=len, reverse=True)))
+MEDIA_TYPES = ('stream', 'application', 'video', 'mp4')
+CONTENT_RANGE = re.compile(r'/(\d+)\s*$')
+
+# size in bytes (0 if unknown), content type, http status (0 if unreachable)
+Probe = namedtuple('Probe', 'size type status')
+UNREACHABLE = Probe(0, '', 0)
+
+_lock = threading.Lock()
+_prober = None
+
+
+def is_blocked(url):
+    return BLOCKED.search(url) is not None
+
+
+def is_media(probe):
+    return 200 <= probe.status < 400 and any(t in probe.type for t in MEDIA_TYPES)
+
+
+def format_size(size):
+    '''Bytes as the " GB" string server_data shows, '' below 1MB.'''
+    if size > 1024 * 1024:
+        return str(round(float(size) / (1024 * 1024 * 1024), 2)) + ' GB'
+    return ''
+
+
+def _db_file():
+    try:
+        from resources.modules.cache import xbmc_tranlate_path
+        data_path = xbmc_tranlate_path(xbmcaddon.Addon().getAddonInfo('profile'))
+    except Exception:
+        data_path = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(data_path, 'link_probe.db')
+
+
+class LinkProber(object):
+
+    def __init__(self, ttl=PROBE_TTL, timeout=TIMEOUT, path=None):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.path = path or _db_file()
+        self.results = {}
+        # url -> Event set once the thread probing it is done
+        self.pending = {}
+        self.lock = threading.Lock()
+        with storage.transaction(self.path) as dbcon:
+            dbcon.execute("CREATE TABLE IF NOT EXISTS probes (url TEXT PRIMARY KEY, size INTEGER, type TEXT, status INTEGER, expires INTEGER)")
+        storage.register_ttl(self.path, 'probes', 'expires', 0)
+
+    def _cached(self, url):
+        entry = self.results.get(url)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        return None
+
+    def _load(self, url):
+        row = storage.connect(self.path).execute("SELECT size, type, status, expires FROM probes WHERE url = ? AND expires > ?",
+                                                 (url, int(time.time()))).fetchone()
+        if row is None:
+            return None
+        with self.lock:
+            self.results[url] = (Probe(*row[:3]), row[3])
+        return Probe(*row[:3])
+
+    def _store(self, url, probe):
+        expires = time.time() + (self.ttl if probe.status and probe.status < 400 else FAILED_TTL)
+        try:
+            with storage.transaction(self.path) as dbcon:
+                dbcon.execute("INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?)", (url,) + tuple(probe) + (int(expires),))
+        except Exception as e:
+            log.warning('link probe store failed: %s' % e)
+        with self.lock:
+            self.results[url] = (probe, expires)
+
+    def _request(self, url, headers):
+        try:
+            session = client.get_session(url)
+            response = session.head(url, headers=headers, allow_redirects=True, verify=False, timeout=self.timeout)
+            if response.status_code < 400 and 'Content-Length' in response.headers:
+                return Probe(int(response.headers['Content-Length']), response.headers.get('Content-Type', ''), response.status_code)
+            # HEAD refused or without a size, ask for the first byte instead
+            ranged = dict(headers or {}, Range='bytes=0-0')
+            response = session.get(url, headers=ranged, stream=True, allow_redirects=True, verify=False, timeout=self.timeout)
+            response.close()
+            size = CONTENT_RANGE.search(response.headers.get('Content-Range', ''))
+            if size:
+                size = int(size.group(1))
+            else:
+                size = int(response.headers.get('Content-Length', 0) or 0)
+            return Probe(size, response.headers.get('Content-Type', ''), response.status_code)
+        except Exception as e:
+            log.warning('link probe failed %s: %s' % (url, e))
+            return UNREACHABLE
+
+    def probe(self, url, headers=None):
+        '''Returns the Probe of url, probing it if no fresh result is kept.'''
+        if is_blocked(url):
+            return UNREACHABLE
+        with self.lock:
+            probe = self._cached(url)
+            if probe is not None:
+                return probe
+            done = self.pending.get(url)
+            if done is None:
+                done = self.pending[url] = threading.Event()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            # HEAD, then maybe a ranged GET
+            done.wait(2 * self.timeout)
+            with self.lock:
+                return self._cached(url) or UNREACHABLE
+        try:
+            probe = self._load(url)
+            if probe is None:
+                probe = self._request(url, headers)
+                self._store(url, probe)
+            return probe
+        except Exception as e:
+            log.warning('link probe failed %s: %s' % (url, e))
+            return UNREACHABLE
+        finally:
+            with self.lock:
+                self.pending.pop(url, None)
+            done.set()
+
+
+def get():
+    '''Returns the add-on's LinkProber.'''
+    global _prober
+    with _lock:
+        if _prober is None:
+            _prober = LinkProber()
+        return _prober
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+'''
+    Shared sqlite access for the add-on's databases.
+
+    Each thread keeps one open connection per database file instead of
+    connecting on every call. Databases run in WAL mode with
+    synchronous=NORMAL, so the scraper threads, the player and the UI can
+    read while one of them writes, and a write no longer syncs the disk
+    twice. Writes that belong together go through transaction(), which
+    takes the write lock up front and commits once.
+
+    Connections returned by connect() stay open: close() on them commits
+    what the caller left uncommitted, so the thread's next user doesn't
+    find a transaction holding the write lock. Closing a cursor leaves the
+    transaction alone, the caller may still commit after it.
+
+    Maintenance: register_ttl() declares how old rows of a table may get,
+    maintain() purges them, checkpoints the WAL and gives free pages back
+    with an incremental vacuum.
+'''
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+
+try:
+    from sqlite3 import dbapi2 as database
+except ImportError:
+    from pysqlite2 import dbapi2 as database
+
+BUSY_TIMEOUT = 30
+MMAP_SIZE = 64 * 1024 * 1024
+CACHE_SIZE = -8000  # KiB
+VACUUM_PAGES = 2000
+
+_local = threading.local()
+_lock = threading.Lock()
+_databases = set()
+_ttls = []
+
+
+class Connection(database.Connection):
+
+    # inside transaction(), which commits or rolls back itself
+    explicit = False
+
+    def close(self):
+        # the connection belongs to the thread, see close_all()
+        if self.in_transaction and not self.explicit:
+            self.commit()
+
+    def _close(self):
+        database.Connection.close(self)
+
+
+def _configure(connection):
+    for pragma in ('journal_mode=WAL',
+                   'synchronous=NORMAL',
+                   'mmap_size=%d' % MMAP_SIZE,
+                   'cache_size=%d' % CACHE_SIZE,
+                   'temp_store=MEMORY'):
+        try:
+            connection.execute('PRAGMA %s' % pragma).fetchall()
+        except database.Error:
+            pass
+    # only takes effect on a new database, older ones are converted by
+    # the first incremental_vacuum()
+    if connection.execute('SELECT count(*) FROM sqlite_master').fetchone()[0] == 0:
+        connection.execute('PRAGMA auto_vacuum=INCREMENTAL')
+
+
+def connect(path, isolation_level=''):
+    '''Returns this thread's connection to the database at path.'''
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    connection = connections.get(path)
+    if connection is None:
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        connection = database.connect(path, timeout=BUSY_TIMEOUT, factory=Connection,
+                                      isolation_level=isolation_level)
+        _configure(connection)
+        connections[path] = connection
+        with _lock:
+            _databases.add(path)
+    elif connection.isolation_level != isolation_level:
+        connection.isolation_level = isolation_level
+    return connection
+
+
+@contextmanager
+def transaction(path):
+    '''
+    Runs the block in one write transaction on this thread's connection:
+    committed when the block ends, rolled back if it raises.
+
+    >>> with storage.transaction(path) as dbcon:
+    ...     dbcon.executemany("INSERT INTO t VALUES (?, ?)", rows)
+    '''
+    connection = connect(path)
+    if connection.in_transaction:
+        # left open by an earlier caller that failed before committing
+        connection.rollback()
+    connection.execute('BEGIN IMMEDIATE')
+    connection.explicit = True
+    try:
+        yield connection
+    except BaseException:
+        connection.rollback()
+        raise
+    else:
+        connection.commit()
+    finally:
+        connection.explicit = False
+
+
+def reset(path):
+    '''Closes this thread's connection to path, e.g. before deleting the file.'''
+    connections = getattr(_local, 'connections', {})
+    connection = connections.pop(path, None)
+    if connection is not None:
+        connection._close()
+
+
+def close_all():
+    '''Closes every connection of this thread.'''
+    for path in list(getattr(_local, 'connections', {})):
+        reset(path)
+
+
+def register_ttl(path, table, column, ttl):
+    '''Rows of table whose column (unix time) is older than ttl seconds are purged by maintain().'''
+    with _lock:
+        if (path, table, column, ttl) not in _ttls:
+            _ttls.append((path, table, column, ttl))
+        _databases.add(path)
+
+
+def purge(path, table, column, older_than):
+    '''Deletes the rows of table whose column is below older_than. Returns the number deleted.'''
+    try:
+        with transaction(path) as connection:
+            return connection.execute('DELETE FROM %s WHERE CAST(%s AS INTEGER) < ?' % (table, column),
+                                      (int(older_than),)).rowcount
+    except database.OperationalError:
+        # table not created yet
+        return 0
+
+
+def incremental_vacuum(path, pages=VACUUM_PAGES):
+    '''
+    Gives up to pages free pages back to the file system. A database still in
+    auto_vacuum=NONE is converted with one full VACUUM first.
+    '''
+    connection = connect(path)
+    if connection.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        connection.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        connection.execute('VACUUM')
+        return
+    connection.execute('PRAGMA incremental_vacuum(%d)' % pages).fetchall()
+
+
+def checkpoint(path):
+    '''Copies the WAL back into the database and truncates it.'''
+    connect(path).execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+
+
+def maintain(vacuum=True):
+    '''Runs the registered TTL purges, then checkpoints and vacuums every database used so far.'''
+    started = time.time()
+    purged = 0
+    with _lock:
+        ttls = list(_ttls)
+        paths = sorted(_databases)
+    now = time.time()
+    for path, table, column, ttl in ttls:
+        purged += purge(path, table, column, now - ttl)
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            checkpoint(path)
+            if vacuum:
+                incremental_vacuum(path)
+        except database.Error:
+            pass
+    return {'databases': len(paths), 'purged': purged, 'seconds': time.time() - started}
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+'''
+    Release name matching for check_rejected.
+
+    A search checks thousands of release names against the same title.
+    TitleMatcher normalises the searched title, its aliases and the
+    season/episode patterns once, normalise_release() remembers the
+    normalised form of every release name it has seen, so a check comes
+    down to a few substring tests.
+
+    >>> matcher = TitleMatcher('2019', '1', '2', 'The Boys', 'tv', '', True)
+    >>> matcher.rejected('The.Boys.S01E02.1080p.WEB.h264')
+    False
+'''
+import re
+import time
+
+from functools import lru_cache
+
+RELEASE_CACHE_SIZE = 8192
+MATCHER_CACHE_SIZE = 8
+
+BRACKETS = re.compile(r'\[(.+?)\]')
+EPISODE_MARK = re.compile('[0-9]{1,2}x[0-9]*')
+# the first SxxEyy style mark, the show title is everything in front of it
+EPISODE_START = re.compile(r'[.-]s?(?:\d{1,2})?e?\d{2}\.')
+
+# the replace chains check_rejected has always used, applied in order
+RELEASE_CHAIN = (('%27', ''), ("'", ''), ('%20', ' '), ('and', ''), ('.&.', ''), (' & ', ''), (' and ', ''),
+                 ('_', '.'), ('%3A', '.'), ('%3a', '.'), (':', ''), ('-', '.'), ('[', '('), (']', ')'),
+                 ('  ', '.'), (' ', '.'), ('....', '.'), ('...', '.'), ('..', '.'), ("'", ''))
+TITLE_CHAIN = (('%27', ''), ("'", ''), ('%20', ' '), ('and', ''),
+               ('_', '.'), ('%3A', '.'), ('%3a', '.'), (':', ''), ('-', '.'), ('[', '('), (']', ')'),
+               ('  ', '.'), (' ', '.'), ('....', '.'), ('...', '.'), ('..', '.'), ("'", ''))
+ALT_CHAIN = (('%20', ' '), ('and', ''), ('.&.', ''), (' & ', ''), (' and ', ''),
+             ('_', '.'), ('%3A', '.'), ('%3a', '.'), (':', ''), ('-', '.'), ('[', '('), (']', ')'),
+             ('  ', '.'), (' ', '.'), ('....', '.'), ('...', '.'), ('..', '.'), ("'", ''))
+
+FOREIGN = ('rus', 'russian', 'fr', 'french', 'TrueFrench', 'ita', 'italiano', 'castellano', 'spanish', 'swedish',
+           'dk', 'danish', 'german', 'nordic', 'exyu', 'chs', 'hindi', 'polish', 'mandarin', 'kor', 'korean')
+FOREIGN_MARKS = tuple('.%s.' % lang for lang in FOREIGN)
+ENGLISH_MARKS = ('.en.', '.eng.', '.english.')
+
+
+def _chain(text, pairs):
+    for old, new in pairs:
+        text = text.replace(old, new)
+    return text.strip().lower()
+
+
+def clean_marks(title):
+    '''Drops [tags] and a 1x02 style episode mark from a release name.'''
+    for items in BRACKETS.findall(title):
+        title = title.replace('[%s]' % items, '')
+    m = EPISODE_MARK.findall(title)
+    if len(m) > 0:
+        title = title.replace(m[0], '').strip()
+    return title
+
+
+@lru_cache(maxsize=RELEASE_CACHE_SIZE)
+def normalise_release(name):
+    '''
+    Returns (c_name, has_3d) for a release name: the dotted lower case name
+    and whether the name mentions 3d.
+    '''
+    return _chain(clean_marks(name), RELEASE_CHAIN), '3d' in name.lower()
+
+
+@lru_cache(maxsize=RELEASE_CACHE_SIZE)
+def release_show_title(name):
+    '''Returns the show title in front of the SxxEyy mark of a release name, '' if there is none.'''
+    cl_name = clean_marks(name).lower().replace(' ', '.').replace('-', '.')
+    found = EPISODE_START.search(cl_name)
+    if not found:
+        return ''
+    return cl_name[:found.start()].replace('.and.', '').replace('.&.', '').replace('.', '').replace('&amp;', '')
+
+
+class TitleMatcher(object):
+    '''
+    check_rejected for one search. Built once from the searched title,
+    rejected() is then called for every release name found.
+    The year and the Hebrew title are taken for check_rejected's signature
+    but, as before, not matched.
+    '''
+
+    def __init__(self, show_original_year, season, episode, original_title, tv_movie, heb_name, filter_lang):
+        self.tv_movie = tv_movie
+        self.filter_lang = filter_lang
+
+        title = _chain(original_title, TITLE_CHAIN)
+        self.alt_title = _chain(title, ALT_CHAIN)
+        if 'stargirl' in title:
+            title = title.replace("dcs.", '').replace("dc%27s.", '')
+        self.title = title
+
+        if tv_movie != 'movie':
+            season_n = '0' + season if len(season) == 1 else season
+            episode_n = '0' + episode if len(episode) == 1 else episode
+            self.tv_title = title.replace('.and.', '').replace('.&.', '').replace('.', '')
+            title = self.tv_title
+            self.episode_dot = ('s%se%s.' % (season_n, episode_n), 's%se%s.' % (season, episode))
+            self.episode_end = ('s%se%s###' % (season_n, episode_n), 's%se%s###' % (season, episode))
+            self.season_dot = ('season.%s.' % season, 'season.%s.' % season_n)
+            self.season_end = ('season.%s$$$' % season, 'season.%s$$$' % season_n)
+            self.season_other = ('season %s' % season_n, 'season %s ' % season, 's%s ' % season)
+            self.season_mark = '.s%s.' % season_n
+        self.three_d = ' 3d' in title
+
+    def _tv_rejected(self, name, c_name):
+        tv_title = release_show_title(name)
+        if not tv_title:
+            return True
+        if tv_title != self.tv_title:
+            return True
+        if any(p in c_name for p in self.episode_dot):
+            return False
+        if any(p in c_name + '###' for p in self.episode_end):
+            return False
+        if 'season' in c_name:
+            return not (any(p in c_name for p in self.season_dot)
+                        or any(p in c_name + '$$$' for p in self.season_end)
+                        or any(p in c_name for p in self.season_other))
+        return self.season_mark not in c_name
+
+    def rejected(self, name, one_click=False):
+        '''True if the release name is not the searched movie/episode.'''
+        c_name, has_3d = normalise_release(name)
+        if self.tv_movie == 'movie':
+            reject = self.title not in c_name and self.alt_title not in c_name
+        else:
+            reject = self._tv_rejected(name, c_name)
+        if self.three_d and not has_3d:
+            reject = True
+        if self.filter_lang and any(m in c_name for m in FOREIGN_MARKS) and not any(m in c_name for m in ENGLISH_MARKS):
+            reject = True
+        return reject
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def matcher(show_original_year, season, episode, original_title, tv_movie, heb_name, filter_lang):
+    '''Returns the TitleMatcher of a search, built the first time it is asked for.'''
+    return TitleMatcher(show_original_year, season, episode, original_title, tv_movie, heb_name, filter_lang)
+
+
+def _legacy_rejected(name, show_original_year, season, episode, original_title, tv_movie, heb_name, filter_lang):
+    # check_rejected before the matcher, kept for the benchmark
+    cl_name = clean_marks(name)
+    c_name = cl_name.replace('%27','').replace("'",'').replace('%20',' ').replace('and','').replace('.&.','').replace(' & ','').replace(' and ','').replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
+    original_title = original_title.replace('%27','').replace("'",'').replace('%20',' ').replace('and','').replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
+    original_title_alt = original_title.replace('%20',' ').replace('and','').replace('.&.','').replace(' & ','').replace(' and ','').replace('_','.').replace('%3A','.').replace('%3a','.').replace(':','').replace('-','.').replace('[','(').replace(']',')').replace('  ','.').replace(' ','.').replace('....','.').replace('...','.').replace('..','.').replace("'",'').strip().lower()
+    if 'stargirl' in original_title.lower():
+        original_title = original_title.replace("dcs.",'')
+        original_title = original_title.replace("dc%27s.",'')
+    reject = False
+    if tv_movie == 'movie':
+        if original_title not in c_name and original_title_alt not in c_name:
+            reject = True
+    else:
+        clean_title_pre = re.compile(r'(.*?)?(\.|-)s?(\d{1,2})?e?(\d{2})\.(.*)').findall(cl_name.lower().replace(' ','.').replace('-','.'))
+        clean_title = None
+        if len(clean_title_pre) > 0:
+            clean_title = clean_title_pre[0][0]
+        season_n = "0" + season if len(season) == 1 else season
+        episode_n = "0" + episode if len(episode) == 1 else episode
+        if clean_title:
+            clean_title = clean_title.replace('.and.','').replace('.&.','').replace('.','').replace('&amp;','')
+        original_title = original_title.replace('.and.','').replace('.&.','').replace('.','')
+        if not clean_title:
+            reject = True
+        elif clean_title.lower() != original_title:
+            reject = True
+        elif 's%se%s.'%(season_n,episode_n) in c_name or 's%se%s###'%(season_n,episode_n) in c_name+'###' or 's%se%s###'%(season,episode) in c_name+'###' or 's%se%s.'%(season,episode) in c_name:
+            reject = False
+        elif 'season' in c_name:
+            if 'season.%s.'%season not in c_name.lower() and 'season.%s$$$'%season not in (c_name.lower()+'$$$') and 'season.%s$$$'%season_n not in (c_name.lower()+'$$$') and 'season.%s.'%season_n not in c_name.lower() and 'season %s'%season_n not in c_name and 'season %s '%season not in c_name and 's%s '%season not in c_name:
+                reject = True
+        elif '.s%s.'%season_n in c_name:
+            reject = False
+        else:
+            reject = True
+    if ' 3d' in original_title.lower() and '3d' not in name.lower():
+        reject = True
+    if filter_lang:
+        for itt in FOREIGN:
+            if '.'+itt+'.' in c_name and '.en.' not in c_name and '.eng.' not in c_name and '.english.' not in c_name:
+                reject = True
+                break
+    return reject
+
+
+def benchmark(names, search):
+    '''Times the legacy checks against one matcher over names and checks they agree.'''
+    start = time.time()
+    legacy = [_legacy_rejected(name, *search) for name in names]
+    legacy_time = time.time() - start
+
+    normalise_release.cache_clear()
+    release_show_title.cache_clear()
+    start = time.time()
+    title_matcher = TitleMatcher(*search)
+    cold = [title_matcher.rejected(name) for name in names]
+    cold_time = time.time() - start
+
+    start = time.time()
+    warm = [title_matcher.rejected(name) for name in names]
+    warm_time = time.time() - start
+
+    mismatches = sum(1 for a, b, c in zip(legacy, cold, warm) if not a == b == c)
+    print('%d releases, %s, %d rejected' % (len(names), search[3], sum(cold)))
+    print('legacy: %.1fms, matcher: %.1fms cold, %.1fms cached, %d mismatches' % (
+        legacy_time * 1000, cold_time * 1000, warm_time * 1000, mismatches))
+    return mismatches
+
+
+if __name__ == '__main__':
+    # python title_match.py [releases.txt], one release name per line. Without
+    # a file 2000 names are generated for a movie and an episode search.
+    import random
+    import sys
+
+    rnd = random.Random(42)
+    searches = [('2019', '1', '2', 'The Boys', 'tv', '', True),
+                ('2010', '', '', 'Scott Pilgrim vs. the World', 'movie', '', True)]
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            lists = [[line.strip() for line in f if line.strip()]] * len(searches)
+    else:
+        tags = ['1080p', '720p', '2160p', 'WEB-DL', 'BluRay', 'x264', 'HEVC', 'DDP5.1', 'FRENCH', 'ENG', 'iTA', '3D', 'REPACK']
+        lists = []
+        for search in searches:
+            titles = [search[3], search[3].replace(' ', '.'), 'The Boys Presents Diabolical', 'Scott Pilgrim Takes Off', 'Other Show']
+            names = []
+            for i in range(2000):
+                title = rnd.choice(titles).replace(' ', rnd.choice(['.', ' ', '_']))
+                mark = rnd.choice(['S01E02', 'S01E03', 'S1E2', 'Season 1', 'S01', '2010', '1x02', '(2019)'])
+                extra = '.'.join(rnd.sample(tags, 3))
+                names.append('%s%s.%s.%s-GRP%d' % (rnd.choice(['', '[site.org] ']), title, mark, extra, i % 50))
+            lists.append(names)
+    sys.exit(1 if sum(benchmark(names, search) for names, search in zip(lists, searches)) else 0)
@@ -13,6 +13,9 @@ from xml.sax.saxutils import escape
 from xml.etree import ElementTree
 
 
+DOREGEX_RE = re.compile(r'\$doregex\[([^\]]*)\]')
+
+
 class NoRedirection(urllib_error.HTTPError):
     def http_response(self, request, response):
         return response
@@ -280,7 +283,7 @@ def rmSource(name):
     xbmc.executebuiltin("XBMC.Container.Refresh")
 
 
-def getSoup(url, data=None):
+def getSoup(url, data=None, streamed=False):
     global viewmode, tsdownloader, hlsretry
     tsdownloader = False
     hlsretry = False
@@ -299,15 +302,20 @@ def getSoup(url, data=None):
 
         data = makeRequest(url)
         if enckey:
-            import pyaes
             enckey = enckey.encode("ascii")
             missingbytes = 16 - len(enckey)
-            enckey = enckey + (chr(0) * (missingbytes))
+            enckey = enckey + (b'\0' * (missingbytes))
             data = base64.b64decode(data)
-            decryptor = pyaes.new(enckey, pyaes.MODE_ECB, IV=None)
-            data = decryptor.decrypt(data).split('\0')[0]
-
-        if re.search("#EXTM3U", data) or 'm3u' in url:
+            try:
+                from resolveurl.lib import crypto
+                data = crypto.aes_ecb_decrypt(enckey, data)
+            except ImportError:
+                import pyaes
+                decryptor = pyaes.new(enckey, pyaes.MODE_ECB, IV=None)
+                data = decryptor.decrypt(data)
+            data = six.ensure_str(data, errors='ignore').split('\0')[0]
+
+        if '#EXTM3U' in data or 'm3u' in url:
             return data
     elif data is None:
         if xbmcvfs.exists(url):
@@ -331,6 +339,9 @@ def getSoup(url, data=None):
         else:
             addon_log("Soup Data not found!")
             return
+    if streamed:
+        return getParsedList(url, data)
+
     if '<SetViewMode>' in data:
         try:
             viewmode = re.findall('<SetViewMode>(.*?)<', data)[0]
@@ -360,28 +371,65 @@ def processPyFunction(data):
     return data
 
 
-def getData(url, fanart, data=None):
-    soup = getSoup(url, data)
+def getParsedList(url, data):
+    global viewmode
+    import listloader
+
+    parsed = None
+    try:
+        parsed = listloader.load_list(url, data, os.path.join(profile, 'lists'))
+    except ElementTree.ParseError as err:
+        xbmcgui.Dialog().notification(addon_name, 'Failed to parse xml: {0}'.format(err.msg), icon, 10000, False)
+    except Exception as err:
+        xbmcgui.Dialog().notification(addon_name, 'An error occurred: {0}'.format(err), icon, 10000, False)
+
+    if parsed is not None and parsed.viewmode:
+        viewmode = parsed.viewmode
+        xbmc.executebuiltin("Container.SetViewMode({0})".format(viewmode))
+
+    return parsed
+
+
+def getCachedList(listkey):
+    import listloader
+    return listloader.load_cached(listkey, os.path.join(profile, 'lists'))
+
+
+def addNextPage(url, fanart, page, regexs=None, listkey=None):
+    u = sys.argv[0] + "?url=" + urllib_parse.quote_plus(url) + "&mode=1&name=" + urllib_parse.quote_plus('Next Page') + "&fanart=" + urllib_parse.quote_plus(fanart) + "&page=" + str(page + 1)
+    if regexs:
+        u += "&regexs=" + regexs
+    if listkey:
+        # the list came in as data, not from url, the next page reads it from the list cache
+        u += "&listkey=" + listkey
+    liz = xbmcgui.ListItem('[COLOR yellow]Next Page >>[/COLOR]')
+    liz.setArt({'fanart': fanart, 'icon': "DefaultFolder.png"})
+    xbmcplugin.addDirectoryItem(handle=int(sys.argv[1]), url=u, listitem=liz, isFolder=True)
+
+
+def getData(url, fanart, data=None, page=0, regexs=None, parsed=None):
+    soup = parsed if parsed is not None else getSoup(url, data, streamed=True)
     channels = None
-    if isinstance(soup, ElementTree.Element):
+    if soup is None:
+        return
+    if not isinstance(soup, six.string_types):
+        import listloader
+        page_size = listloader.PAGE_SIZE
+        listkey = soup.key if data is not None or parsed is not None else None
         if (soup.tag == 'channels' and len(soup) > 0 and addon.getSetting('donotshowbychannels') == 'false') or (soup.tag == 'items' and len(soup) > 0):
-            channels = soup.findall('channel')
+            channels = soup.page('channel', page, page_size)
             tepg = None
-            media_info = None
-            if soup.find('channels_info') is not None:
-                media_info = soup.find('channels_info')
-            elif soup.find('items_info') is not None:
-                media_info = soup.find('items_info')
+            media_info = soup.get_info()
 
             if media_info:
                 try:
                     if media_info.find('epg') is not None:
                         epg = media_info.find('epg').text
                         reg_item = media_info.find('epg_regex')
-                        regexs = parse_regex(reg_item)
+                        epg_regexs = parse_regex(reg_item)
 
                         if '$doregex' in epg and getRegexParsed is not None:
-                            tepg, setres = getRegexParsed(regexs, epg)
+                            tepg, setres = getRegexParsed(epg_regexs, epg)
 
                         if tepg:
                             try:
@@ -457,9 +505,14 @@ def getData(url, fanart, data=None):
                 except:
                     addon_log('There was a problem adding directory from getData(): {0}'.format(name))
 
+            if soup.has_next('channel', page, page_size):
+                addNextPage(url, fanart, page, regexs, listkey)
+
         if channels is None or len(channels) == 0:
             addon_log('No Channels: getItems')
-            getItems(soup.findall('item'), fanart)
+            getItems(soup.page('item', page, page_size), fanart)
+            if soup.has_next('item', page, page_size):
+                addNextPage(url, fanart, page, regexs, listkey)
 
     else:
         parse_m3u(soup)
@@ -831,7 +884,7 @@ def getItems(items, fanart, dontLink=False):
 def parse_regex(reg_items):
     reg_tags = ['name', 'expres', 'page', 'referer', 'connection', 'notplayable', 'noredirect', 'origin', 'agent',
                 'accept', 'includeheaders', 'listrepeat', 'proxy', 'x-req', 'x-addr', 'x-forward', 'post', 'rawpost',
-                'htmlunescape', 'readcookieonly', 'cookiejar', 'setcookie', 'appendcookie', 'ignorecache', 'thumbnail']
+                'htmlunescape', 'readcookieonly', 'cookiejar', 'setcookie', 'appendcookie', 'ignorecache', 'cachettl', 'thumbnail']
     regexs = {}
 
     if isinstance(reg_items, ElementTree.Element):
@@ -871,11 +924,24 @@ def get_ustream(url):
         return
 
 
-def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiveCall=False, cachedPages={}, rawPost=False, cookie_jar_file=None):  # 0,1,2 = URL, regexOnly, CookieJarOnly
+def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiveCall=False, chainCache=None, rawPost=False, cookie_jar_file=None):  # 0,1,2 = URL, regexOnly, CookieJarOnly
+    if chainCache is not None:
+        return _getRegexParsed(regexs, url, cookieJar, forCookieJarOnly, recursiveCall, chainCache, rawPost, cookie_jar_file)
+
+    import regexcache
+    chainCache = regexcache.RegexChainCache(profile)
+    try:
+        return _getRegexParsed(regexs, url, cookieJar, forCookieJarOnly, recursiveCall, chainCache, rawPost, cookie_jar_file)
+    finally:
+        chainCache.close()
+
+
+def _getRegexParsed(regexs, url, cookieJar, forCookieJarOnly, recursiveCall, chainCache, rawPost, cookie_jar_file):
+    from regexcache import regex_ttl
     if not recursiveCall:
         regexs = eval(urllib_parse.unquote(regexs))
 
-    doRegexs = re.compile(r'\$doregex\[([^\]]*)\]').findall(url)
+    doRegexs = DOREGEX_RE.findall(url)
     setresolved = True
     for k in doRegexs:
         if k in regexs:
@@ -884,7 +950,7 @@ def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiv
             if 'cookiejar' in m:  # so either create or reuse existing jar
                 cookieJarParam = m['cookiejar']
                 if '$doregex' in cookieJarParam:
-                    cookieJar = getRegexParsed(regexs, m['cookiejar'], cookieJar, True, True, cachedPages)
+                    cookieJar = getRegexParsed(regexs, m['cookiejar'], cookieJar, True, True, chainCache)
                     cookieJarParam = True
                 else:
                     cookieJarParam = True
@@ -894,30 +960,29 @@ def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiv
                     cookie_jar_file = None
                     if 'open[' in m['cookiejar']:
                         cookie_jar_file = m['cookiejar'].split('open[')[1].split(']')[0]
-                    cookieJar = getCookieJar(cookie_jar_file)
+                    cookieJar = chainCache.get_cookie_jar(cookie_jar_file, getCookieJar)
                     if cookie_jar_file:
-                        saveCookieJar(cookieJar, cookie_jar_file)
+                        chainCache.save_cookie_jar(cookieJar, cookie_jar_file, saveCookieJar)
                 elif 'save[' in m['cookiejar']:
                     cookie_jar_file = m['cookiejar'].split('save[')[1].split(']')[0]
-                    complete_path = os.path.join(profile, cookie_jar_file)
-                    # saveCookieJar(cookieJar, cookie_jar_file)  # gujal
-                    saveCookieJar(cookieJar, complete_path)
+                    # keyed like open[], saveCookieJar joins the profile itself
+                    chainCache.save_cookie_jar(cookieJar, cookie_jar_file, saveCookieJar)
             if m['page'] and '$doregex' in m['page']:
-                pg = getRegexParsed(regexs, m['page'], cookieJar, recursiveCall=True, cachedPages=cachedPages)
+                pg = getRegexParsed(regexs, m['page'], cookieJar, recursiveCall=True, chainCache=chainCache)
                 if len(pg) == 0:
                     pg = 'http://regexfailed'
                 m['page'] = pg
 
             if 'setcookie' in m and m['setcookie'] and '$doregex' in m['setcookie']:
-                m['setcookie'] = getRegexParsed(regexs, m['setcookie'], cookieJar, recursiveCall=True, cachedPages=cachedPages)
+                m['setcookie'] = getRegexParsed(regexs, m['setcookie'], cookieJar, recursiveCall=True, chainCache=chainCache)
             if 'appendcookie' in m and m['appendcookie'] and '$doregex' in m['appendcookie']:
-                m['appendcookie'] = getRegexParsed(regexs, m['appendcookie'], cookieJar, recursiveCall=True, cachedPages=cachedPages)
+                m['appendcookie'] = getRegexParsed(regexs, m['appendcookie'], cookieJar, recursiveCall=True, chainCache=chainCache)
 
             if 'post' in m and '$doregex' in m['post']:
-                m['post'] = getRegexParsed(regexs, m['post'], cookieJar, recursiveCall=True, cachedPages=cachedPages)
+                m['post'] = getRegexParsed(regexs, m['post'], cookieJar, recursiveCall=True, chainCache=chainCache)
 
             if 'rawpost' in m and '$doregex' in m['rawpost']:
-                m['rawpost'] = getRegexParsed(regexs, m['rawpost'], cookieJar, recursiveCall=True, cachedPages=cachedPages, rawPost=True)
+                m['rawpost'] = getRegexParsed(regexs, m['rawpost'], cookieJar, recursiveCall=True, chainCache=chainCache, rawPost=True)
 
             if 'rawpost' in m and '$epoctime$' in m['rawpost']:
                 m['rawpost'] = m['rawpost'].replace('$epoctime$', getEpocTime())
@@ -926,104 +991,112 @@ def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiv
                 m['rawpost'] = m['rawpost'].replace('$epoctime2$', getEpocTime2())
 
             link = ''
-            if m['page'] and m['page'] in cachedPages and 'ignorecache' not in m and forCookieJarOnly is False:
-                link = cachedPages[m['page']]
-            else:
-                if m['page'] and m['page'] != '' and m['page'].startswith('http'):
-                    if '$epoctime$' in m['page']:
-                        m['page'] = m['page'].replace('$epoctime$', getEpocTime())
-                    if '$epoctime2$' in m['page']:
-                        m['page'] = m['page'].replace('$epoctime2$', getEpocTime2())
-
-                    page_split = m['page'].split('|')
-                    pageUrl = page_split[0]
-                    header_in_page = None
-                    if len(page_split) > 1:
-                        header_in_page = page_split[1]
-
-                    current_proxies = urllib_request.ProxyHandler(urllib_request.getproxies())
-                    req = urllib_request.Request(pageUrl)
-                    if 'proxy' in m:
-                        proxytouse = m['proxy']
-                        if pageUrl[:5] == "https":
-                            proxy = urllib_request.ProxyHandler({'https': proxytouse})
-                        else:
-                            proxy = urllib_request.ProxyHandler({'http': proxytouse})
-                        opener = urllib_request.build_opener(proxy)
-                        urllib_request.install_opener(opener)
-
-                    req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 6.1; rv:14.0) Gecko/20100101 Firefox/14.0.1')
-                    proxytouse = None
-
-                    if 'referer' in m:
-                        req.add_header('Referer', m['referer'])
-                    if 'accept' in m:
-                        req.add_header('Accept', m['accept'])
-                    if 'agent' in m:
-                        req.add_header('User-agent', m['agent'])
-                    if 'x-req' in m:
-                        req.add_header('X-Requested-With', m['x-req'])
-                    if 'x-addr' in m:
-                        req.add_header('x-addr', m['x-addr'])
-                    if 'x-forward' in m:
-                        req.add_header('X-Forwarded-For', m['x-forward'])
-                    if 'setcookie' in m:
-                        req.add_header('Cookie', m['setcookie'])
-                    if 'appendcookie' in m:
-                        cookiestoApend = m['appendcookie']
-                        cookiestoApend = cookiestoApend.split(';')
-                        for h in cookiestoApend:
+            if m['page'] and m['page'] != '' and m['page'].startswith('http'):
+                if '$epoctime$' in m['page']:
+                    m['page'] = m['page'].replace('$epoctime$', getEpocTime())
+                if '$epoctime2$' in m['page']:
+                    m['page'] = m['page'].replace('$epoctime2$', getEpocTime2())
+
+                page_split = m['page'].split('|')
+                pageUrl = page_split[0]
+                header_in_page = None
+                if len(page_split) > 1:
+                    header_in_page = page_split[1]
+
+                current_proxies = urllib_request.ProxyHandler(urllib_request.getproxies())
+                req = urllib_request.Request(pageUrl)
+                if 'proxy' in m:
+                    proxytouse = m['proxy']
+                    if pageUrl[:5] == "https":
+                        proxy = urllib_request.ProxyHandler({'https': proxytouse})
+                    else:
+                        proxy = urllib_request.ProxyHandler({'http': proxytouse})
+                    opener = urllib_request.build_opener(proxy)
+                    urllib_request.install_opener(opener)
+
+                req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 6.1; rv:14.0) Gecko/20100101 Firefox/14.0.1')
+                proxytouse = None
+
+                if 'referer' in m:
+                    req.add_header('Referer', m['referer'])
+                if 'accept' in m:
+                    req.add_header('Accept', m['accept'])
+                if 'agent' in m:
+                    req.add_header('User-agent', m['agent'])
+                if 'x-req' in m:
+                    req.add_header('X-Requested-With', m['x-req'])
+                if 'x-addr' in m:
+                    req.add_header('x-addr', m['x-addr'])
+                if 'x-forward' in m:
+                    req.add_header('X-Forwarded-For', m['x-forward'])
+                if 'setcookie' in m:
+                    req.add_header('Cookie', m['setcookie'])
+                if 'appendcookie' in m:
+                    cookiestoApend = m['appendcookie']
+                    cookiestoApend = cookiestoApend.split(';')
+                    for h in cookiestoApend:
+                        n, v = h.split('=')
+                        w, n = n.split(':')
+                        ck = http_cookiejar.Cookie(version=0, name=n, value=v, port=None, port_specified=False, domain=w, domain_specified=False, domain_initial_dot=False, path='/', path_specified=True, secure=False, expires=None, discard=True, comment=None, comment_url=None, rest={'HttpOnly': None}, rfc2109=False)
+                        cookieJar.set_cookie(ck)
+                if 'origin' in m:
+                    req.add_header('Origin', m['origin'])
+                if header_in_page:
+                    header_in_page = header_in_page.split('&')
+                    for h in header_in_page:
+                        if h.split('=') == 2:
                             n, v = h.split('=')
-                            w, n = n.split(':')
-                            ck = http_cookiejar.Cookie(version=0, name=n, value=v, port=None, port_specified=False, domain=w, domain_specified=False, domain_initial_dot=False, path='/', path_specified=True, secure=False, expires=None, discard=True, comment=None, comment_url=None, rest={'HttpOnly': None}, rfc2109=False)
-                            cookieJar.set_cookie(ck)
-                    if 'origin' in m:
-                        req.add_header('Origin', m['origin'])
-                    if header_in_page:
-                        header_in_page = header_in_page.split('&')
-                        for h in header_in_page:
-                            if h.split('=') == 2:
-                                n, v = h.split('=')
-                            else:
-                                vals = h.split('=')
-                                n = vals[0]
-                                v = '='.join(vals[1:])
-                            req.add_header(n, v)
-
-                    if cookieJar is not None:
-                        cookie_handler = urllib_request.HTTPCookieProcessor(cookieJar)
-                        opener = urllib_request.build_opener(cookie_handler, urllib_request.HTTPBasicAuthHandler(), urllib_request.HTTPHandler())
-                        opener = urllib_request.install_opener(opener)
-
-                        if 'noredirect' in m:
-                            opener = urllib_request.build_opener(cookie_handler, NoRedirection, urllib_request.HTTPBasicAuthHandler(), urllib_request.HTTPHandler())
-                            opener = urllib_request.install_opener(opener)
-                    elif 'noredirect' in m:
-                        opener = urllib_request.build_opener(NoRedirection, urllib_request.HTTPBasicAuthHandler(), urllib_request.HTTPHandler())
+                        else:
+                            vals = h.split('=')
+                            n = vals[0]
+                            v = '='.join(vals[1:])
+                        req.add_header(n, v)
+
+                if cookieJar is not None:
+                    cookie_handler = urllib_request.HTTPCookieProcessor(cookieJar)
+                    opener = urllib_request.build_opener(cookie_handler, urllib_request.HTTPBasicAuthHandler(), urllib_request.HTTPHandler())
+                    opener = urllib_request.install_opener(opener)
+
+                    if 'noredirect' in m:
+                        opener = urllib_request.build_opener(cookie_handler, NoRedirection, urllib_request.HTTPBasicAuthHandler(), urllib_request.HTTPHandler())
                         opener = urllib_request.install_opener(opener)
-
-                    if 'connection' in m:
-                        from keepalive import HTTPHandler
-                        keepalive_handler = HTTPHandler()
-                        opener = urllib_request.build_opener(keepalive_handler)
-                        urllib_request.install_opener(opener)
-
-                    post = None
-                    if 'post' in m:
-                        postData = m['post']
-                        splitpost = postData.split(',')
-                        post = {}
-                        for p in splitpost:
-                            n = p.split(':')[0]
-                            v = p.split(':')[1]
-                            post[n] = v
-                        post = urllib_parse.urlencode(post)
-
-                    if 'rawpost' in m:
-                        post = m['rawpost']
-
-                    link = ''
-
+                elif 'noredirect' in m:
+                    opener = urllib_request.build_opener(NoRedirection, urllib_request.HTTPBasicAuthHandler(), urllib_request.HTTPHandler())
+                    opener = urllib_request.install_opener(opener)
+
+                if 'connection' in m:
+                    from keepalive import HTTPHandler
+                    keepalive_handler = HTTPHandler()
+                    opener = urllib_request.build_opener(keepalive_handler)
+                    urllib_request.install_opener(opener)
+
+                post = None
+                if 'post' in m:
+                    postData = m['post']
+                    splitpost = postData.split(',')
+                    post = {}
+                    for p in splitpost:
+                        n = p.split(':')[0]
+                        v = p.split(':')[1]
+                        post[n] = v
+                    post = urllib_parse.urlencode(post)
+
+                if 'rawpost' in m:
+                    post = m['rawpost']
+
+                link = ''
+
+                # pages fetched with a live cookie jar only stay cached for this chain unless the regex sets cachettl
+                cacheKey = chainCache.make_key(pageUrl, post=post, headers=req.header_items())
+                cacheTtl = regex_ttl(m) if cookieJar is None or 'cachettl' in m else 0
+                cached = None
+                if not forCookieJarOnly and 'ignorecache' not in m:
+                    cached = chainCache.get(cacheKey)
+                if cached is not None:
+                    link = cached
+                    if 'proxy' in m and current_proxies is not None:
+                        urllib_request.install_opener(urllib_request.build_opener(current_proxies))
+                else:
                     try:
                         if post is not None:
                             response = urllib_request.urlopen(req, post.encode('utf-8'))
@@ -1079,24 +1152,24 @@ def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiv
                     except:
                         # traceback.print_exc()
                         pass
-                    cachedPages[m['page']] = link
+                    chainCache.set(cacheKey, link, cacheTtl)
 
+                if forCookieJarOnly:
+                    return cookieJar  # do nothing
+            elif m['page'] and not m['page'].startswith('http'):
+                if m['page'].startswith('$pyFunction:'):
+                    val = doEval(m['page'].split('$pyFunction:')[1], '', cookieJar, m)
                     if forCookieJarOnly:
                         return cookieJar  # do nothing
-                elif m['page'] and not m['page'].startswith('http'):
-                    if m['page'].startswith('$pyFunction:'):
-                        val = doEval(m['page'].split('$pyFunction:')[1], '', cookieJar, m)
-                        if forCookieJarOnly:
-                            return cookieJar  # do nothing
-                        link = val
-                        link = javascriptUnEscape(link)
-                    else:
-                        link = m['page']
+                    link = val
+                    link = javascriptUnEscape(link)
+                else:
+                    link = m['page']
 
             if '$pyFunction:playmedia(' in m['expres'] or 'ActivateWindow' in m['expres'] or 'RunPlugin' in m['expres'] or '$PLAYERPROXY$=' in url or any(x in url for x in g_ignoreSetResolved):
                 setresolved = False
             if '$doregex' in m['expres']:
-                m['expres'] = getRegexParsed(regexs, m['expres'], cookieJar, recursiveCall=True, cachedPages=cachedPages)
+                m['expres'] = getRegexParsed(regexs, m['expres'], cookieJar, recursiveCall=True, chainCache=chainCache)
 
             if m['expres'] != '':
                 if '$LiveStreamCaptcha' in m['expres']:
@@ -1125,12 +1198,12 @@ def getRegexParsed(regexs, url, cookieJar=None, forCookieJarOnly=False, recursiv
                 else:
                     if 'listrepeat' in m:
                         listrepeat = m['listrepeat']
-                        ret = re.findall(m['expres'], link)
+                        ret = chainCache.compile(m['expres']).findall(link)
                         return listrepeat, ret, m, regexs, cookieJar
 
                     val = ''
                     if link != '':
-                        reg = re.compile(m['expres']).search(link)
+                        reg = chainCache.compile(m['expres']).search(link)
                         if reg:
                             val = reg.group(1).strip()
 
@@ -2668,6 +2741,16 @@ try:
     regexs = params["regexs"]
 except:
     pass
+page = 0
+try:
+    page = int(params["page"])
+except:
+    pass
+listkey = None
+try:
+    listkey = params["listkey"]
+except:
+    pass
 playitem = ''
 try:
     playitem = urllib_parse.unquote_plus(params["playitem"])
@@ -2693,12 +2776,13 @@ if mode is None:
 elif mode == 1:
     addon_log("getData")
     data = None
-    if regexs and len(regexs) > 0:
+    parsed = getCachedList(listkey) if listkey and page > 0 else None
+    if parsed is None and regexs and len(regexs) > 0:
         data, setresolved = getRegexParsed(regexs, url)
         if data.startswith('http') or data.startswith('smb') or data.startswith('nfs') or data.startswith('/'):
             url = data
             data = None
-    getData(url, fanart, data)
+    getData(url, fanart, data, page, regexs, parsed)
     xbmcplugin.endOfDirectory(int(sys.argv[1]))
 
 elif mode == 2:
@@ -0,0 +1,163 @@
+"""
+    Incremental xml list loader
+
+    Parses <channels>/<items> lists with a pull parser so the top level
+    <channel> and <item> nodes are handed out as soon as they are complete
+    and dropped from the tree right after, instead of building the whole DOM
+    first. The parsed list is kept in the addon profile keyed by the list url
+    and the md5 of its content, so opening the same list again skips parsing
+    and only the visible page is turned back into elements.
+
+    usage:
+
+    parsed = load_list(url, data, cache_dir)
+    for channel in parsed.page('channel', page, PAGE_SIZE):
+        ...
+
+    parsed.key names the cached parse, load_cached(parsed.key, cache_dir)
+    gets it back without the content, e.g. for the next page of a list
+    that was passed inline.
+
+"""
+
+import hashlib
+import os
+import pickle
+
+from xml.etree import ElementTree
+
+PAGE_SIZE = 200
+CHUNK_SIZE = 64 * 1024
+ENTRY_TAGS = ('channel', 'item')
+INFO_TAGS = ('channels_info', 'items_info')
+CACHE_VERSION = 1
+
+
+def _md5(data):
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8', 'ignore')
+    return hashlib.md5(data).hexdigest()
+
+
+def iter_list(data):
+    """
+    Yields (tag, element) for every top level node of a list as it is parsed.
+    The root element is yielded first with the tag 'root' and no children.
+    """
+    try:
+        parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    except AttributeError:  # python 2
+        root = ElementTree.fromstring(data)
+        yield 'root', root
+        for elem in list(root):
+            yield elem.tag, elem
+        return
+
+    depth = 0
+    root = None
+    for start in range(0, len(data), CHUNK_SIZE):
+        parser.feed(data[start:start + CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = elem
+                    yield 'root', root
+                continue
+            depth -= 1
+            if depth == 1:
+                yield elem.tag, elem
+                root.remove(elem)
+    parser.close()
+
+
+class ParsedList(object):
+
+    def __init__(self, tag=None):
+        self.tag = tag
+        self.key = None
+        self.viewmode = None
+        self.info = None
+        self.entries = {'channel': [], 'item': []}
+
+    @classmethod
+    def parse(cls, data):
+        parsed = cls()
+        for tag, elem in iter_list(data):
+            if tag == 'root':
+                parsed.tag = elem.tag
+            elif tag in ENTRY_TAGS:
+                parsed.entries[tag].append(ElementTree.tostring(elem))
+            elif tag in INFO_TAGS and parsed.info is None:
+                parsed.info = ElementTree.tostring(elem)
+            elif tag == 'SetViewMode':
+                parsed.viewmode = elem.text
+        return parsed
+
+    def __len__(self):
+        return sum(len(e) for e in self.entries.values()) + (self.info is not None)
+
+    def count(self, tag):
+        return len(self.entries[tag])
+
+    def page(self, tag, page=0, size=PAGE_SIZE):
+        """Returns the elements of one page, size 0 returns all of them."""
+        entries = self.entries[tag]
+        if size:
+            entries = entries[page * size:(page + 1) * size]
+        return [ElementTree.fromstring(e) for e in entries]
+
+    def has_next(self, tag, page=0, size=PAGE_SIZE):
+        return bool(size) and len(self.entries[tag]) > (page + 1) * size
+
+    def get_info(self):
+        if self.info is None:
+            return None
+        return ElementTree.fromstring(self.info)
+
+
+def load_list(url, data, cache_dir=None):
+    """
+    Returns the ParsedList for data, reusing the cached parse when the
+    content of url did not change. Raises ElementTree.ParseError.
+    """
+    if not cache_dir:
+        return ParsedList.parse(data)
+
+    content_hash = _md5(data)
+    key = _md5(url or content_hash)
+    cache_file = os.path.join(cache_dir, '{0}.pkl'.format(key))
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('version') == CACHE_VERSION and cached.get('hash') == content_hash:
+            cached['list'].key = key
+            return cached['list']
+    except Exception:
+        pass
+
+    parsed = ParsedList.parse(data)
+    parsed.key = key
+    try:
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        with open(cache_file, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'hash': content_hash, 'list': parsed}, f, 2)
+    except Exception:
+        pass
+    return parsed
+
+
+def load_cached(key, cache_dir):
+    """Returns the ParsedList cached under key, None if there is none."""
+    if not key or not cache_dir or not all(c in '0123456789abcdef' for c in key):
+        return None
+    try:
+        with open(os.path.join(cache_dir, '{0}.pkl'.format(key)), 'rb') as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    if cached.get('version') != CACHE_VERSION:
+        return None
+    cached['list'].key = key
+    return cached['list']
@@ -0,0 +1,163 @@
+"""
+    Fetch cache for $doregex chains
+
+    A RegexChainCache lives for one top level getRegexParsed call. It keeps
+    the pages fetched by the chain (persisted to the addon profile with a
+    per regex ttl), the cookie jars the chain opens (loaded once, saved once
+    when the chain is done) and the compiled expressions.
+
+    Fetched pages are also kept in memory for the life of the process, like
+    the old cachedPages memo, so the per item lookups of a list don't fetch
+    a page with a cookie jar (disk ttl 0) again for every item.
+
+    usage:
+
+    cache = RegexChainCache(profile)
+    key = cache.make_key(url, post=post, headers=headers)
+    link = cache.get(key)
+    if link is None:
+        link = fetch(...)
+        cache.set(key, link, ttl)
+    ...
+    cache.close()
+
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+
+CACHE_FILE = 'regex_cache.json'
+DEFAULT_TTL = 120
+MAX_ENTRIES = 300
+
+# pages fetched in this process, shared by every chain
+_memory = {}
+
+# only these headers change what a page returns for our purposes
+KEY_HEADERS = ('user-agent', 'referer', 'origin', 'accept', 'cookie', 'x-requested-with', 'x-forwarded-for', 'x-addr')
+
+
+def regex_ttl(m, default=DEFAULT_TTL):
+    """Returns the cache ttl in seconds for a regex item, 0 disables the disk cache."""
+    if 'ignorecache' in m:
+        return 0
+    ttl = m.get('cachettl')
+    if ttl is None:
+        return default
+    try:
+        return max(0, int(ttl))
+    except (TypeError, ValueError):
+        return default
+
+
+def _replace(src, dst):
+    try:
+        os.replace(src, dst)
+    except AttributeError:  # python 2
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+class RegexChainCache(object):
+
+    def __init__(self, profile, default_ttl=DEFAULT_TTL):
+        self.path = os.path.join(profile, CACHE_FILE)
+        self.default_ttl = default_ttl
+        self._pages = {}
+        self._disk = None
+        self._disk_dirty = False
+        self._jars = {}
+        self._dirty_jars = {}
+        self._compiled = {}
+
+    def make_key(self, url, method=None, post=None, headers=None):
+        if method is None:
+            method = 'POST' if post is not None else 'GET'
+        parts = [method.upper(), url, post or '']
+        if headers:
+            for name, value in sorted((k.lower(), v) for k, v in headers):
+                if name in KEY_HEADERS:
+                    parts.append('{0}:{1}'.format(name, value))
+        raw = '\n'.join(parts)
+        if not isinstance(raw, bytes):
+            raw = raw.encode('utf-8', 'ignore')
+        return hashlib.sha1(raw).hexdigest()
+
+    def _load(self):
+        if self._disk is None:
+            self._disk = {}
+            try:
+                with open(self.path, 'r') as f:
+                    self._disk = json.load(f)
+            except Exception:
+                pass
+        return self._disk
+
+    def get(self, key):
+        if key in self._pages:
+            return self._pages[key]
+        if key in _memory:
+            self._pages[key] = _memory[key]
+            return self._pages[key]
+        entry = self._load().get(key)
+        if entry and entry.get('expires', 0) > time.time():
+            self._pages[key] = entry.get('data')
+            return self._pages[key]
+        return None
+
+    def set(self, key, data, ttl=0):
+        self._pages[key] = data
+        if data:
+            if key not in _memory and len(_memory) >= MAX_ENTRIES:
+                # oldest first
+                del _memory[next(iter(_memory))]
+            _memory[key] = data
+        if ttl > 0 and data:
+            self._load()[key] = {'expires': time.time() + ttl, 'data': data}
+            self._disk_dirty = True
+
+    def compile(self, pattern):
+        regex = self._compiled.get(pattern)
+        if regex is None:
+            regex = self._compiled[pattern] = re.compile(pattern)
+        return regex
+
+    def get_cookie_jar(self, cookie_file, loader):
+        """Loads a cookie jar from disk once per chain, loader(cookie_file) does the actual load."""
+        if not cookie_file:
+            return loader(cookie_file)
+        if cookie_file not in self._jars:
+            self._jars[cookie_file] = loader(cookie_file)
+        return self._jars[cookie_file]
+
+    def save_cookie_jar(self, cookie_jar, cookie_file, saver):
+        """
+        Defers saving a cookie jar until the chain is done, a later open of
+        the same cookie_file in the chain gets this jar instead of the file.
+        """
+        if cookie_file:
+            self._jars[cookie_file] = cookie_jar
+            self._dirty_jars[cookie_file] = (cookie_jar, saver)
+
+    def close(self):
+        for cookie_file, (cookie_jar, saver) in self._dirty_jars.items():
+            saver(cookie_jar, cookie_file)
+        self._dirty_jars = {}
+
+        if not self._disk_dirty:
+            return
+        now = time.time()
+        entries = [(k, v) for k, v in self._disk.items() if v.get('expires', 0) > now]
+        entries.sort(key=lambda kv: kv[1]['expires'], reverse=True)
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(dict(entries[:MAX_ENTRIES]), f)
+            _replace(tmp_path, self.path)
+        except Exception:
+            pass
+        self._disk_dirty = False
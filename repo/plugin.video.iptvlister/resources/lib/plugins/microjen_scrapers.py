@@ -8,7 +8,7 @@
 #########################################
 
 from ..plugin import Plugin
-import json, re, xbmc
+import json, re, threading, time, xbmc
 import xbmcaddon
 try:
     from resources.lib.util.common import *
@@ -19,6 +19,34 @@ debrid_only = ownAddon.getSetting('debrid.only') or 'false'
 addon_name = xbmcaddon.Addon().getAddonInfo('name')
 
 TIMEOUT = 10
+# scrapers mostly wait on the network, run them all at once and let TIMEOUT
+# bound the wait, the cap only guards against a runaway source list
+MAX_WORKERS = 64
+
+_sources = None
+_host_dict = None
+_cache_lock = threading.Lock()
+
+
+def load_sources():
+    """microjenscrapers.sources(), imported once per process."""
+    global _sources
+    with _cache_lock:
+        if _sources is None:
+            import microjenscrapers
+            _sources = microjenscrapers.sources()
+        return _sources
+
+
+def load_host_dict():
+    """resolveurl.relevant_resolvers(), loaded once per process."""
+    global _host_dict
+    with _cache_lock:
+        if _host_dict is None:
+            import resolveurl
+            _host_dict = resolveurl.relevant_resolvers(order_matters=True)
+        return _host_dict
+
 
 class MicroJenScrapers(Plugin):
     name = "microjenscrapers"
@@ -59,16 +87,13 @@ class MicroJenScrapers(Plugin):
         
         link = item.get("link")
         if link and link.startswith("search"):
-            import microjenscrapers
             import xbmcgui
-            import concurrent.futures
             import resolveurl
             import operator
-            import time
 
-            self.hostDict = resolveurl.relevant_resolvers(order_matters=True)
+            self.hostDict = load_host_dict()
             progress = xbmcgui.DialogProgress()
-            sources = microjenscrapers.sources()
+            sources = load_sources()
             all_sources = []
             search_title = re.sub("(\[.+?\])", "", item.get("title")) 
             do_log(f'{self.name} - search_title = \n' + str(search_title) )  
@@ -76,19 +101,9 @@ class MicroJenScrapers(Plugin):
             if item.get("content").lower() == "movie":
                 sources = [(i[0], i[1], getattr(i[1], "movie", None)) for i in sources]
                 sources = list(filter(lambda source: source[2], sources))
-                all_sources = []
-                num_sources = len(sources)
-                counter = 0
-                progress.create(
-                    f"{addon_name}",
-                    f"Scraping for {item.get('title')}\n[I][COLOR orange](Sources : {num_sources - counter} / {num_sources} left)[/I][COLOR white] > [COLOR lawngreen]{len(all_sources)} links found[/COLOR]",
-                )
-                # progress.create(
-                    # "MicroJen",
-                    # f"Scraping for {item.get('title')}\n{num_sources}/{num_sources} left\n 0 links found",
-                # )
-                threads = [
-                    self.get_movie_source(
+                jobs = [
+                    (
+                        self._get_movie_source,
                         # item.get("title"),
                         search_title,
                         item.get("year"),
@@ -98,57 +113,13 @@ class MicroJenScrapers(Plugin):
                     )
                     for i in sources
                 ]
-                for t in threads:
-                    t[0].start()
-                end_time = TIMEOUT + time.monotonic()
-                while True:
-                    if not threads:
-                        break
-                    for t in threads:
-                        if progress.iscanceled():
-                            break
-                        wait_timeout = end_time - time.monotonic()
-                        if wait_timeout < 0:
-                            break
-                        if t[0].is_alive():
-                            continue
-                        else:
-                            result = t[1]
-                            threads.remove(t)
-                            if result:
-                                all_sources.extend(result)
-                            counter += 1
-                            percent = int((counter / num_sources) * 100)
-                            progress.update(
-                                percent,
-                                f"Scraping for {item.get('title')}\n[I][COLOR orange](Sources : {num_sources - counter} / {num_sources} left)[/I][COLOR white] > [COLOR lawngreen]{len(all_sources)} links found[/COLOR]",
-                            )
-                            # progress.update(
-                                # percent,
-                                # f"Scraping for {item.get('title')}\n{num_sources - counter}/{num_sources} left\n {len(all_sources)} links found",
-                            # )
-                    else:
-                        continue
-                    break
-                progress.close()
-                all_sources = list(filter(lambda source: source, all_sources))
+                all_sources = self.collect(jobs, item.get("title"), progress)
             elif item.get("content").lower() == "episode":
                 sources = [(i[0], i[1], getattr(i[1], "tvshow", None)) for i in sources]
                 sources = list(filter(lambda source: source[2], sources))
-                all_sources = []
-                num_sources = len(sources)
-                counter = 0
-                name = f'{item.get("tv_show_title")} - S{item.get("season")}E{item.get("episode")}'
-                progress.create(
-                    f"{addon_name}",
-                    f"Scraping for {item.get('title')}\n[I][COLOR orange](Sources : {num_sources - counter} / {num_sources} left)[/I][COLOR white] > [COLOR lawngreen]{len(all_sources)} links found[/COLOR]",
-                )
-                # progress.create(
-                    # "MicroJen",
-                    # f"Scraping for {item.get('title')}\n{num_sources}/{num_sources} left\n 0 links found",
-                # )
-                threads = [
-                    self.get_episode_source(
+                jobs = [
+                    (
+                        self._get_episode_source,
                         item.get("title"),
                         item.get("tv_show_title"),
                         item.get("year"),
@@ -162,40 +133,7 @@ class MicroJenScrapers(Plugin):
                     )
                     for i in sources
                 ]
-                for t in threads:
-                    t[0].start()
-                end_time = TIMEOUT + time.monotonic()
-                while True:
-                    if not threads:
-                        break
-                    for t in threads:
-                        if progress.iscanceled():
-                            break
-                        wait_timeout = end_time - time.monotonic()
-                        if wait_timeout < 0:
-                            break
-                        if t[0].is_alive():
-                            continue
-                        else:
-                            result = t[1]
-                            threads.remove(t)
-                            if result:
-                                all_sources.extend(result)
-                            counter += 1
-                            percent = int((counter / num_sources) * 100)
-                            progress.update(
-                                percent,
-                                f"Scraping for {item.get('title')}\n[I][COLOR orange](Sources : {num_sources - counter} / {num_sources} left)[/I][COLOR white] > [COLOR lawngreen]{len(all_sources)} links found[/COLOR]",
-                            )
-                            # progress.update(
-                                # percent,
-                                # f"Scraping for {item.get('title')}\n{num_sources - counter}/{num_sources} left\n {len(all_sources)} links found",
-                            # )
-                    else:
-                        continue
-                    break
-                progress.close()
-                all_sources = list(filter(lambda source: source, all_sources))
+                all_sources = self.collect(jobs, item.get("title"), progress)
 
             if not all_sources:
                 return False
@@ -237,69 +175,58 @@ class MicroJenScrapers(Plugin):
             item = {"title": q[1], "content": q[0], "imdb_id": q[2], "year": q[3], "link": "search"}
             self.play_video(json.dumps(item))
 
-    def get_movie_source(self, title, year, imdb, source_name, source_object):
-        from threading import Thread
-
-        result = []
-        thread = Thread(
-            target=self._get_movie_source_threaded,
-            args=(
-                title,
-                year,
-                imdb,
-                source_name,
-                source_object,
-                result,
-            ),
-        )
-        return (thread, result)
-
-    def _get_movie_source_threaded(
-        self, title, year, imdb, source_name, source_object, outlist
-    ):
+    def collect(self, jobs, title, progress):
+        """
+        Runs the scraper jobs, (function, *args) tuples, on a thread each
+        (up to MAX_WORKERS) and gathers their links in the order they finish. Blocks until all
+        jobs are done, TIMEOUT has passed or the dialog is cancelled.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        all_sources = []
+        num_sources = len(jobs)
+        counter = 0
+        message = lambda: f"Scraping for {title}\n[I][COLOR orange](Sources : {num_sources - counter} / {num_sources} left)[/I][COLOR white] > [COLOR lawngreen]{len(all_sources)} links found[/COLOR]"
+        progress.create(f"{addon_name}", message())
+        if not jobs:
+            progress.close()
+            return all_sources
+        executor = ThreadPoolExecutor(max_workers=min(MAX_WORKERS, num_sources))
+        pending = set(executor.submit(*job) for job in jobs)
+        end_time = TIMEOUT + time.monotonic()
+        while pending and not progress.iscanceled():
+            wait_timeout = end_time - time.monotonic()
+            if wait_timeout <= 0:
+                break
+            # wakes on the first finished scraper, or twice a second to check for cancel
+            done, pending = wait(pending, timeout=min(wait_timeout, 0.5), return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    do_log(f'{self.name} - scraper failed: {e}')
+                    result = None
+                if result:
+                    all_sources.extend(result)
+                counter += 1
+            if done:
+                progress.update(int((counter / num_sources) * 100), message())
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+        progress.close()
+        do_log(f'{self.name} - {counter}/{num_sources} scrapers finished, {len(all_sources)} links')
+        return list(filter(lambda source: source, all_sources))
+
+    def _get_movie_source(self, title, year, imdb, source_name, source_object):
         url = source_object.movie(imdb, title, title, "", year)
         sources = source_object.sources(url, self.hostDict, self.hostprDict)
         if sources:
             for item in sources:
                 item["origin"] = source_name
-            outlist.extend(sources)
         return sources
 
-    def get_episode_source(
-        self,
-        title,
-        tv_show_title,
-        year,
-        imdb,
-        tmdb,
-        premiered,
-        season,
-        episode,
-        source_name,
-        source_object,
-    ):
-        from threading import Thread
-
-        result = []
-        thread = Thread(
-            target=self._get_episode_source_threaded,
-            args=(
-                title,
-                tv_show_title,
-                year,
-                imdb,
-                tmdb,
-                premiered,
-                season,
-                episode,
-                source_name,
-                source_object,
-                result,
-            ),
-        )
-        return (thread, result)
-
-    def _get_episode_source_threaded(
+    def _get_episode_source(
         self,
         title,
         tv_show_title,
@@ -311,7 +238,6 @@ class MicroJenScrapers(Plugin):
         episode,
         source_name,
         source_object,
-        outlist,
     ):
         tv_show_url = source_object.tvshow(
             imdb, tmdb, tv_show_title, tv_show_title, "", year
@@ -323,5 +249,4 @@ class MicroJenScrapers(Plugin):
         if sources:
             for item in sources:
                 item["origin"] = source_name
-            outlist.extend(sources)
         return sources
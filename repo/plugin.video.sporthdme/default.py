@@ -13,8 +13,9 @@ import xbmcaddon
 import xbmcgui
 import xbmcplugin
 import requests
-from resources.modules import control, client
+from resources.modules import control, client, channels
 import time
+import threading
 from dateutil.parser import parse
 from dateutil.tz import gettz
 from dateutil import parser, tz
@@ -266,8 +267,12 @@ def resolve2(name, url):
             data = six.ensure_str(client.request(frame, referer=url, output=url))
             try:
                 data = re.findall(r'''script>(eval.+?\{\}\))\)''', data, re.DOTALL)[-1]
-                from resources.modules import jsunpack
-                data = six.ensure_text(jsunpack.unpack(str(data) + ')'), encoding='utf-8')
+                try:
+                    from resolveurl.lib import deobfuscate
+                    data = six.ensure_text(deobfuscate.decode(deobfuscate.PACKER, str(data) + ')'), encoding='utf-8')
+                except ImportError:
+                    from resources.modules import jsunpack
+                    data = six.ensure_text(jsunpack.unpack(str(data) + ')'), encoding='utf-8')
             except:
                 pass
             #xbmc.log('DATAAAA: {}'.format(data))
@@ -463,95 +468,8 @@ def resolve2(name, url):
 ################################################################################
 
 xbmcvfs.mkdir(control.translatePath(ADDON_DATA))
-JSON_FILE_PATH = control.translatePath(ADDON_DATA + 'channels.json')
-LAST_UPDATE_FILE = control.translatePath(ADDON_DATA + 'last_update.txt')
-
-
-def is_time_to_update(hours=6):
-    if not xbmcvfs.exists(LAST_UPDATE_FILE):
-        f = control.openFile(LAST_UPDATE_FILE, 'w')
-        f.write(str(time.time()))
-        f.close()
-    f = control.openFile(LAST_UPDATE_FILE, 'r')
-    content = f.read()
-    last_update_timestamp = float(content.strip())
-    f.close()
-
-    hours_in_seconds = hours * 60 * 60
-    current_time = time.time()
-
-    return (current_time - last_update_timestamp) >= hours_in_seconds
-
-
-def fetch_and_store_channel_data():
-    hdrs = {
-        'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Mobile Safari/537.36'}
-    try:
-        url = BASEURL + '''api/trpc/mutual.getTopTeams,saves.getAllUserSaves,mutual.getFooterData,mutual.getAllChannels,mutual.getWebsiteConfig?batch=1&input={"0":{"json":null,"meta":{"values":["undefined"]}},"1":{"json":null,"meta":{"values":["undefined"]}},"2":{"json":null,"meta":{"values":["undefined"]}},"3":{"json":null,"meta":{"values":["undefined"]}},"4":{"json":null,"meta":{"values":["undefined"]}}}'''
-        response = six.ensure_text(client.request(url, headers=hdrs), encoding='utf-8', errors='ignore')
-        new_data = json.loads(response)
-
-        new_channels_data = None
-        for result in new_data:
-            if ("result" in result and "data" in result["result"] and
-                    "json" in result["result"]["data"] and "allChannels" in result["result"]["data"]["json"]):
-                new_channels_data = result["result"]["data"]["json"]["allChannels"]
-                break
-
-        if not new_channels_data:
-            return
-
-        if not xbmcvfs.exists(JSON_FILE_PATH):
-            existing_data = []
-        else:
-            file = xbmcvfs.File(JSON_FILE_PATH)
-            existing_data = json.load(file)
-            file.close()
-
-        existing_data_map = {channel['_id']: channel for channel in existing_data}
-        changes_made = False
-
-        for new_channel in new_channels_data:
-            channel_id = new_channel['_id']
-            if channel_id not in existing_data_map or new_channel['links'] != existing_data_map[channel_id]['links']:
-                existing_data_map[channel_id] = new_channel
-                changes_made = True
-
-        if changes_made:
-            file = xbmcvfs.File(JSON_FILE_PATH, 'w')
-            file.write(json.dumps(list(existing_data_map.values())))
-            file.close()
-            print("Channel links updated")
-
-    except Exception as e:
-        print("Error fetching or updating channel data: {}".format(e))
-
-
-def load_data_from_json():
-    f = control.openFile(JSON_FILE_PATH, 'r')
-    contents = f.read()
-    f.close()
-    return json.loads(contents)
-
-
 def get_links_for_channel(channel_name):
-    channels_data = load_data_from_json()
-    for channel in channels_data:
-        datos = []
-        if channel['channelName'] == channel_name:
-            for link in channel['links']:
-                chan = channel['channelName']
-                lang = channel['language']
-                datos.append((chan, link, lang))
-            return datos
-        else:
-            if channel['channelName'].replace(' ', '') == channel_name.replace(' ', ''):
-                for link in channel['links']:
-                    chan = channel['channelName']
-                    lang = channel['language']
-                    datos.append((chan, link, lang))
-                return datos
-    return None
+    return channels.get_links(channel_name)
 
 
 ###################################################
@@ -599,30 +517,6 @@ def time_convert(timestamp):
     return time_
 
 
-def time_to_update(hours=6):
-    try:
-        f = control.openFile(LAST_UPDATE_FILE, 'r')
-        content = f.read()
-        last_update_timestamp = float(content.strip())
-        f.close()
-    except:
-        return True
-
-    hours_in_seconds = int(hours) * 60 * 60
-    current_time = time.time()
-
-    return (current_time - last_update_timestamp) >= hours_in_seconds
-
-
-def update_last_update_time():
-    try:
-        f = control.openFile(LAST_UPDATE_FILE, 'w')
-        f.write(str(time.time()))
-        f.close()
-    except:
-        print("Error updating last update time")
-
-
 def adjust_date_and_convert_to_timestamp_ms(matchDate, livetvtimestr):
     date_obj = parser.parse(matchDate[2:])
     hours, minutes = map(int, livetvtimestr.split(":"))
@@ -681,11 +575,12 @@ def router(paramstring):
     params = dict(parse_qsl(paramstring))
     if params:
         if params['mode'] == 'events':
-            if time_to_update():
-                fetch_and_store_channel_data()
-                update_last_update_time()
-            else:
-                print("Not yet time to check for updates.")
+            # the service keeps the channels current, only the very first run waits for them
+            if channels.is_empty():
+                channels.refresh()
+            elif channels.is_stale(channels.UPDATE_HOURS * 2):
+                # service not running yet, refresh without holding up the menu
+                threading.Thread(target=channels.refresh).start()
             get_events(params['url'])
         elif params['mode'] == 'get_streams':
             get_stream(params['name'], params['url'])
@@ -694,7 +589,7 @@ def router(paramstring):
         elif params['mode'] == 'settings':
             Open_settings()
         elif params['mode'] == 'clear':
-            control.deleteFile(LAST_UPDATE_FILE)
+            channels.reset_update()
             control.infoDialog("[COLOR gold]Files cleared[/COLOR]", NAME,
                                ICON, 5000)
         elif params['mode'] == 'version':
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+'''
+    Local store of the sporthd 24/7 channels and their links.
+
+    Channels are kept in an sqlite table keyed by _id with an index on the
+    name and on the name without spaces, so a lookup is one indexed query.
+    refresh() applies the site's channel list as a diff by _id and is run
+    by the service, the plugin only reads.
+'''
+
+import json
+import os
+import threading
+import time
+
+try:
+    from sqlite3 import dbapi2 as database
+except ImportError:
+    from pysqlite2 import dbapi2 as database
+
+import six
+import xbmc
+import xbmcaddon
+import xbmcvfs
+
+BASEURL = 'https://one.sporthd.me/'
+CHANNELS_API = BASEURL + '''api/trpc/mutual.getTopTeams,saves.getAllUserSaves,mutual.getFooterData,mutual.getAllChannels,mutual.getWebsiteConfig?batch=1&input={"0":{"json":null,"meta":{"values":["undefined"]}},"1":{"json":null,"meta":{"values":["undefined"]}},"2":{"json":null,"meta":{"values":["undefined"]}},"3":{"json":null,"meta":{"values":["undefined"]}},"4":{"json":null,"meta":{"values":["undefined"]}}}'''
+UPDATE_HOURS = 6
+
+if six.PY2:
+    dataPath = xbmc.translatePath(xbmcaddon.Addon().getAddonInfo('profile'))
+else:
+    dataPath = xbmcvfs.translatePath(xbmcaddon.Addon().getAddonInfo('profile'))
+dbFile = os.path.join(dataPath, 'channels.db')
+legacyFile = os.path.join(dataPath, 'channels.json')
+
+_lock = threading.Lock()
+
+
+def normalize(name):
+    return name.replace(' ', '')
+
+
+def connect():
+    if not os.path.exists(dataPath):
+        os.makedirs(dataPath)
+    dbcon = database.connect(dbFile, timeout=10)
+    dbcon.execute("CREATE TABLE IF NOT EXISTS channels (id TEXT PRIMARY KEY, name TEXT, norm TEXT, language TEXT, links TEXT)")
+    dbcon.execute("CREATE INDEX IF NOT EXISTS channels_name ON channels (name)")
+    dbcon.execute("CREATE INDEX IF NOT EXISTS channels_norm ON channels (norm)")
+    dbcon.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return dbcon
+
+
+def _migrate(dbcon):
+    # channels.json of older versions, imported once so the first menu has links
+    if not os.path.exists(legacyFile):
+        return
+    try:
+        with open(legacyFile, 'r') as f:
+            _apply(dbcon, json.load(f))
+        os.remove(legacyFile)
+    except Exception as e:
+        xbmc.log('SportHD: channels.json import failed: {}'.format(e))
+
+
+def _apply(dbcon, channels):
+    existing = dict(dbcon.execute("SELECT id, links FROM channels").fetchall())
+    rows = []
+    for channel in channels:
+        links = json.dumps(channel.get('links', []))
+        if existing.get(channel['_id']) != links:
+            name = channel.get('channelName', '')
+            rows.append((channel['_id'], name, normalize(name), channel.get('language', ''), links))
+    if rows:
+        dbcon.executemany("INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?, ?)", rows)
+    dbcon.commit()
+    return len(rows)
+
+
+def get_links(channel_name):
+    '''Returns [(channel, link, language)] for the channel or None.'''
+    dbcon = connect()
+    try:
+        row = dbcon.execute("SELECT name, language, links FROM channels WHERE name = ? LIMIT 1", (channel_name,)).fetchone()
+        if row is None:
+            row = dbcon.execute("SELECT name, language, links FROM channels WHERE norm = ? LIMIT 1",
+                                (normalize(channel_name),)).fetchone()
+        if row is None:
+            return None
+        name, lang, links = row
+        return [(name, link, lang) for link in json.loads(links)]
+    finally:
+        dbcon.close()
+
+
+def is_empty():
+    dbcon = connect()
+    try:
+        _migrate(dbcon)
+        return dbcon.execute("SELECT 1 FROM channels LIMIT 1").fetchone() is None
+    finally:
+        dbcon.close()
+
+
+def last_update():
+    dbcon = connect()
+    try:
+        row = dbcon.execute("SELECT value FROM meta WHERE key = 'last_update'").fetchone()
+        return float(row[0]) if row else 0.0
+    finally:
+        dbcon.close()
+
+
+def reset_update():
+    '''Makes the next service check refresh the channels.'''
+    dbcon = connect()
+    try:
+        dbcon.execute("DELETE FROM meta WHERE key = 'last_update'")
+        dbcon.commit()
+    finally:
+        dbcon.close()
+
+
+def is_stale(hours=UPDATE_HOURS):
+    return time.time() - last_update() >= hours * 60 * 60
+
+
+def fetch():
+    '''Returns the site's channel list or None.'''
+    from resources.modules import client
+    hdrs = {
+        'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Mobile Safari/537.36'}
+    response = six.ensure_text(client.request(CHANNELS_API, headers=hdrs), encoding='utf-8', errors='ignore')
+    for result in json.loads(response):
+        try:
+            return result["result"]["data"]["json"]["allChannels"]
+        except (KeyError, TypeError):
+            continue
+    return None
+
+
+def refresh():
+    '''Fetches the channel list and stores the channels whose links changed.'''
+    with _lock:
+        try:
+            channels = fetch()
+        except Exception as e:
+            xbmc.log('SportHD: Error fetching channel data: {}'.format(e))
+            return 0
+        dbcon = connect()
+        try:
+            _migrate(dbcon)
+            changed = _apply(dbcon, channels or [])
+            dbcon.execute("INSERT OR REPLACE INTO meta VALUES ('last_update', ?)", (str(time.time()),))
+            dbcon.commit()
+        finally:
+            dbcon.close()
+        if changed:
+            xbmc.log('SportHD: {} channel links updated'.format(changed))
+        return changed
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import xbmc
+
+from resources.modules import channels
+
+CHECK_SECONDS = 10 * 60
+
+
+def run():
+    monitor = xbmc.Monitor()
+    # give the network and the other services time to come up
+    if monitor.waitForAbort(30):
+        return
+    while not monitor.abortRequested():
+        if channels.is_stale():
+            channels.refresh()
+        if monitor.waitForAbort(CHECK_SECONDS):
+            break
+
+
+if __name__ == '__main__':
+    run()
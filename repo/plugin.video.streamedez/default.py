@@ -12,12 +12,20 @@ import xbmcvfs
 import os
 from datetime import datetime, timedelta
 
+try:
+    from jetextractors.util.hls_proxy import proxy_url
+except ImportError:
+    def proxy_url(url, headers=None, insecure=False):
+        return None
+
 try:
     from resources.lib.api_client import APIClient
     from resources.lib.cache_helper import CacheHelper
+    from resources.lib import stream_probe
 except ImportError:
     from api_client import APIClient
     from cache_helper import CacheHelper
+    import stream_probe
 
 ADDON = xbmcaddon.Addon()
 ADDON_NAME = ADDON.getAddonInfo('name')
@@ -70,39 +78,25 @@ def get_clean_timestamp(match):
         return 0
 
 def get_sports_list():
-    cached = cache_helper.get('sports_list')
-    if cached: return cached
-    
     try:
-        response = fetch_from_api('get_sports')
-        
-        if response and 'sports' in response:
-            data = response['sports']
-            cache_helper.set('sports_list', data, ttl_hours=24)
-            return data
-            
+        return cache_helper.get_or_refresh('sports_list', load_sports_list, ttl_hours=24) or []
     except Exception as e:
         xbmcgui.Dialog().ok(ADDON_NAME, f"Failed to load sports list:\nCould not connect to any server.")
         return []
-    
-    return []
+
+def load_sports_list():
+    response = fetch_from_api('get_sports')
+    if response and 'sports' in response:
+        return response['sports']
+    return None
 
 def get_kodi_data():
-    cached = cache_helper.get('kodi_data')
-    if cached: return cached
-    
+    # stale match data is shown at once and refreshed in the background
     try:
-        data = fetch_from_api('get_kodi_data')
-        
-        if data:
-            cache_helper.set('kodi_data', data, ttl_hours=0.08) 
-            return data
-            
+        return cache_helper.get_or_refresh('kodi_data', lambda: fetch_from_api('get_kodi_data'), ttl_hours=0.08)
     except Exception as e:
         xbmcgui.Dialog().ok(ADDON_NAME, f"Failed to load match data:\nCould not connect to any server.")
         return None
-        
-    return None
 
 def get_duration_hours(sport_name):
     if not sport_name: return int(ADDON.getSetting('duration_default') or 4)
@@ -260,6 +254,21 @@ def verify_stream(url, referer):
         'Referer': referer if referer else url
     }
     
+    # the jetextractors proxy refetches the playlist on every refresh, so live
+    # streams keep working past the first playlist, and reads segments ahead
+    proxied = proxy_url(url, headers, insecure=True)
+    if proxied:
+        # fetch it once through the proxy so a dead link fails here like below
+        response = requests.get(proxied, timeout=10)
+        response.raise_for_status()
+        if '#EXTM3U' not in response.text[:1024]:
+            raise ValueError("Not an HLS playlist")
+        log("Playing through the local HLS proxy")
+        li = xbmcgui.ListItem(path=proxied)
+        li.setProperty('inputstream', 'inputstream.adaptive')
+        li.setProperty('inputstream.adaptive.manifest_type', 'hls')
+        return li
+
     response = requests.get(url, headers=headers, timeout=10, verify=False)
     response.raise_for_status()
     
@@ -623,23 +632,23 @@ def auto_play(match_id, sport_name):
         return
 
     streams = match.get('streams', [])
+    ranked = stream_probe.probe_streams(streams, cache_helper) if streams else []
     
-    if streams:
-        first_stream = streams[0]
-        media_url = first_stream.get('media_url') or first_stream.get('direct_url')
-        embed_url = first_stream.get('url')
-        
-        if media_url:
-            try:
-                log(f"AutoPlay: Testing 1st stream {media_url}")
-                li = verify_stream(media_url, embed_url)
-                log("AutoPlay: Stream 1 is valid. Playing.")
-                xbmcplugin.setResolvedUrl(ADDON_HANDLE, True, li)
-                return
-            except Exception as e:
-                log(f"AutoPlay: Stream 1 failed ({str(e)}). Falling back to list.", xbmc.LOGWARNING)
-        else:
-            log("AutoPlay: Stream 1 is Web Only. Falling back to list.", xbmc.LOGINFO)
+    if not ranked:
+        log("AutoPlay: No direct streams, Web Only. Falling back to list.", xbmc.LOGINFO)
+    
+    for i, (stream, result) in enumerate(ranked, 1):
+        if not result['ok']:
+            log(f"AutoPlay: {len(ranked) - i + 1} of {len(ranked)} streams are offline. Falling back to list.", xbmc.LOGWARNING)
+            break
+        media_url, embed_url = stream_probe.stream_urls(stream)
+        try:
+            log(f"AutoPlay: Playing ranked stream {i} {media_url} ({result['ttfb_ms']} ms, {result['bandwidth']} bps)")
+            li = verify_stream(media_url, embed_url)
+            xbmcplugin.setResolvedUrl(ADDON_HANDLE, True, li)
+            return
+        except Exception as e:
+            log(f"AutoPlay: Stream {i} failed ({str(e)}). Trying next.", xbmc.LOGWARNING)
     
     list_url = build_url({
         'mode': 'streams',
@@ -673,7 +682,14 @@ def menu_streams(match_id, sport_name):
         xbmcplugin.endOfDirectory(ADDON_HANDLE)
         return
 
-    for i, stream in enumerate(playable_streams, 1):
+    if ADDON.getSettingBool('probe_streams'):
+        ranked = stream_probe.probe_streams(playable_streams, cache_helper)
+    else:
+        ranked = [(stream, None) for stream in playable_streams]
+    numbers = dict((id(stream), i) for i, stream in enumerate(playable_streams, 1))
+
+    for stream, result in ranked:
+        i = numbers[id(stream)]
         quality = stream.get('quality', 'SD')
         language = stream.get('language', 'En')
         viewers = stream.get('viewers', 0)
@@ -682,6 +698,11 @@ def menu_streams(match_id, sport_name):
         embed_url = stream.get('url')
         
         label = f"[{quality}] Stream {i} ({language}) - {viewers} Viewers"
+        if result is not None:
+            if result['ok']:
+                label += f" [COLOR green]{result['ttfb_ms']} ms[/COLOR]"
+            else:
+                label = f"[COLOR gray]{label} (offline)[/COLOR]"
         is_playable = 'true'
         play_url = media_url
 
@@ -4,9 +4,18 @@ import xbmcvfs
 import os
 import json
 import time
+import threading
 from datetime import datetime, timedelta
 
+# a refresh lock older than this belongs to an invocation that died
+REFRESH_LOCK_SECONDS = 60
+
 class CacheHelper:
+    # parsed cache files by key, shared by every CacheHelper in the process
+    _memo = {}
+    _memo_lock = threading.Lock()
+    _refreshing = {}
+
     def __init__(self):
         self.addon = xbmcaddon.Addon()
         # translatePath is crucial for compatibility across different OS file systems
@@ -34,13 +43,22 @@ class CacheHelper:
         """
         cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
         
-        if not xbmcvfs.exists(cache_file):
+        try:
+            stat = os.stat(cache_file)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
             return None, True
         
         try:
-            with xbmcvfs.File(cache_file, 'r') as f:
-                content = f.read()
-                cache_data = json.loads(content)
+            with self._memo_lock:
+                memo = self._memo.get(cache_key)
+            if memo and memo[0] == stamp:
+                cache_data = memo[1]
+            else:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cache_data = json.load(f)
+                with self._memo_lock:
+                    self._memo[cache_key] = (stamp, cache_data)
             
             is_expired = time.time() > cache_data.get('expires_at', 0)
             return cache_data.get('data'), is_expired
@@ -60,16 +78,110 @@ class CacheHelper:
             'created_human': datetime.now().isoformat()
         }
         
+        tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with xbmcvfs.File(cache_file, 'w') as f:
-                f.write(json.dumps(cache_data))
+            # write then rename, so a reader never sees half a file
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f)
+            os.replace(tmp_file, cache_file)
+            with self._memo_lock:
+                stat = os.stat(cache_file)
+                self._memo[cache_key] = ((stat.st_mtime_ns, stat.st_size), cache_data)
             return True
         except Exception as e:
             xbmc.log(f"CacheHelper: Error writing cache {cache_key}: {str(e)}", xbmc.LOGERROR)
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return False
+    
+    def get_or_refresh(self, cache_key, loader, ttl_hours=24):
+        """
+        Stale-while-revalidate: returns fresh data from the cache, or stale
+        data at once while loader() refreshes it in the background. Only
+        blocks on loader() when there is nothing cached. One refresh per key
+        runs at a time across threads and plugin invocations.
+        """
+        data, is_expired = self.get_extended(cache_key)
+        if data and not is_expired:
+            return data
+        if data:
+            self._refresh_async(cache_key, loader, ttl_hours)
+            return data
+        return self._refresh(cache_key, loader, ttl_hours, wait=True)
+    
+    def _refresh_async(self, cache_key, loader, ttl_hours):
+        with self._memo_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing[cache_key] = threading.Event()
+        # not a daemon, the interpreter finishes the refresh after the listing is shown
+        threading.Thread(target=self._refresh, args=(cache_key, loader, ttl_hours, False, True)).start()
+    
+    def _refresh(self, cache_key, loader, ttl_hours, wait=False, owner=False):
+        if not owner:
+            with self._memo_lock:
+                event = self._refreshing.get(cache_key)
+                if event is None:
+                    self._refreshing[cache_key] = threading.Event()
+                    owner = True
+            if not owner:
+                event.wait()
+                return self.get_extended(cache_key)[0]
+        
+        lock_file = os.path.join(self.cache_dir, f"{cache_key}.lock")
+        locked = self._acquire_file_lock(lock_file)
+        try:
+            if not locked:
+                if not wait:
+                    return None
+                # another invocation is refreshing, use what it writes
+                deadline = time.time() + REFRESH_LOCK_SECONDS
+                while os.path.exists(lock_file) and time.time() < deadline:
+                    time.sleep(0.1)
+                data = self.get_extended(cache_key)[0]
+                if data:
+                    return data
+            data = loader()
+            if data:
+                self.set(cache_key, data, ttl_hours=ttl_hours)
+            return data
+        except Exception as e:
+            xbmc.log(f"StreamedEZ: Refreshing {cache_key} failed: {str(e)}", xbmc.LOGWARNING)
+            if wait:
+                raise
+            return None
+        finally:
+            if locked:
+                try:
+                    os.remove(lock_file)
+                except OSError:
+                    pass
+            with self._memo_lock:
+                event = self._refreshing.pop(cache_key, None)
+            if event is not None:
+                event.set()
+    
+    def _acquire_file_lock(self, lock_file):
+        try:
+            if time.time() - os.stat(lock_file).st_mtime > REFRESH_LOCK_SECONDS:
+                os.remove(lock_file)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except OSError:
             return False
     
     def clear(self, cache_key=None):
         """Clears a specific cache key or the entire cache directory."""
+        with self._memo_lock:
+            if cache_key:
+                self._memo.pop(cache_key, None)
+            else:
+                self._memo.clear()
         if cache_key:
             cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
             if xbmcvfs.exists(cache_file):
@@ -0,0 +1,107 @@
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+import xbmc
+
+PROBE_TIMEOUT = 3
+PROBE_TTL_HOURS = 1 / 60.0
+MAX_WORKERS = 6
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+BANDWIDTH_RE = re.compile(r'#EXT-X-STREAM-INF:[^\n]*?BANDWIDTH=(\d+)')
+
+
+def stream_urls(stream):
+    """Returns (media_url, embed_url) of a stream entry from the API."""
+    return stream.get('media_url') or stream.get('direct_url'), stream.get('url')
+
+
+def probe(url, referer, timeout=PROBE_TIMEOUT):
+    """
+    Fetches the playlist of one stream under a deadline of timeout seconds.
+    Returns a dict with ok, ttfb_ms (time to first byte), bandwidth (highest
+    advertised, 0 if none) and segments (for media playlists).
+    """
+    result = {'ok': False, 'ttfb_ms': None, 'bandwidth': 0, 'segments': 0, 'error': None}
+    headers = {'User-Agent': USER_AGENT, 'Referer': referer if referer else url}
+    start = time.time()
+    deadline = start + timeout
+    try:
+        response = requests.get(url, headers=headers, timeout=timeout, verify=False, stream=True)
+        try:
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(chunk_size=8192):
+                if result['ttfb_ms'] is None:
+                    result['ttfb_ms'] = int((time.time() - start) * 1000)
+                chunks.append(chunk)
+                if time.time() > deadline:
+                    raise requests.exceptions.Timeout('Probe deadline passed')
+            text = b''.join(chunks).decode('utf-8', 'ignore')
+        finally:
+            response.close()
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+    if '#EXTM3U' not in text:
+        result['error'] = 'Not an HLS playlist'
+        return result
+    bandwidths = [int(b) for b in BANDWIDTH_RE.findall(text)]
+    result['bandwidth'] = max(bandwidths) if bandwidths else 0
+    result['segments'] = text.count('#EXTINF')
+    result['ok'] = bool(bandwidths or result['segments'])
+    if not result['ok']:
+        result['error'] = 'Empty playlist'
+    return result
+
+
+def score(result):
+    """Higher is better, dead streams score below every live one."""
+    if not result or not result.get('ok'):
+        return -1.0
+    ttfb = result.get('ttfb_ms') or PROBE_TIMEOUT * 1000
+    # a second of latency costs as much as 2 Mbit/s of advertised bandwidth
+    return 10000.0 + result.get('bandwidth', 0) / 1000.0 - ttfb * 2.0
+
+
+def _cache_key(url):
+    return 'probe_' + hashlib.md5(url.encode('utf-8')).hexdigest()
+
+
+def probe_streams(streams, cache=None, timeout=PROBE_TIMEOUT):
+    """
+    Probes every stream that has a media url concurrently and returns
+    [(stream, result)] best first. Results are kept in cache for a minute,
+    streams that did not answer in time are ranked last.
+    """
+    results = {}
+    pending = []
+    for i, stream in enumerate(streams):
+        media_url, _ = stream_urls(stream)
+        if not media_url:
+            continue
+        cached = cache.get(_cache_key(media_url)) if cache is not None else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+
+    if pending:
+        executor = ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending)))
+        futures = dict((i, executor.submit(probe, *stream_urls(streams[i]), timeout=timeout)) for i in pending)
+        wait(futures.values(), timeout=timeout + 1)
+        executor.shutdown(wait=False)
+        for i, future in futures.items():
+            if future.done():
+                results[i] = future.result()
+            else:
+                results[i] = {'ok': False, 'ttfb_ms': None, 'bandwidth': 0, 'segments': 0, 'error': 'Timed out'}
+            if cache is not None:
+                cache.set(_cache_key(stream_urls(streams[i])[0]), results[i], ttl_hours=PROBE_TTL_HOURS)
+        xbmc.log(f"StreamedEZ: Probed {len(pending)} streams, {sum(1 for i in pending if results[i]['ok'])} alive", xbmc.LOGINFO)
+
+    return [(streams[i], results[i]) for i in sorted(results, key=lambda i: (-score(results[i]), i))]
@@ -39,6 +39,15 @@ Formulas:
 
 >>> airtable.get_all(formula="FIND('DUP', {COLUMN_STR})=1")
 
+Record Cache:
+
+>>> airtable = Airtable('base_key', 'table_name', cache_dir='/path/to/cache')
+>>> airtable.get_all(view='ViewName')
+
+With a ``cache_dir`` the result of :any:`get_all` is kept on disk per
+base, table and options. Later calls ask Airtable for one record modified
+since the cache was written and only fetch every page again if there is one.
+
 
 Insert:
 
@@ -92,13 +101,18 @@ similar to this:
 
 import os
 import json
+import hashlib
+import threading
 import requests
 from requests.exceptions import HTTPError
 import posixpath
 import time
+from datetime import datetime
 from six.moves.urllib.parse import unquote
 from six.moves.urllib.parse import quote
 
+from pyairtable.api.ratelimit import TokenBucket
+
 from .auth import AirtableAuth
 from .params import AirtableParams
 
@@ -109,8 +123,12 @@ class Airtable():
     API_BASE_URL = 'https://api.airtable.com/'
     API_LIMIT = 1.0 / 5  # 5 per second
     API_URL = posixpath.join(API_BASE_URL, VERSION)
+    CACHE_TTL = 60 * 60  # deleted records are only noticed once this runs out
+
+    # shared by every table, the limit is per base but menus mostly use one
+    bucket = TokenBucket(1.0 / API_LIMIT)
 
-    def __init__(self, base_key, table_name, api_key=None):
+    def __init__(self, base_key, table_name, api_key=None, cache_dir=None, cache_ttl=None):
         """
         If api_key is not provided, :any:`AirtableAuth` will attempt
         to use ``os.environ['AIRTABLE_API_KEY']``
@@ -118,13 +136,17 @@ class Airtable():
         session = requests.Session()
         session.auth = AirtableAuth(api_key=api_key)
         self.session = session
+        self.base_key = base_key
         self.table_name = table_name
+        self.cache_dir = cache_dir
+        self.cache_ttl = self.CACHE_TTL if cache_ttl is None else cache_ttl
         urlsafe_table_name = quote(table_name, safe='')
         self.url_table = posixpath.join(self.API_URL, base_key,
                                         urlsafe_table_name)
         self.is_authenticated = self.validate_session(self.url_table)
 
     def validate_session(self, url):
+        self.bucket.acquire()
         response = self.session.get(url, params={'maxRecords': 1})
         if response.ok:
             return True
@@ -158,6 +180,7 @@ class Airtable():
         return posixpath.join(self.url_table, record_id)
 
     def _request(self, method, url, params=None, json_data=None):
+        self.bucket.acquire()
         response = self.session.request(method, url, params=params, json=json_data)
         # self._dump_request_data(response)
         return self._process_response(response)
@@ -248,7 +271,6 @@ class Airtable():
         while True:
             data = self._get(self.url_table, offset=offset, **options)
             records = data.get('records', [])
-            time.sleep(self.API_LIMIT)
             yield records
             offset = data.get('offset')
             if not offset:
@@ -281,9 +303,55 @@ class Airtable():
         >>> records = get_all(maxRecords=3, view='All')
 
         """
+        if self.cache_dir:
+            return self._get_all_cached(**options)
+        all_records = []
+        for records in self.get_iter(**options):
+            all_records.extend(records)
+        return all_records
+
+    def _cache_file(self, options):
+        key = json.dumps([self.url_table, options], sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def modified_since(self, timestamp):
+        """
+        Returns True if a record of the table was created or changed after
+        timestamp (``str``, ISO 8601 UTC). Costs a single request.
+        """
+        formula = "IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{}'))".format(timestamp)
+        data = self._get(self.url_table, formula=formula, maxRecords=1, pageSize=1, fields=[])
+        return len(data.get('records', [])) > 0
+
+    def _get_all_cached(self, **options):
+        path = self._cache_file(options)
+        cached = None
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+        except (IOError, OSError, ValueError):
+            pass
+        if cached and time.time() - cached['cached_at'] < self.cache_ttl:
+            try:
+                if not self.modified_since(cached['checked']):
+                    return cached['records']
+            except Exception:
+                pass
+
+        checked = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        cached_at = time.time()
         all_records = []
         for records in self.get_iter(**options):
             all_records.extend(records)
+        try:
+            if not os.path.exists(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            tmp = '{}.{}.tmp'.format(path, threading.current_thread().ident)
+            with open(tmp, 'w') as f:
+                json.dump({'cached_at': cached_at, 'checked': checked, 'records': all_records}, f)
+            os.replace(tmp, path)
+        except (IOError, OSError):
+            pass
         return all_records
 
     def match(self, field_name, field_value, **options):
@@ -370,13 +438,12 @@ class Airtable():
         responses = []
         for item in iterable:
             responses.append(func(item))
-            time.sleep(self.API_LIMIT)
         return responses
 
     def batch_insert(self, records):
         """
         Calls :any:`insert` repetitively, following set API Rate Limit (5/sec)
-        To change the rate limit use ``airtable.API_LIMIT = 0.2``
+        To change the rate limit use ``Airtable.bucket = TokenBucket(5)``
         (5 per second)
 
         >>> records = [{'Name': 'John'}, {'Name': 'Marc'}]
@@ -528,7 +595,7 @@ class Airtable():
     def batch_delete(self, record_ids):
         """
         Calls :any:`delete` repetitively, following set API Rate Limit (5/sec)
-        To change the rate limit use ``airtable.API_LIMIT = 0.2`` (5 per second)
+        To change the rate limit use ``Airtable.bucket = TokenBucket(5)``
 
         >>> record_ids = ['recwPQIfs4wKPyc9D', 'recwDxIfs3wDPyc3F']
         >>> airtable.batch_delete(records)
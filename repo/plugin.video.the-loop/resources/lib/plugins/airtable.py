@@ -1,10 +1,13 @@
 from ..plugin import Plugin
-import xbmc
+import os
+import xbmc, xbmcaddon
+from xbmcvfs import translatePath
 from resources.lib.external.airtable.airtable import Airtable
 from resources.lib.plugin import run_hook
 import xml.etree.ElementTree as ET
 
 CACHE_TIME = 0
+CACHE_DIR = os.path.join(translatePath(xbmcaddon.Addon().getAddonInfo("profile")), "airtable")
 
 class airtable(Plugin):
     name = "airtable"
@@ -19,7 +22,7 @@ class airtable(Plugin):
             table_base = table_split[-3]
             table_id = table_split[-2]
             
-            at = Airtable(table_id, table_base, api_key=args_split[1])
+            at = Airtable(table_id, table_base, api_key=args_split[1], cache_dir=CACHE_DIR)
             if table_type == "season" or table_type == "show":
                 match = at.search('category', table_base + "_" + table_split[-1], view='Grid view')
             else:
@@ -1,4 +1,4 @@
-import os, requests, time, random, uuid, json, re, datetime, string
+import os, requests, time, random, uuid, json, re, datetime, string, threading, copy
 from hashlib import md5
 from base64 import b64decode, b64encode
 import xbmc, xbmcaddon, xbmcgui, xbmcplugin
@@ -31,6 +31,17 @@ USER_DATA_DIR = translatePath(addon.getAddonInfo("profile"))
 ADDON_DATA_DIR = translatePath(addon.getAddonInfo("path"))
 # RESOURCES_DIR = os.path.join(ADDON_DATA_DIR, "resources")
 RESOURCES_DIR = os.path.join(ADDON_DATA_DIR, "resources", "lib", "data")
+CONFIG_FILE = os.path.join(USER_DATA_DIR, "lntv_config.json")
+TOKEN_FILE = os.path.join(USER_DATA_DIR, "lntv_tokens.json")
+CONFIG_TTL = 8 * 60 * 60
+# token urls that do not say when they expire are reused for this long
+TOKEN_TTL = 5 * 60
+TOKEN_REFRESH_AHEAD = 90
+# only tokens played this recently are renewed in the background
+TOKEN_RECENT = 30 * 60
+TOKEN_MAX = 64
+_token_lock = threading.Lock()
+_config_lock = threading.Lock()
 
 class LNTV(Plugin):
     name = "lntv"
@@ -116,6 +127,7 @@ class LNTV(Plugin):
 
             resolved_stream = self.resolve_stream(stream)
             xbmc.Player().play(f"{resolved_stream[0]}|{urlencode(resolved_stream[1])}")
+            threading.Thread(target=self.refresh_tokens).start()
     
 
     def dec_aes_cbc_single(self, msg, key, iv):
@@ -140,16 +152,19 @@ class LNTV(Plugin):
         )
         return b64decode(encoded.encode("utf-8").translate(custom_translate)).decode("utf-8")
     
-    def init_config(self):
-        if self.json_config != {}: return
+    def new_session(self):
         cert_file = os.path.join(RESOURCES_DIR, "com.playnet.androidtv.ads.crt")
         cert_key_file = os.path.join(RESOURCES_DIR, "com.playnet.androidtv.ads.key")
-        self.s = requests.Session()
-        self.s.cert = (cert_file, cert_key_file)
-        self.s.headers.update({"User-Agent": self.user_agent})
+        s = requests.Session()
+        s.cert = (cert_file, cert_key_file)
+        s.headers.update({"User-Agent": self.user_agent})
+        return s
+    
+    def init_config(self):
+        if self.json_config != {}: return
+        self.s = self.new_session()
         self.server_time = str(int(time.time()) * 1000)
-        config = os.path.join(USER_DATA_DIR, "lntv_config.json")
-        if not os.path.exists(config):
+        if not os.path.exists(CONFIG_FILE):
             self.fetch_config()
             self.register_user()
             self.update_vod_channels()
@@ -157,15 +172,37 @@ class LNTV(Plugin):
             # self.__fetch_videos()
             self.write_config()
         else:
-            f = open(config)
+            f = open(CONFIG_FILE)
             json_config = json.loads(f.read())
             f.close()
             self.json_config = json_config
-            if time.time() - json_config["data_age"] > 8 * 60 * 60:
-                self.fetch_config()
-                self.update_vod_channels()
-                self.update_live_channels()
-                self.write_config()
+            if time.time() - json_config["data_age"] > CONFIG_TTL:
+                # the stale config still works, refresh it without holding up the menu
+                threading.Thread(target=self.refresh_config).start()
+    
+    def refresh_config(self):
+        # build the new config on a copy with its own session, the menu and
+        # playback keep reading the old one until it is swapped in whole
+        worker = copy.copy(self)
+        worker.s = self.new_session()
+        worker.json_config = copy.deepcopy(self.json_config)
+        worker.api_key = False
+        try:
+            worker.fetch_config()
+            worker.update_vod_channels()
+            worker.update_live_channels()
+            worker.json_config["data_age"] = time.time()
+        except Exception as e:
+            xbmc.log(f"LNTV: config refresh failed: {e}", xbmc.LOGWARNING)
+            return
+        finally:
+            worker.s.close()
+        with _config_lock:
+            self.json_config = worker.json_config
+            try:
+                self._write_json(CONFIG_FILE, worker.json_config)
+            except Exception as e:
+                xbmc.log(f"LNTV: could not store config: {e}", xbmc.LOGWARNING)
     
     def fetch_config(self):
         def b64x2(s):
@@ -245,11 +282,94 @@ class LNTV(Plugin):
     def write_config(self):
         if not os.path.exists(USER_DATA_DIR):
             os.makedirs(USER_DATA_DIR)
-        config = os.path.join(USER_DATA_DIR, "lntv_config.json")
         self.json_config["data_age"] = time.time()
-        f = open(config, "w")
-        f.write(json.dumps(self.json_config))
+        self._write_json(CONFIG_FILE, self.json_config)
+    
+    def _write_json(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        f = open(tmp, "w")
+        f.write(json.dumps(data))
         f.close()
+        os.replace(tmp, path)
+    
+    def token_expiry(self, url):
+        """ Returns when a resolved url stops working, from its auth parameters if it has them. """
+        now = time.time()
+        query = parse_qs(urlparse(url).query)
+        for name in ("e", "exp", "expires", "expiry", "validto"):
+            if name in query and query[name][0].isdigit():
+                expiry = int(query[name][0])
+                return expiry / 1000 if expiry > 10 ** 11 else expiry
+        if "wmsAuthSign" in query:
+            try:
+                sign = query["wmsAuthSign"][0]
+                sign = parse_qs(b64decode(sign + "=" * (-len(sign) % 4)).decode("utf-8"))
+                server_time = datetime.datetime.strptime(sign["server_time"][0], "%m/%d/%Y %I:%M:%S %p")
+                server_time = server_time.replace(tzinfo=datetime.timezone.utc).timestamp()
+                return server_time + int(sign["validminutes"][0]) * 60
+            except Exception:
+                pass
+        return now + TOKEN_TTL
+    
+    def _token_key(self, stream):
+        return "{0}|{1}|{2}".format(stream["token"], self.json_config["user"]["user_id"], stream["url"])
+    
+    def load_tokens(self):
+        try:
+            f = open(TOKEN_FILE)
+            tokens = json.loads(f.read())
+            f.close()
+        except Exception:
+            return {}
+        now = time.time()
+        return {k: v for k, v in tokens.items() if v["expires"] > now}
+    
+    def store_token(self, stream, resolved):
+        with _token_lock:
+            self._store_token(stream, resolved)
+    
+    def _store_token(self, stream, resolved):
+        tokens = self.load_tokens()
+        tokens[self._token_key(stream)] = {
+            "stream": stream,
+            "url": resolved[0],
+            "headers": resolved[1],
+            "expires": self.token_expiry(resolved[0]),
+            "used": time.time(),
+        }
+        for key in sorted(tokens, key=lambda k: tokens[k]["used"])[:-TOKEN_MAX]:
+            del tokens[key]
+        try:
+            if not os.path.exists(USER_DATA_DIR):
+                os.makedirs(USER_DATA_DIR)
+            self._write_json(TOKEN_FILE, tokens)
+        except Exception as e:
+            xbmc.log(f"LNTV: could not store token: {e}", xbmc.LOGWARNING)
+    
+    def resolve_stream(self, stream):
+        """ Returns a resolved (url, headers), reusing the stored token of the stream while it is valid. """
+        if stream["token"] == 0:
+            return self._resolve_stream(stream)
+        cached = self.load_tokens().get(self._token_key(stream))
+        if cached and cached["expires"] - time.time() > TOKEN_REFRESH_AHEAD:
+            return (cached["url"], cached["headers"])
+        resolved = self._resolve_stream(stream)
+        if resolved and resolved[0]:
+            self.store_token(stream, resolved)
+        return resolved
+    
+    def refresh_tokens(self):
+        """ Renews the stored tokens that are about to expire, so zapping back to those channels skips the handshake. """
+        now = time.time()
+        for entry in list(self.load_tokens().values()):
+            if entry["expires"] - now > TOKEN_REFRESH_AHEAD * 2 or now - entry["used"] > TOKEN_RECENT:
+                continue
+            try:
+                resolved = self._resolve_stream(entry["stream"])
+                if resolved and resolved[0]:
+                    self.store_token(entry["stream"], resolved)
+            except Exception as e:
+                xbmc.log(f"LNTV: token refresh failed: {e}", xbmc.LOGDEBUG)
     
     def cache_token(self, user):
         index = random.randint(0, 9)
@@ -544,7 +664,7 @@ class LNTV(Plugin):
         self.json_config["live_categories"] = categories
         self.json_config["live_channels"] = channels
     
-    def resolve_stream(self, stream):
+    def _resolve_stream(self, stream):
         headers = {}
         if stream["user_agent"]:
             headers["User-Agent"] = stream["user_agent"]
@@ -71,7 +71,7 @@ def search_extractors(query: str, exclude: Optional[List[str]] = None, include:
 
 def iframe_extractor(url: str) -> List[JetLink]:
     from .util.find_iframes import find_iframes
-    iframes = [JetLink(u) if not isinstance(u, JetLink) else u for u in find_iframes(url, "", [], [])]
+    iframes = [JetLink(u) if not isinstance(u, JetLink) else u for u in find_iframes(url)]
     for iframe in iframes:
         if "|" in iframe.address and iframe.headers != {}:
             iframe.address = iframe.address.split("|")[0]
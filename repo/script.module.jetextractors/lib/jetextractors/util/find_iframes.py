@@ -1,66 +1,242 @@
-import requests, re
+import requests, re, os, time, threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Set, Tuple
 from ..util import m3u8_src
-from urllib.parse import urlparse
+from urllib.parse import urlparse, unquote
 user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
 
-ad_hosts = ""
-def find_iframes(url, prev_url = "", links = [], checked = []):
+AD_HOSTS_URL = "https://raw.githubusercontent.com/StevenBlack/hosts/master/hosts"
+AD_HOSTS_REFRESH = 7 * 24 * 60 * 60
+MAX_LINKS = 15
+MAX_PAGES = 40
+MAX_DEPTH = 4
+MAX_WORKERS = 6
+PAGE_TIMEOUT = 7
+PAGE_CACHE_TTL = 120
+
+RE_IFRAME = re.compile(r'i?frame.+?src=[\"\']?([^\"\' ]+)', re.IGNORECASE)
+RE_JOKERS = re.compile(r'id\s*=\s*[\"\']([^\"\']+).+?jokersplayer.+?\.js')
+RE_TINY = re.compile(r'href\s*=\s*[\"\']([^\"\']+).+?class\s*=\s*[\"\']btn\s*btn\-secondary')
+RE_UNESCAPE = re.compile(r'=\s*[\"\']([^\"\']+)[\"\']+[^\"\']+unescape')
+RE_MULTILINE = re.compile(r'i?frame\s*.+?src=[\"\']?([^\"\']+)', re.IGNORECASE | re.DOTALL)
+RE_UNES_IFRAME = re.compile(r'i?frame\s*.+?src=[\"\']?([^\"\']+)', re.IGNORECASE)
+RE_TELERIUM = re.compile(r'id\s*=\s*[\"\']([^\"\']+).+?embed.telerium.+?\.js')
+RE_URL_IN_URL = re.compile(r'streamlink\.slice\(4\)')
+RE_URL_IN_REF = re.compile(r'\?.{3}([^$]+)')
+RE_NEWLINES = re.compile(r'[\r\n]+')
+BLACKLIST = ['chatango', 'adserv', 'live_chat', 'ad4', 'cloudfront', 'image/svg', 'getbanner.php','/ads', 'ads.', 'adskeeper', '.js', '.jpg', '.png', '/adself.', 'min.js', 'mail.ru', "/http", "googleusercontent"]
+
+_lock = threading.Lock()
+_ad_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_ad_hosts: Optional[Set[str]] = None
+_page_cache: Dict[Tuple[str, str], Tuple[float, object, List[str]]] = {}
+
+
+def find_iframes(url, prev_url = "", links = None, checked = None):
+    """
+    Crawls the iframes embedded in url breadth first and returns the links
+    that a jetextractor or an m3u8 scan can handle. Pages of one level are
+    fetched concurrently, each under its own deadline.
+    """
     from .. import extractor
-    extractors = extractor.get_extractors()
+    domains = set()
+    for module in extractor.get_extractors():
+        domains.update(module.domains)
+
+    links = list(links) if links else []
+    checked = set(checked) if checked else set()
     try:
-        links = links
-        checked = checked
-        r = requests.get(url, allow_redirects=True, timeout=7, headers={"Referer": prev_url, "User-Agent": user_agent})
-        if r.status_code == 200:
-            urls = re.findall('i?frame.+?src=[\"\']?([^\"\' ]+)', r.text, flags=re.IGNORECASE)
-            urls = __customUrls(r.text, url, urls)
-            scan = m3u8_src.scan_page(url, html=r.text)
-            try:
-                scan = m3u8_src.scan_page(url, html=r.text)
-                if scan: return [scan]
-            except:
-                pass
-            for u in urls:
-                if urlparse(u).netloc == '':
-                    if u.startswith('/'): u = 'http://' + urlparse(url).netloc + '/' + u
-                    else: u = 'http://' + urlparse(url).netloc + '/'.join(urlparse(url).path.split('/')[:-1]) +  '/' + u
-                if urlparse(u).scheme == '': u = 'http://' + u.replace('//','')
-
-                u = re.sub(r'\n+', '', u)
-                u = re.sub(r'\r+', '', u)
-                
-                domain = urlparse(u).netloc
-                if not isAd(u) and u not in checked and __checkUrl(u) and u not in links and len(links)<15:
+        scan, urls = _crawl_page(url, prev_url)
+        if scan: return [scan]
+
+        level = [(u, url) for u in urls]
+        pages = 0
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for depth in range(MAX_DEPTH):
+                if not level or len(links) >= MAX_LINKS: break
+                batch = []
+                for u, ref in level:
+                    if u in checked or len(links) >= MAX_LINKS or pages >= MAX_PAGES: continue
+                    checked.add(u)
                     if u.startswith("https://href.li/?"): u = u.replace("https://href.li/?", "")
-                    for module in extractors:
-                        if domain in module.domains or ".m3u8" in u:
-                            if ".m3u8" in u or "wigistream" in u: u += "|Referer=%s&User-Agent=%s" % (url.replace("&", "_"), user_agent)
-                            links.append(u)
-                    links += find_iframes(u, url, links, checked)
-                    checked.append(u)
-            return list(set(links))
-        return []
+                    if urlparse(u).netloc in domains or ".m3u8" in u:
+                        if ".m3u8" in u or "wigistream" in u: u += "|Referer=%s&User-Agent=%s" % (ref.replace("&", "_"), user_agent)
+                        links.append(u)
+                    batch.append((u, ref))
+                    pages += 1
+
+                level = []
+                futures = [executor.submit(_crawl_page, u, ref) for u, ref in batch]
+                for (u, ref), future in zip(batch, futures):
+                    try:
+                        scan, urls = future.result()
+                    except Exception:
+                        continue
+                    if scan: links.append(scan)
+                    level.extend((child, u) for child in urls)
+        return _unique(links)
     except Exception as e:
         return []
 
+
+def _unique(links):
+    seen = set()
+    res = []
+    for link in links:
+        key = link if isinstance(link, str) else link.address
+        if key not in seen:
+            seen.add(key)
+            res.append(link)
+    return res
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS * 2, pool_maxsize=MAX_WORKERS * 2)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers.update({"User-Agent": user_agent})
+        return _session
+
+
+def _fetch(url, referer, timeout = PAGE_TIMEOUT) -> Optional[str]:
+    """Returns the page html or None, giving up once the page deadline has passed."""
+    deadline = time.time() + timeout
+    r = _get_session().get(url, allow_redirects=True, timeout=timeout, stream=True, headers={"Referer": referer, "User-Agent": user_agent})
+    try:
+        if r.status_code != 200: return None
+        chunks = []
+        for chunk in r.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            if time.time() > deadline: return None
+        return b"".join(chunks).decode(r.encoding or "utf-8", errors="replace")
+    finally:
+        r.close()
+
+
+def _crawl_page(url, referer):
+    """
+    Returns (scan, child_urls) for one page, child_urls are absolute and
+    filtered against the ad list and blacklist. Results are kept for
+    PAGE_CACHE_TTL seconds.
+    """
+    key = (url, referer)
+    now = time.time()
+    cached = _page_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    scan, urls = None, []
+    html = _fetch(url, referer)
+    if html is not None:
+        try:
+            scan = m3u8_src.scan_page(url, html=html)
+        except:
+            pass
+        if not scan:
+            urls = _child_urls(url, __customUrls(html, url, RE_IFRAME.findall(html)))
+
+    with _lock:
+        for k in [k for k, v in _page_cache.items() if v[0] <= now]:
+            del _page_cache[k]
+        _page_cache[key] = (now + PAGE_CACHE_TTL, scan, urls)
+    return scan, urls
+
+
+def _child_urls(url, urls):
+    parsed_url = urlparse(url)
+    res = []
+    for u in urls:
+        if urlparse(u).netloc == '':
+            if u.startswith('/'): u = 'http://' + parsed_url.netloc + '/' + u
+            else: u = 'http://' + parsed_url.netloc + '/'.join(parsed_url.path.split('/')[:-1]) +  '/' + u
+        if urlparse(u).scheme == '': u = 'http://' + u.replace('//','')
+
+        u = RE_NEWLINES.sub('', u)
+        if not isAd(u) and __checkUrl(u) and u not in res:
+            res.append(u)
+    return res
+
+
+def _ad_hosts_file() -> str:
+    import xbmcvfs
+    folder = xbmcvfs.translatePath("special://profile/addon_data/script.module.jetextractors")
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    return os.path.join(folder, "ad_hosts.txt")
+
+
+def _parse_hosts(text: str) -> Set[str]:
+    hosts = set()
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].split()
+        if len(line) >= 2 and line[1] not in ("localhost", "0.0.0.0"):
+            hosts.add(line[1].lower())
+    return hosts
+
+
+def get_ad_hosts() -> Set[str]:
+    """
+    Returns the StevenBlack ad hosts as a set. The parsed list is kept in the
+    jetextractors profile and only downloaded again every AD_HOSTS_REFRESH seconds.
+    """
+    global _ad_hosts
+    if _ad_hosts is not None:
+        return _ad_hosts
+    with _ad_lock:
+        if _ad_hosts is not None:
+            return _ad_hosts
+        hosts = None
+        path = None
+        try:
+            path = _ad_hosts_file()
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    hosts = set(f.read().split())
+                if time.time() - os.path.getmtime(path) < AD_HOSTS_REFRESH:
+                    _ad_hosts = hosts
+                    return _ad_hosts
+        except Exception:
+            pass
+        try:
+            fresh = _parse_hosts(requests.get(AD_HOSTS_URL, timeout=15).text)
+            if fresh:
+                hosts = fresh
+                if path:
+                    with open(path + ".tmp", "w") as f:
+                        f.write("\n".join(sorted(hosts)))
+                    os.replace(path + ".tmp", path)
+        except Exception:
+            pass
+        _ad_hosts = hosts or set()
+        return _ad_hosts
+
+
 def isAd(host):
-    global ad_hosts
-    if ad_hosts == "":
-        ad_hosts = requests.get('https://raw.githubusercontent.com/StevenBlack/hosts/master/hosts').text
-    h = urlparse(host).netloc
-    return (h in ad_hosts) or "/ad" in host
+    if "/ad" in host:
+        return True
+    h = urlparse(host).netloc.lower().split(":")[0]
+    if not h:
+        return False
+    ad_hosts = get_ad_hosts()
+    parts = h.split(".")
+    return any(".".join(parts[i:]) in ad_hosts for i in range(len(parts) - 1))
 
 def __checkUrl(url):
-		blacklist = ['chatango', 'adserv', 'live_chat', 'ad4', 'cloudfront', 'image/svg', 'getbanner.php','/ads', 'ads.', 'adskeeper', '.js', '.jpg', '.png', '/adself.', 'min.js', 'mail.ru', "/http", "googleusercontent"]
-		return not any(w in url for w in blacklist)
+		return not any(w in url for w in BLACKLIST)
 
 def __customUrls(r, ref, urls):
-    fid = re.findall('id\s*=\s*[\"\']([^\"\']+).+?jokersplayer.+?\.js', r)
-    tiny = re.findall('href\s*=\s*[\"\']([^\"\']+).+?class\s*=\s*[\"\']btn\s*btn\-secondary', r)
-    unes = re.findall('=\s*[\"\']([^\"\']+)[\"\']+[^\"\']+unescape', r)
-    multiline = re.findall('i?frame\s*.+?src=[\"\']?([^\"\']+)', r, flags=re.IGNORECASE | re.DOTALL)
-    telerium = re.findall('id\s*=\s*[\"\']([^\"\']+).+?embed.telerium.+?\.js', r)
-    url_in_url = bool(re.search('streamlink\.slice\(4\)', r))
+    fid = RE_JOKERS.findall(r)
+    tiny = RE_TINY.findall(r)
+    unes = RE_UNESCAPE.findall(r)
+    multiline = RE_MULTILINE.findall(r)
+    telerium = RE_TELERIUM.findall(r)
+    url_in_url = bool(RE_URL_IN_URL.search(r))
     us = []
     if len(fid) > 0:
         u = 'http://www.jokersplayer.xyz/embed.php?u=' + fid[0]
@@ -75,10 +251,9 @@ def __customUrls(r, ref, urls):
 
     if len(unes) > 0:
         u = unes[0].replace('@', '%')
-        from urllib.parse import unquote
-        html = unquote(u).decode('utf8')
+        html = unquote(u)
         try:
-            u = re.findall('i?frame\s*.+?src=[\"\']?([^\"\']+)', html, re.IGNORECASE)[0]
+            u = RE_UNES_IFRAME.findall(html)[0]
             us.append(u)
         except:
             pass
@@ -87,9 +262,9 @@ def __customUrls(r, ref, urls):
         for u in multiline:
             us.append(u)
     if url_in_url:
-        u = re.findall('\?.{3}([^$]+)', ref)[0]
+        u = RE_URL_IN_REF.findall(ref)[0]
         us.append(u)
     for u in us:
         if not isAd(u) and __checkUrl(u) and u not in urls:
             urls.append(u)
-    return urls
\ No newline at end of file
+    return urls
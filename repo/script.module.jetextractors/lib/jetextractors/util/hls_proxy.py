@@ -0,0 +1,420 @@
+"""
+Local HLS proxy shared by the add-ons that play live m3u8 links.
+
+The proxy runs inside the jetextractors service on 127.0.0.1. Every playlist
+request is fetched from the origin again and rewritten so that segments,
+keys, init sections and variant playlists come back through the proxy with
+the headers the origin wants. Segments after the one being played are
+prefetched over a pooled session into a bounded buffer, so a slow origin is
+read ahead of the player instead of while it waits.
+
+usage:
+
+    from jetextractors.util import hls_proxy
+    url = hls_proxy.proxy_url(m3u8, {"Referer": referer, "User-Agent": ua}) or m3u8
+
+Statistics are served as json at /stats and published in the
+jetextractors.hls_proxy.stats window property by the service.
+"""
+import base64, json, re, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urljoin, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+HOST = "127.0.0.1"
+PORT_PROPERTY = "jetextractors.hls_proxy.port"
+STATS_PROPERTY = "jetextractors.hls_proxy.stats"
+PREFETCH_SEGMENTS = 3
+PREFETCH_WORKERS = 4
+BUFFER_BYTES = 48 * 1024 * 1024
+PLAYLIST_TIMEOUT = 10
+SEGMENT_TIMEOUT = 20
+MAX_PLAYLISTS = 16
+user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
+
+RE_URI = re.compile(r'URI="([^"]+)"')
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+TS_PACKET = 188
+SEGMENT_TYPE = "video/mp2t"
+
+
+class Segment(NamedTuple):
+    """A segment, key or init section as the origin sent it."""
+    data: bytes
+    content_type: str = SEGMENT_TYPE
+    status: int = 200
+    content_range: Optional[str] = None
+
+
+def _encode(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(value: str) -> str:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("utf-8")
+
+
+def _window():
+    import xbmcgui
+    return xbmcgui.Window(10000)
+
+
+def get_port() -> Optional[int]:
+    """Returns the port of the running proxy service or None."""
+    try:
+        port = _window().getProperty(PORT_PROPERTY)
+        return int(port) if port else None
+    except Exception:
+        return None
+
+
+def build_url(port: int, url: str, headers: Optional[dict] = None, kind: str = "playlist", insecure: bool = False) -> str:
+    query = {"u": _encode(url)}
+    if headers:
+        query["h"] = _encode(urlencode(headers))
+    if insecure:
+        query["k"] = "1"
+    ext = "m3u8" if kind == "playlist" else "ts"
+    return "http://%s:%d/%s.%s?%s" % (HOST, port, kind, ext, urlencode(query))
+
+
+def proxy_url(url: str, headers: Optional[dict] = None, insecure: bool = False) -> Optional[str]:
+    """
+    Returns url routed through the local proxy, or None when the service is
+    not running so the caller can play the link as before.
+    """
+    port = get_port()
+    if port is None:
+        return None
+    return build_url(port, url, headers, insecure=insecure)
+
+
+def strip_png(data: bytes) -> bytes:
+    """Drops the png header some hosts put in front of mpeg-ts segments."""
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    i = data.find(b"\x47", len(PNG_SIGNATURE))
+    while i != -1:
+        if i + TS_PACKET >= len(data) or data[i + TS_PACKET:i + TS_PACKET + 1] == b"\x47":
+            return data[i:]
+        i = data.find(b"\x47", i + 1)
+    return data
+
+
+class Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.playlists = 0
+            self.hits = 0
+            self.waits = 0
+            self.misses = 0
+            self.prefetched = 0
+            self.errors = 0
+            self.bytes_served = 0
+            self.origin_ms: List[float] = []
+
+    def add(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def origin(self, ms: float) -> None:
+        with self._lock:
+            self.origin_ms.append(ms)
+            del self.origin_ms[:-200]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            latency = sorted(self.origin_ms)
+            served = self.hits + self.waits + self.misses
+            return {
+                "uptime": int(time.time() - self.started),
+                "playlists": self.playlists,
+                "segments": served,
+                "hits": self.hits,
+                "waits": self.waits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.waits) / served, 3) if served else 0.0,
+                "prefetched": self.prefetched,
+                "errors": self.errors,
+                "bytes_served": self.bytes_served,
+                "origin_ms_avg": round(sum(latency) / len(latency), 1) if latency else 0.0,
+                "origin_ms_p95": round(latency[int((len(latency) - 1) * 0.95)], 1) if latency else 0.0,
+            }
+
+
+class SegmentBuffer:
+    """
+    Segments by url, bounded by size. A segment that is still being fetched
+    is joined instead of fetched twice.
+    """
+
+    def __init__(self, max_bytes: int = BUFFER_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Segment]" = OrderedDict()
+        self._size = 0
+        self._pending: Dict[str, threading.Event] = {}
+
+    def get(self, key: str) -> Optional[Segment]:
+        with self._lock:
+            data = self._data.pop(key, None)
+            if data is not None:
+                self._data[key] = data
+            return data
+
+    def claim(self, key: str) -> Tuple[Optional[Segment], Optional[threading.Event], bool]:
+        """
+        Returns (data, event, owner). data is set when the segment is
+        buffered, otherwise the caller fetches it when owner is set or waits
+        on event for the fetch in flight.
+        """
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+                return data, None, False
+            event = self._pending.get(key)
+            if event is not None:
+                return None, event, False
+            event = self._pending[key] = threading.Event()
+            return None, event, True
+
+    def release(self, key: str, data: Optional[Segment]) -> None:
+        with self._lock:
+            event = self._pending.pop(key, None)
+            if data is not None and len(data.data) <= self.max_bytes:
+                if key in self._data:
+                    self._size -= len(self._data.pop(key).data)
+                self._data[key] = data
+                self._size += len(data.data)
+                while self._size > self.max_bytes:
+                    self._size -= len(self._data.popitem(last=False)[1].data)
+        if event is not None:
+            event.set()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data or key in self._pending
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+
+class HLSProxy:
+    def __init__(self, port: int = 0, prefetch: int = PREFETCH_SEGMENTS, buffer_bytes: int = BUFFER_BYTES) -> None:
+        self.prefetch = prefetch
+        self.buffer = SegmentBuffer(buffer_bytes)
+        self.stats = Stats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=PREFETCH_WORKERS * 2)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": user_agent})
+        self.executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+        self._lock = threading.Lock()
+        # segment url -> (next segment urls, headers, insecure) of the last playlist it was seen in
+        self._next: "OrderedDict[str, Tuple[List[str], dict, bool]]" = OrderedDict()
+        self._playlists: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.server = ThreadingHTTPServer((HOST, port), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "HLSProxy":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="hls_proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+    def url(self, url: str, headers: Optional[dict] = None, insecure: bool = False) -> str:
+        return build_url(self.port, url, headers, insecure=insecure)
+
+    def _get(self, url: str, headers: dict, insecure: bool, timeout: int) -> requests.Response:
+        start = time.time()
+        r = self.session.get(url, headers=headers, timeout=timeout, verify=not insecure)
+        self.stats.origin((time.time() - start) * 1000.0)
+        r.raise_for_status()
+        return r
+
+    def playlist(self, url: str, headers: dict, insecure: bool) -> bytes:
+        """Fetches the playlist again and rewrites it to point at the proxy."""
+        r = self._get(url, headers, insecure, PLAYLIST_TIMEOUT)
+        self.stats.add("playlists")
+        text, segments = self.rewrite(r.text, r.url or url, headers, insecure)
+        if segments:
+            self._remember(url, segments, headers, insecure)
+        return text.encode("utf-8")
+
+    def rewrite(self, text: str, base: str, headers: dict, insecure: bool) -> Tuple[str, List[str]]:
+        """Returns the rewritten playlist and the absolute segment urls in it."""
+        lines = []
+        segments = []
+        variant = False
+        byterange = False
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                if line.startswith("#EXT-X-STREAM-INF"):
+                    variant = True
+                elif line.startswith("#EXT-X-BYTERANGE"):
+                    byterange = True
+                elif "URI=" in line:
+                    kind = "playlist" if line.startswith(("#EXT-X-MEDIA", "#EXT-X-I-FRAME-STREAM-INF")) else "segment"
+                    line = RE_URI.sub(lambda m: 'URI="%s"' % build_url(self.port, urljoin(base, m.group(1)), headers, kind, insecure), line)
+                lines.append(line)
+                continue
+            absolute = urljoin(base, line)
+            if variant or urlparse(absolute).path.endswith(".m3u8"):
+                lines.append(build_url(self.port, absolute, headers, "playlist", insecure))
+            else:
+                # sub ranges are asked for with a Range header, reading the whole file ahead would not help
+                if not byterange:
+                    segments.append(absolute)
+                lines.append(build_url(self.port, absolute, headers, "segment", insecure))
+            variant = False
+            byterange = False
+        return "\n".join(lines) + "\n", segments
+
+    def _remember(self, url: str, segments: List[str], headers: dict, insecure: bool) -> None:
+        with self._lock:
+            old = self._playlists.pop(url, [])
+            for segment in old:
+                self._next.pop(segment, None)
+            self._playlists[url] = segments
+            for i, segment in enumerate(segments):
+                self._next[segment] = (segments[i + 1:i + 1 + self.prefetch], headers, insecure)
+            while len(self._playlists) > MAX_PLAYLISTS:
+                for segment in self._playlists.popitem(last=False)[1]:
+                    self._next.pop(segment, None)
+
+    def segment(self, url: str, headers: dict, insecure: bool, byte_range: Optional[str] = None) -> Segment:
+        """
+        Returns the segment from the buffer or the origin and reads ahead of
+        it. A Range request goes to the origin as it is.
+        """
+        if byte_range:
+            self.stats.add("misses")
+            r = self._get(url, dict(headers, Range=byte_range), insecure, SEGMENT_TIMEOUT)
+            data = Segment(r.content, r.headers.get("Content-Type") or SEGMENT_TYPE, r.status_code, r.headers.get("Content-Range"))
+            self.stats.add("bytes_served", len(data.data))
+            return data
+
+        data, event, owner = self.buffer.claim(url)
+        if data is not None:
+            self.stats.add("hits")
+        elif not owner and event.wait(SEGMENT_TIMEOUT):
+            data = self.buffer.get(url)
+            if data is not None:
+                self.stats.add("waits")
+        self._prefetch(url)
+        if data is None:
+            # the prefetch in flight failed or timed out, go to the origin ourselves
+            self.stats.add("misses")
+            data = self._fill(url, headers, insecure, owner)
+        self.stats.add("bytes_served", len(data.data))
+        return data
+
+    def _fill(self, url: str, headers: dict, insecure: bool, owner: bool = True) -> Segment:
+        data = None
+        try:
+            r = self._get(url, headers, insecure, SEGMENT_TIMEOUT)
+            content = strip_png(r.content)
+            content_type = r.headers.get("Content-Type") or SEGMENT_TYPE
+            if content is not r.content or content_type.startswith("image/"):
+                # mpeg-ts dressed up as an image
+                content_type = SEGMENT_TYPE
+            data = Segment(content, content_type, r.status_code)
+            return data
+        finally:
+            if owner:
+                self.buffer.release(url, data)
+
+    def _prefetch(self, url: str) -> None:
+        with self._lock:
+            upcoming, headers, insecure = self._next.get(url, ((), None, False))
+        for segment in upcoming:
+            data, event, owner = self.buffer.claim(segment)
+            if owner:
+                self.executor.submit(self._prefetch_one, segment, headers, insecure)
+
+    def _prefetch_one(self, url: str, headers: dict, insecure: bool) -> None:
+        try:
+            self._fill(url, headers, insecure)
+            self.stats.add("prefetched")
+        except Exception:
+            self.stats.add("errors")
+
+    def _handler(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == "/stats":
+                    return self._send(200, json.dumps(proxy.stats.to_dict()).encode("utf-8"), "application/json")
+                query = parse_qs(parsed.query)
+                try:
+                    url = _decode(query["u"][0])
+                    headers = dict((k, v[0]) for k, v in parse_qs(_decode(query["h"][0])).items()) if "h" in query else {}
+                except Exception:
+                    return self._send(400, b"bad request", "text/plain")
+                insecure = query.get("k", ["0"])[0] == "1"
+                try:
+                    if parsed.path.startswith("/playlist"):
+                        self._send(200, proxy.playlist(url, headers, insecure), "application/vnd.apple.mpegurl")
+                    else:
+                        segment = proxy.segment(url, headers, insecure, self.headers.get("Range"))
+                        extra = {"Content-Range": segment.content_range} if segment.content_range else {}
+                        self._send(segment.status, segment.data, segment.content_type, extra)
+                except requests.HTTPError as e:
+                    proxy.stats.add("errors")
+                    self._send(e.response.status_code if e.response is not None else 502, b"", "text/plain")
+                except Exception:
+                    proxy.stats.add("errors")
+                    self._send(502, b"", "text/plain")
+
+            def _send(self, code, body, content_type, extra=None):
+                try:
+                    self.send_response(code)
+                    self.send_header("Content-Type", content_type)
+                    for name, value in (extra or {}).items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+
+def get_stats() -> dict:
+    """Returns the statistics the service last published."""
+    try:
+        return json.loads(_window().getProperty(STATS_PROPERTY) or "{}")
+    except Exception:
+        return {}
@@ -34,7 +34,11 @@ def scan(html: str) -> str:
             if ".m3u8" in b64 or ".css" in b64 or ".js" in b64 or "load-playlist" in b64: # Some sites like to hide the m3u8 in a .js or .css file
                 res = b64
     elif len(re_packed) > 0:
-        packed = jsunpack.unpack(re_packed[0])
+        try:
+            from resolveurl.lib import deobfuscate
+            packed = deobfuscate.decode(deobfuscate.PACKER, re_packed[0])
+        except ImportError:
+            packed = jsunpack.unpack(re_packed[0])
         res = scan(packed)
     return res
 
@@ -0,0 +1,30 @@
+import json, os, sys
+import xbmc, xbmcgui
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib"))
+from jetextractors.util import hls_proxy
+
+STATS_INTERVAL = 15
+
+
+def run():
+    window = xbmcgui.Window(10000)
+    monitor = xbmc.Monitor()
+    try:
+        proxy = hls_proxy.HLSProxy().start()
+    except Exception as e:
+        xbmc.log(f"JetExtractors: HLS proxy failed to start: {e}", xbmc.LOGERROR)
+        return
+    window.setProperty(hls_proxy.PORT_PROPERTY, str(proxy.port))
+    xbmc.log(f"JetExtractors: HLS proxy listening on {hls_proxy.HOST}:{proxy.port}", xbmc.LOGINFO)
+    try:
+        while not monitor.waitForAbort(STATS_INTERVAL):
+            window.setProperty(hls_proxy.STATS_PROPERTY, json.dumps(proxy.stats.to_dict()))
+    finally:
+        window.clearProperty(hls_proxy.PORT_PROPERTY)
+        xbmc.log(f"JetExtractors: HLS proxy stopped, stats {json.dumps(proxy.stats.to_dict())}", xbmc.LOGINFO)
+        proxy.stop()
+
+
+if __name__ == "__main__":
+    run()
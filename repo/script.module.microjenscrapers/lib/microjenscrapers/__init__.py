@@ -7,8 +7,13 @@
 # valuable contributions in bringing this project together 
 # and for ongoing  maintenance / development                        
 #########################################
+import importlib.util
+import json
 import pkgutil
 import os
+import sys
+import threading
+import time
 
 try:
     from .modules import cfscrape
@@ -25,28 +30,135 @@ except:
     pass
 
 
-def sources():
+# What callers filter on, per provider. Providers are only imported to
+# (re)describe them when their file changed, and for running.
+MANIFEST_VERSION = 1
+
+_loaded = {}
+_manifests = {}
+_hosters = None
+_lock = threading.RLock()
+
+
+def _manifestFile(sourceFolder):
+    if __addon__ is None:
+        return None
     try:
-        sourceDict = []
-        if __addon__ is not None:
-            provider = __addon__.getSetting('package.folder')
-        else:
-            provider = 'microjenscrapers'
-        sourceFolder = getScraperFolder(provider)
-        sourceFolderLocation = os.path.join(os.path.dirname(__file__), sourceFolder)
-        sourceSubFolders = [x[1] for x in os.walk(sourceFolderLocation)][0]
-        for i in sourceSubFolders:
-            for loader, module_name, is_pkg in pkgutil.walk_packages([os.path.join(sourceFolderLocation, i)]):
-                if is_pkg:
-                    continue
-                if enabledCheck(module_name):
-                    try:
-                        module = loader.find_module(module_name).load_module(module_name)
-                        sourceDict.append((module_name, module.source()))
-                    except:
-                        pass
+        from kodi_six import xbmcvfs
+        dataPath = xbmcvfs.translatePath(__addon__.getAddonInfo('profile'))
+        if not os.path.exists(dataPath):
+            os.makedirs(dataPath)
+        return os.path.join(dataPath, 'providers.%s.json' % sourceFolder)
+    except Exception:
+        return None
+
+
+def _discover(sourceFolder):
+    found = {}
+    sourceFolderLocation = os.path.join(os.path.dirname(__file__), sourceFolder)
+    sourceSubFolders = [x[1] for x in os.walk(sourceFolderLocation)][0]
+    for i in sourceSubFolders:
+        for loader, module_name, is_pkg in pkgutil.iter_modules([os.path.join(sourceFolderLocation, i)]):
+            if is_pkg or module_name in found:
+                continue
+            path = os.path.join(sourceFolderLocation, i, module_name + '.py')
+            try:
+                found[module_name] = (path, os.path.getmtime(path))
+            except OSError:
+                pass
+    return found
+
+
+def _import(module_name, path):
+    with _lock:
+        if path not in _loaded:
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                _loaded[path] = module.source()
+            except Exception:
+                _loaded[path] = None
+        return _loaded[path]
+
+
+def _describe(source, path, mtime):
+    if source is None:
+        return {'path': path, 'mtime': mtime, 'broken': True}
+    return {
+        'path': path,
+        'mtime': mtime,
+        'language': list(getattr(source, 'language', None) or []),
+        'priority': getattr(source, 'priority', 1),
+        'genre_filter': list(getattr(source, 'genre_filter', None) or []),
+        'movie': getattr(source, 'movie', None) is not None,
+        'tvshow': getattr(source, 'tvshow', None) is not None
+    }
+
+
+def manifest(sourceFolder=None):
+    if sourceFolder is None:
+        sourceFolder = getScraperFolder(__addon__.getSetting('package.folder') if __addon__ is not None else 'microjenscrapers')
+    with _lock:
+        if sourceFolder in _manifests:
+            return _manifests[sourceFolder]
+
+        start = time.time()
+        found = _discover(sourceFolder)
+        manifestFile = _manifestFile(sourceFolder)
+        try:
+            with open(manifestFile, 'r') as f:
+                saved = json.load(f)
+            if saved.get('version') != MANIFEST_VERSION:
+                raise ValueError()
+            saved = saved['providers']
+        except Exception:
+            saved = {}
+
+        entries = {}
+        described = 0
+        for module_name, (path, mtime) in found.items():
+            entry = saved.get(module_name)
+            if not entry or entry.get('path') != path or entry.get('mtime') != mtime:
+                entry = _describe(_import(module_name, path), path, mtime)
+                described += 1
+            entries[module_name] = entry
+
+        if manifestFile and (described or len(entries) != len(saved)):
+            try:
+                tmp = manifestFile + '.tmp'
+                with open(tmp, 'w') as f:
+                    json.dump({'version': MANIFEST_VERSION, 'providers': entries}, f)
+                os.replace(tmp, manifestFile)
+            except Exception:
+                pass
+
+        _manifests[sourceFolder] = entries
         import xbmc
-        xbmc.log(f'sourceDict= {sourceDict}', xbmc.LOGINFO)
+        xbmc.log('MicroJen providers: %d found in %s, %d imported to update the manifest, %.0f ms' % (
+            len(entries), sourceFolder, described, (time.time() - start) * 1000), xbmc.LOGINFO)
+        return entries
+
+
+def sources(content=None):
+    '''
+    Returns [(module_name, source)] of the enabled providers, optionally only
+    those supporting content ('movie' or 'episode'). Providers are picked from
+    the manifest and each is imported once per interpreter.
+    '''
+    try:
+        sourceDict = []
+        for module_name, entry in manifest().items():
+            if entry.get('broken') or not enabledCheck(module_name):
+                continue
+            if content == 'movie' and not entry['movie']:
+                continue
+            if content == 'episode' and not entry['tvshow']:
+                continue
+            source = _import(module_name, entry['path'])
+            if source is not None:
+                sourceDict.append((module_name, source))
         return sourceDict
     except:
         return []
@@ -67,21 +179,19 @@ def providerSources():
 
 
 def providerNames():
-    providerList = []
-    provider = __addon__.getSetting('package.folder')
-    sourceFolder = getScraperFolder(provider)
-    sourceFolderLocation = os.path.join(os.path.dirname(__file__), sourceFolder)
-    sourceSubFolders = [x[1] for x in os.walk(sourceFolderLocation)][0]
-    for i in sourceSubFolders:
-        for loader, module_name, is_pkg in pkgutil.walk_packages([os.path.join(sourceFolderLocation, i)]):
-            if is_pkg:
-                continue
-            correctName = module_name.split('_')[0]
-            providerList.append(correctName)
-    return providerList
+    sourceFolder = getScraperFolder(__addon__.getSetting('package.folder'))
+    with _lock:
+        entries = _manifests.get(sourceFolder)
+    if entries is None:
+        entries = _discover(sourceFolder)
+    return [module_name.split('_')[0] for module_name in entries]
 
 
 def getAllHosters():
+    global _hosters
+    if _hosters is not None:
+        return list(_hosters)
+
     def _sources(sourceFolder, appendList):
         sourceFolderLocation = os.path.join(os.path.dirname(__file__), sourceFolder)
         sourceSubFolders = [x[1] for x in os.walk(sourceFolderLocation)][0]
@@ -97,7 +207,8 @@ def getAllHosters():
     for item in sourceSubFolders:
         if item not in ['__pycache__', 'modules', 'cfscrape', 'pyaes']:
             _sources(item, appendList)
-    return list(set(appendList))
+    _hosters = list(set(appendList))
+    return list(_hosters)
 
 
 def getScraperFolder(scraper_source):
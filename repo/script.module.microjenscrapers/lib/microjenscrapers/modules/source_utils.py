@@ -372,10 +372,14 @@ def evp_decode(cipher_text, passphrase, salt=None):
         salt = cipher_text[8:16]
         cipher_text = cipher_text[16:]
     data = evpKDF(passphrase, salt)
-    decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(data['key'], data['iv']))
-    plain_text = decrypter.feed(cipher_text)
-    plain_text += decrypter.feed()
-    return plain_text
+    try:
+        from resolveurl.lib import crypto
+        return crypto.aes_cbc_decrypt(data['key'], data['iv'], cipher_text)
+    except ImportError:
+        decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(data['key'], data['iv']))
+        plain_text = decrypter.feed(cipher_text)
+        plain_text += decrypter.feed()
+        return plain_text
 
 
 def evpKDF(passwd, salt, key_size=8, iv_size=4, iterations=1, hash_algorithm="md5"):
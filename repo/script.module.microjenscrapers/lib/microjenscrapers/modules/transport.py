@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+'''
+    MicroJen Scrapers Add-on
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+'''
+    Connection pooling for client.request.
+
+    urllib opens a new connection for every request and client.request used
+    to install its opener globally, which the provider threads raced on.
+    Openers are built per request here from handlers that share one pool of
+    keep-alive connections per (scheme, host, ssl context), so concurrent
+    providers hitting the same site reuse each other's connections and
+    nothing is installed globally.
+
+    A connection goes back to the pool once its response has been read to
+    the end, a response closed early takes its connection with it.
+'''
+
+import gzip
+import ssl
+import threading
+import time
+import zlib
+
+from http import client as http_client
+from urllib import request as urllib_request
+from urllib.error import URLError
+from urllib.response import addinfourl
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MAX_IDLE_PER_HOST = 6
+IDLE_TIMEOUT = 60
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+
+class ConnectionPool(object):
+
+    def __init__(self, max_idle=MAX_IDLE_PER_HOST, idle_timeout=IDLE_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def get(self, key):
+        with self._lock:
+            conns = self._idle.get(key)
+            while conns:
+                conn, released = conns.pop()
+                if time.time() - released < self.idle_timeout:
+                    self.reused += 1
+                    return conn
+                conn.close()
+            self.opened += 1
+        return None
+
+    def put(self, key, conn, reusable=True):
+        if reusable and conn.sock is not None:
+            with self._lock:
+                conns = self._idle.setdefault(key, [])
+                if len(conns) < self.max_idle:
+                    conns.append((conn, time.time()))
+                    return
+        conn.close()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {'opened': self.opened, 'reused': self.reused,
+                    'idle': sum(len(conns) for conns in self._idle.values())}
+
+
+pool = ConnectionPool()
+
+
+class PooledResponse(http_client.HTTPResponse):
+    '''Hands its connection back to the pool once the body is consumed.'''
+
+    _release = None
+    _dirty = False
+
+    def close(self):
+        if self.fp is not None and self.length != 0:
+            # unread body left on the socket, the connection can't be reused
+            self._dirty = True
+        super(PooledResponse, self).close()
+        self._give_back()
+
+    def _close_conn(self):
+        super(PooledResponse, self)._close_conn()
+        self._give_back()
+
+    def _give_back(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release(not (self.will_close or self._dirty))
+
+
+class PooledHandlerMixin(object):
+
+    def do_open(self, http_class, req, **http_conn_args):
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+        if req.has_proxy() or getattr(req, '_tunnel_host', None):
+            return super(PooledHandlerMixin, self).do_open(http_class, req, **http_conn_args)
+
+        key = (req.type, host, id(http_conn_args.get('context')))
+        headers = dict(req.unredirected_hdrs)
+        headers.update((k, v) for k, v in req.headers.items() if k not in headers)
+        headers = dict((name.title(), val) for name, val in headers.items())
+
+        while True:
+            conn = pool.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn = http_class(host, timeout=req.timeout, **http_conn_args)
+            else:
+                conn.timeout = req.timeout
+                conn.sock.settimeout(req.timeout)
+            conn.response_class = PooledResponse
+            try:
+                conn.request(req.get_method(), req.selector, req.data, headers,
+                             encode_chunked=req.has_header('Transfer-encoding'))
+                response = conn.getresponse()
+            except (http_client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    # the server dropped the idle connection, retry on a new one
+                    continue
+                raise URLError(e)
+            except OSError as e:
+                conn.close()
+                raise URLError(e)
+            break
+
+        response._release = lambda reusable: pool.put(key, conn, reusable)
+        if response.fp is None:
+            response._give_back()
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+
+class HTTPHandler(PooledHandlerMixin, urllib_request.HTTPHandler):
+    pass
+
+
+class HTTPSHandler(PooledHandlerMixin, urllib_request.HTTPSHandler):
+    pass
+
+
+class NoRedirectHandler(urllib_request.HTTPRedirectHandler):
+
+    def http_error_302(self, reqst, fp, code, msg, head):
+
+        # status is a read-only property of addinfourl on python 3.9+
+        return addinfourl(fp, head, reqst.get_full_url(), code)
+
+    http_error_300 = http_error_302
+    http_error_301 = http_error_302
+    http_error_303 = http_error_302
+    http_error_307 = http_error_302
+
+
+def unverified_context():
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+_unverified = unverified_context()
+
+
+def opener(verify=True, redirect=True, proxy=None, cookies=None, auth=None):
+    '''
+    Returns an opener for one request. auth is (url, username, password),
+    cookies a cookie jar. Openers are cheap, the connections are pooled.
+    '''
+    handlers = [
+        HTTPHandler(),
+        HTTPSHandler(context=None if verify else _unverified),
+    ]
+    if proxy is not None:
+        handlers.append(urllib_request.ProxyHandler({'http': '{0}'.format(proxy)}))
+        if auth is not None:
+            passmgr = urllib_request.HTTPPasswordMgr()
+            passmgr.add_password(None, uri=auth[0], user=auth[1], passwd=auth[2])
+            handlers.append(urllib_request.ProxyBasicAuthHandler(passmgr))
+    elif auth is not None:
+        passmgr = urllib_request.HTTPPasswordMgrWithDefaultRealm()
+        passmgr.add_password(None, uri=auth[0], user=auth[1], passwd=auth[2])
+        handlers.append(urllib_request.HTTPBasicAuthHandler(passmgr))
+    if cookies is not None:
+        handlers.append(urllib_request.HTTPCookieProcessor(cookies))
+    if redirect is False:
+        handlers.append(NoRedirectHandler())
+    return urllib_request.build_opener(*handlers)
+
+
+def decode(body, headers):
+    '''Decompresses a complete body according to its Content-Encoding.'''
+    try:
+        encoding = (headers.get('Content-Encoding') or '').lower()
+    except Exception:
+        return body
+    try:
+        if encoding == 'gzip':
+            return gzip.decompress(body)
+        if encoding == 'deflate':
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        if encoding == 'br' and brotli:
+            return brotli.decompress(body)
+    except Exception:
+        pass
+    return body
+
+
+def benchmark(url, n=50, threads=10):
+    '''
+    Fetches url n times from the given number of threads, once with a new
+    connection per request as urllib does and once through the pool.
+    '''
+    import concurrent.futures
+
+    def plain(_):
+        return urllib_request.build_opener().open(url, timeout=10).read()
+
+    def pooled(_):
+        response = opener().open(url, timeout=10)
+        try:
+            return response.read()
+        finally:
+            response.close()
+
+    pool.clear()
+    before = pool.stats()
+    elapsed = {}
+    for name, fetch in (('urllib', plain), ('pooled', pooled)):
+        start = time.time()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(fetch, range(n)))
+        elapsed[name] = time.time() - start
+    stats = pool.stats()
+    print('urllib: %d requests in %.3fs, %d connections' % (n, elapsed['urllib'], n))
+    print('pooled: %d requests in %.3fs, %d connections opened, %d reused' % (
+        n, elapsed['pooled'], stats['opened'] - before['opened'], stats['reused'] - before['reused']))
+    stats['elapsed'] = elapsed
+    return stats
+
+
+if __name__ == '__main__':
+    import sys
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # headers and body go out as separate writes, without TCP_NODELAY the
+        # body waits for the client's delayed ack and every request takes ~40ms
+        disable_nagle_algorithm = True
+        body = b'x' * 16384
+
+        def setup(self):
+            connections.append(1)
+            BaseHTTPRequestHandler.setup(self)
+
+        def do_GET(self):
+            time.sleep(0.005)
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(self.body)))
+            self.end_headers()
+            self.wfile.write(self.body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    benchmark('http://127.0.0.1:%d/' % server.server_port, n=n)
+    print('server accepted %d connections in total' % len(connections))
+    server.shutdown()
@@ -1,7 +1,14 @@
 import abc
+import hashlib
+import json
+import logging
+import os
 import posixpath
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from functools import lru_cache
 from typing import List, Optional, Tuple
 
@@ -9,12 +16,16 @@ from urllib.parse import quote
 from requests.sessions import Session
 
 from .params import to_params_dict
+from .ratelimit import TokenBucket, get_bucket
 from .retrying import _RetryingSession
 from .. import compat
+from ..utils import datetime_to_iso_str
 
 
 TimeoutTuple = Tuple[int, int]
 
+logger = logging.getLogger(__name__)
+
 
 class ApiAbstract(metaclass=abc.ABCMeta):
     VERSION = "v0"
@@ -22,6 +33,9 @@ class ApiAbstract(metaclass=abc.ABCMeta):
     API_LIMIT = 1.0 / 5  # 5 per second
     API_URL = posixpath.join(API_BASE_URL, VERSION)
     MAX_RECORDS_PER_REQUEST = 10
+    CACHE_TTL = 60 * 60  # deleted records are only noticed once this runs out
+    MAX_RATE_LIMIT_RETRIES = 5
+    RATE_LIMIT_BACKOFF = 30.0  # Airtable blocks a base for 30 seconds after a 429
 
     session: Session
     tiemout: TimeoutTuple
@@ -31,6 +45,8 @@ class ApiAbstract(metaclass=abc.ABCMeta):
         api_key: str,
         timeout: Optional[TimeoutTuple] = None,
         retry_strategy: Optional["compat.Retry"] = None,
+        cache_dir: Optional[str] = None,
+        max_workers: int = 1,
     ):
 
         if not retry_strategy:
@@ -40,6 +56,8 @@ class ApiAbstract(metaclass=abc.ABCMeta):
 
         self.timeout = timeout
         self.api_key = api_key
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
 
     @property
     def api_key(self) -> str:
@@ -103,12 +121,50 @@ class ApiAbstract(metaclass=abc.ABCMeta):
         else:
             return response.json()
 
+    def _bucket(self, url: str) -> TokenBucket:
+        """Returns the rate limit bucket of the base ``url`` belongs to."""
+        base_id = url[len(self.API_URL) :].lstrip("/").split("/", 1)[0]
+        return get_bucket(base_id, 1.0 / self.API_LIMIT)
+
     def _request(self, method: str, url: str, params=None, json_data=None):
-        response = self.session.request(
-            method, url, params=params, json=json_data, timeout=self.timeout
-        )
+        bucket = self._bucket(url)
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            bucket.acquire()
+            response = self.session.request(
+                method, url, params=params, json=json_data, timeout=self.timeout
+            )
+            if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+            try:
+                wait = float(response.headers.get("Retry-After", self.RATE_LIMIT_BACKOFF))
+            except ValueError:
+                wait = self.RATE_LIMIT_BACKOFF
+            logger.warning("Airtable rate limit hit, retrying in %.1fs", wait)
+            time.sleep(wait)
         return self._process_response(response)
 
+    def _batch_requests(self, name: str, requests_: List[dict]) -> List[dict]:
+        """
+        Sends ``requests_`` (keyword arguments of :meth:`_request`) and
+        returns their responses in order. With ``max_workers`` above 1 up to
+        that many are in flight at once, the bucket of the base still limits
+        how many are sent per second.
+        """
+        started = time.monotonic()
+        if self.max_workers > 1 and len(requests_) > 1:
+            with ThreadPoolExecutor(min(self.max_workers, len(requests_))) as executor:
+                responses = list(executor.map(lambda kw: self._request(**kw), requests_))
+        else:
+            responses = [self._request(**kw) for kw in requests_]
+
+        elapsed = time.monotonic() - started
+        records = sum(len(response.get("records", [])) for response in responses)
+        logger.info(
+            "%s: %d records in %d requests, %.2fs (%.1f records/s)",
+            name, records, len(requests_), elapsed, records / elapsed if elapsed else 0.0,
+        )
+        return responses
+
     def _get_record(
         self, base_id: str, table_name: str, record_id: str, **options
     ) -> dict:
@@ -129,7 +185,6 @@ class ApiAbstract(metaclass=abc.ABCMeta):
             offset = data.get("offset")
             if not offset:
                 break
-            time.sleep(self.API_LIMIT)
 
     def _first(self, base_id: str, table_name: str, **options) -> Optional[dict]:
         for records in self._iterate(
@@ -140,12 +195,65 @@ class ApiAbstract(metaclass=abc.ABCMeta):
         return None
 
     def _all(self, base_id: str, table_name: str, **options) -> List[dict]:
+        if self.cache_dir:
+            return self._all_cached(base_id, table_name, **options)
         all_records = []
 
         for records in self._iterate(base_id, table_name, **options):
             all_records.extend(records)
         return all_records
 
+    def _modified_since(self, base_id: str, table_name: str, timestamp: str) -> bool:
+        """
+        Returns True if a record of the table was created or changed after
+        ``timestamp`` (ISO 8601, UTC). Costs a single request.
+        """
+        formula = "IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{}'))".format(timestamp)
+        record = self._first(base_id, table_name, formula=formula, fields=[])
+        return record is not None
+
+    def _cache_file(self, base_id: str, table_name: str, options: dict) -> str:
+        key = json.dumps([base_id, table_name, options], sort_keys=True, default=str)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self.cache_dir, name)
+
+    def _all_cached(self, base_id: str, table_name: str, **options) -> List[dict]:
+        """
+        :meth:`_all` through a record cache on disk keyed by base, table and
+        options. A cached result is returned after one request confirms that
+        no record changed since it was fetched.
+        """
+        path = self._cache_file(base_id, table_name, options)
+        cached = None
+        try:
+            with open(path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if cached and time.time() - cached["cached_at"] < self.CACHE_TTL:
+            try:
+                if not self._modified_since(base_id, table_name, cached["checked"]):
+                    return cached["records"]
+            except requests.exceptions.RequestException:
+                pass
+
+        checked = datetime_to_iso_str(datetime.utcnow())
+        cached_at = time.time()
+        all_records = []
+        for records in self._iterate(base_id, table_name, **options):
+            all_records.extend(records)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = "{}.{}.tmp".format(path, threading.get_ident())
+            with open(tmp, "w") as f:
+                json.dump(
+                    {"cached_at": cached_at, "checked": checked, "records": all_records}, f
+                )
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return all_records
+
     def _create(self, base_id: str, table_name: str, fields: dict, typecast=False, **options):
 
         table_url = self.get_table_url(base_id, table_name)
@@ -164,16 +272,20 @@ class ApiAbstract(metaclass=abc.ABCMeta):
         table_url = self.get_table_url(base_id, table_name)
         inserted_records = []
         params = self._options_to_params(**options)
-        for chunk in self._chunk(records, self.MAX_RECORDS_PER_REQUEST):
-            new_records = self._build_batch_record_objects(chunk)
-            response = self._request(
-                "post",
-                table_url,
-                json_data={"records": new_records, "typecast": typecast},
-                params=params
+        requests_ = [
+            dict(
+                method="post",
+                url=table_url,
+                json_data={
+                    "records": self._build_batch_record_objects(chunk),
+                    "typecast": typecast,
+                },
+                params=params,
             )
+            for chunk in self._chunk(records, self.MAX_RECORDS_PER_REQUEST)
+        ]
+        for response in self._batch_requests("batch_create", requests_):
             inserted_records += response["records"]
-            time.sleep(self.API_LIMIT)
         return inserted_records
 
     def _update(
@@ -208,16 +320,20 @@ class ApiAbstract(metaclass=abc.ABCMeta):
         table_url = self.get_table_url(base_id, table_name)
         method = "put" if replace else "patch"
         params = self._options_to_params(**options)
-        for records in self._chunk(records, self.MAX_RECORDS_PER_REQUEST):
-            chunk_records = [{"id": x["id"], "fields": x["fields"]} for x in records]
-            response = self._request(
-                method,
-                table_url,
-                json_data={"records": chunk_records, "typecast": typecast},
-                params=params
+        requests_ = [
+            dict(
+                method=method,
+                url=table_url,
+                json_data={
+                    "records": [{"id": x["id"], "fields": x["fields"]} for x in records],
+                    "typecast": typecast,
+                },
+                params=params,
             )
+            for records in self._chunk(records, self.MAX_RECORDS_PER_REQUEST)
+        ]
+        for response in self._batch_requests("batch_update", requests_):
             updated_records += response["records"]
-            time.sleep(self.API_LIMIT)
 
         return updated_records
 
@@ -230,12 +346,12 @@ class ApiAbstract(metaclass=abc.ABCMeta):
     ) -> List[dict]:
         deleted_records = []
         table_url = self.get_table_url(base_id, table_name)
-        for record_ids in self._chunk(record_ids, self.MAX_RECORDS_PER_REQUEST):
-            delete_results = self._request(
-                "delete", table_url, params={"records[]": record_ids}
-            )
+        requests_ = [
+            dict(method="delete", url=table_url, params={"records[]": record_ids})
+            for record_ids in self._chunk(record_ids, self.MAX_RECORDS_PER_REQUEST)
+        ]
+        for delete_results in self._batch_requests("batch_delete", requests_):
             deleted_records.extend(delete_results["records"])
-            time.sleep(self.API_LIMIT)
         return deleted_records
 
 
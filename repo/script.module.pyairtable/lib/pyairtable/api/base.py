@@ -23,6 +23,8 @@ class Base(ApiAbstract):
         *,
         timeout: Optional[TimeoutTuple] = None,
         retry_strategy: Optional["compat.Retry"] = None,
+        cache_dir: Optional[str] = None,
+        max_workers: int = 1,
     ):
         """
         Args:
@@ -32,17 +34,34 @@ class Base(ApiAbstract):
         Keyword Args:
             timeout (``Tuple``): |arg_timeout|
             retry_strategy (``Retry``): |arg_retry_strategy|
+            cache_dir (``str``): Directory for the on-disk record cache used
+                by ``all()``. Default is no cache.
+            max_workers (``int``): Requests the batch methods keep in flight
+                at once, still limited to 5 per second per base. Default is 1.
         """
 
         self.base_id = base_id
-        super().__init__(api_key, timeout=timeout, retry_strategy=retry_strategy)
+        super().__init__(
+            api_key,
+            timeout=timeout,
+            retry_strategy=retry_strategy,
+            cache_dir=cache_dir,
+            max_workers=max_workers,
+        )
 
     def get_table(self, table_name: str) -> "Table":
         """
         Returns a new :class:`Table` instance using all shared
         attributes from :class:`Base`
         """
-        return Table(self.api_key, self.base_id, table_name, timeout=self.timeout)
+        return Table(
+            self.api_key,
+            self.base_id,
+            table_name,
+            timeout=self.timeout,
+            cache_dir=self.cache_dir,
+            max_workers=self.max_workers,
+        )
 
     def get_record_url(self, table_name: str, record_id: str):
         """
@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Lets ``rate`` requests per second through, with bursts of up to
+    ``capacity``. Unlike a fixed sleep after every request, the time the
+    request itself took counts towards the budget, so a client spends the
+    whole Airtable allowance (5 requests per second per base).
+
+    >>> bucket = TokenBucket(5)
+    >>> bucket.acquire()  # returns at once while tokens are left
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes one token, sleeping until it is available. Returns the time slept."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(key: str, rate: float) -> TokenBucket:
+    """
+    Returns the bucket for ``key``, created on first use. Airtable limits
+    requests per base, so every client talking to a base shares its bucket
+    while requests to other bases don't wait on it. The bucket holds a
+    single token: a burst of ``rate`` tokens on top of the refill would let
+    almost twice the limit through in the first second.
+    """
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, capacity=1)
+        return bucket
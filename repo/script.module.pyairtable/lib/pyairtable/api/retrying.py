@@ -50,6 +50,15 @@ class _RetryingSession(Session):
     def __init__(self, retry_strategy: "compat.Retry"):
         super().__init__()
 
+        # 429 is retried by ApiAbstract._request, which waits on the base's
+        # rate limit bucket, retrying it here as well would multiply the retries
+        if retry_strategy.status_forcelist and 429 in retry_strategy.status_forcelist:
+            retry_strategy = retry_strategy.new(
+                status_forcelist=[
+                    code for code in retry_strategy.status_forcelist if code != 429
+                ]
+            )
+
         adapter = HTTPAdapter(max_retries=retry_strategy)
 
         self.mount("https://", adapter)
@@ -26,6 +26,8 @@ class Table(ApiAbstract):
         *,
         timeout: Optional[TimeoutTuple] = None,
         retry_strategy: Optional["compat.Retry"] = None,
+        cache_dir: Optional[str] = None,
+        max_workers: int = 1,
     ):
         """
         Args:
@@ -36,10 +38,20 @@ class Table(ApiAbstract):
         Keyword Args:
             timeout (``Tuple``): |arg_timeout|
             retry_strategy (``Retry``): |arg_retry_strategy|
+            cache_dir (``str``): Directory for the on-disk record cache used
+                by ``all()``. Default is no cache.
+            max_workers (``int``): Requests the batch methods keep in flight
+                at once, still limited to 5 per second per base. Default is 1.
         """
         self.base_id = base_id
         self.table_name = table_name
-        super().__init__(api_key, timeout=timeout, retry_strategy=retry_strategy)
+        super().__init__(
+            api_key,
+            timeout=timeout,
+            retry_strategy=retry_strategy,
+            cache_dir=cache_dir,
+            max_workers=max_workers,
+        )
 
     @property
     def table_url(self):
@@ -51,7 +63,13 @@ class Table(ApiAbstract):
         Returns a new :class:`Base` instance using all shared
         attributes from :class:`Table`
         """
-        return Base(self.api_key, self.base_id, timeout=self.timeout)
+        return Base(
+            self.api_key,
+            self.base_id,
+            timeout=self.timeout,
+            cache_dir=self.cache_dir,
+            max_workers=self.max_workers,
+        )
 
     def get_record_url(self, record_id: str):
         """
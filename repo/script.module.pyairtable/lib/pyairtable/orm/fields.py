@@ -254,13 +254,19 @@ class LinkField(Field, Generic[T_Linked]):
     def to_internal_value(self, value: Any) -> List[T_Linked]:
         # If Lazy, create empty from model class and set id
         # If not Lazy, fetch record from pyairtable and create new model instance
+        # Records already fetched, e.g. prefetched for a whole result set by
+        # Model.from_records, come from the linked model's identity map
         should_fetch = not self._lazy
-        linked_models = [
-            self._model._linked_cache.get(id_)
-            or self._model.from_id(id_, fetch=should_fetch)
-            for id_ in value
-        ]
-        self._model._linked_cache.update({m.id: m for m in linked_models})
+        if should_fetch:
+            self._model.prefetch(value)
+        linked_models = []
+        for id_ in value:
+            model = self._model._linked_cache.get(id_)
+            if model is None:
+                model = self._model.from_id(id_, fetch=should_fetch)
+                if should_fetch:
+                    self._model._linked_cache.add(model)
+            linked_models.append(model)
         return linked_models
 
     def to_record_value(self, value: Any) -> List[str]:
@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyairtable.orm import Model  # noqa
+
+
+class IdentityMap:
+    """
+    Model instances by record id, each kept for ``ttl`` seconds. Every model
+    class has its own map, so a record linked from many others is fetched
+    once and shared by all of them.
+
+    >>> identity_map = IdentityMap(ttl=300)
+    >>> identity_map.add(contact)
+    >>> identity_map.get(contact.id) is contact
+    True
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._instances: Dict[str, Tuple["Model", float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, record_id: str) -> Optional["Model"]:
+        """Returns the instance for ``record_id``, ``None`` if unknown or expired."""
+        with self._lock:
+            entry = self._instances.get(record_id)
+            if entry is None:
+                return None
+            instance, added = entry
+            if time.monotonic() - added >= self.ttl:
+                del self._instances[record_id]
+                return None
+            return instance
+
+    def add(self, instance: "Model") -> None:
+        self.update([instance])
+
+    def update(self, instances: Iterable["Model"]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for instance in instances:
+                self._instances[instance.id] = (instance, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
+
+    def __contains__(self, record_id: str) -> bool:
+        return self.get(record_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._instances)
@@ -62,9 +62,11 @@ True
 """
 import abc
 from pyairtable import Table
-from typing import TypeVar, Type, List
+from pyairtable.formulas import EQUAL, OR, STR_VALUE
+from typing import TypeVar, Type, List, Iterable, Optional
 
-from .fields import Field
+from .fields import Field, LinkField
+from .identity import IdentityMap
 
 T = TypeVar("T", bound="Model")
 
@@ -89,16 +91,28 @@ class Model(metaclass=abc.ABCMeta):
     ...         api_key = "keyapikey"
     ...         timeout: Optional[Tuple[int, int]] = (5, 5)
     ...         typecast: bool = True
+    ...         cache_ttl: float = 300
+
+    ``cache_ttl`` is how long, in seconds, records fetched through a
+    :class:`~pyairtable.orm.fields.LinkField` are reused before they are
+    fetched again.
     """
 
+    #: Default for ``Meta.cache_ttl``
+    CACHE_TTL = 300
+
+    #: Record ids per ``OR(RECORD_ID()=...)`` query, one page of results
+    PREFETCH_CHUNK_SIZE = 100
+
     id: str = ""
     created_time: str = ""
     _table: Table
     _fields: dict = {}
-    _linked_cache: dict = {}
+    _linked_cache: IdentityMap
 
     def __init_subclass__(cls, **kwargs):
         cls._validate_class()
+        cls._linked_cache = IdentityMap(getattr(cls.Meta, "cache_ttl", cls.CACHE_TTL))
         super().__init_subclass__(**kwargs)
 
     @classmethod
@@ -232,16 +246,22 @@ class Model(metaclass=abc.ABCMeta):
         return result["deleted"]
 
     @classmethod
-    def all(cls, **kwargs) -> List[T]:
-        """Returns all records for this model. See :meth:`~pyairtable.api.Api.all`"""
+    def all(cls: Type[T], **kwargs) -> List[T]:
+        """
+        Returns all records for this model. See :meth:`~pyairtable.api.Api.all`
+
+        Linked records of fields with ``lazy=False`` are fetched in batches
+        for the whole result, see :meth:`from_records`.
+        """
         table = cls.get_table()
-        return table.all(**kwargs)
+        return cls.from_records(table.all(**kwargs))
 
     @classmethod
-    def first(cls, **kwargs) -> List[T]:
+    def first(cls: Type[T], **kwargs) -> Optional[T]:
         """Returns first record for this model. See :meth:`~pyairtable.api.Api.first`"""
         table = cls.get_table()
-        return table.first(**kwargs)
+        record = table.first(**kwargs)
+        return cls.from_records([record])[0] if record else None
 
     def to_record(self) -> dict:
         """
@@ -255,24 +275,79 @@ class Model(metaclass=abc.ABCMeta):
         return {"id": self.id, "createdTime": self.created_time, "fields": fields}
 
     @classmethod
-    def from_record(cls: Type[T], record: dict) -> T:
-        """Create instance from record dictionary"""
+    def _record_kwargs(cls, record: dict) -> dict:
         name_attr_map = cls._field_name_attribute_map()
         name_field_map = cls._field_name_descriptor_map()
         try:
             # Convert Column Names into model field names
             # Use field's to_internal to cast into model fields
-            kwargs = {
+            return {
                 name_attr_map[k]: name_field_map[k].to_internal_value(v)
                 for k, v in record["fields"].items()
             }
         except KeyError as exc:
             raise ValueError("Invalid Field Name: {} for model {}".format(exc, cls))
-        instance = cls(**kwargs)
+
+    @classmethod
+    def from_record(cls: Type[T], record: dict) -> T:
+        """Create instance from record dictionary"""
+        instance = cls(**cls._record_kwargs(record))
         instance.created_time = record["createdTime"]
         instance.id = record["id"]
         return instance
 
+    @classmethod
+    def from_records(cls: Type[T], records: List[dict]) -> List[T]:
+        """
+        Create instances from a list of record dictionaries.
+
+        The ids in link fields with ``lazy=False`` are collected across all
+        records and fetched with one query per
+        :attr:`PREFETCH_CHUNK_SIZE` ids, instead of one request per linked
+        record. The instances are added to the identity map before their
+        fields are set, so records linking back to them resolve to the same
+        instances.
+        """
+        instances = []
+        for record in records:
+            instance = cls()
+            instance.created_time = record["createdTime"]
+            instance.id = record["id"]
+            instances.append(instance)
+        cls._linked_cache.update(instances)
+
+        for field in cls._attribute_descriptor_map().values():
+            if isinstance(field, LinkField) and not field._lazy:
+                field._model.prefetch(
+                    id_
+                    for record in records
+                    for id_ in record["fields"].get(field.field_name, [])
+                )
+
+        for instance, record in zip(instances, records):
+            for key, value in cls._record_kwargs(record).items():
+                setattr(instance, key, value)
+        return instances
+
+    @classmethod
+    def prefetch(cls, record_ids: Iterable[str]) -> None:
+        """
+        Fetches the records of ``record_ids`` that are not in the identity
+        map yet, in chunks of :attr:`PREFETCH_CHUNK_SIZE` ids.
+        """
+        missing = []
+        for record_id in dict.fromkeys(record_ids):
+            if record_id not in cls._linked_cache:
+                missing.append(record_id)
+        if not missing:
+            return
+
+        table = cls.get_table()
+        size = cls.PREFETCH_CHUNK_SIZE
+        for chunk in (missing[i : i + size] for i in range(0, len(missing), size)):
+            formula = OR(*(EQUAL("RECORD_ID()", STR_VALUE(id_)) for id_ in chunk))
+            cls.from_records(table.all(formula=formula))
+
     @classmethod
     def from_id(cls: Type[T], record_id: str, fetch=True) -> T:
         """
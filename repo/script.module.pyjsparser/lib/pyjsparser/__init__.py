@@ -1,5 +1,5 @@
-__all__ = ['PyJsParser', 'parse', 'JsSyntaxError', 'pyjsparserdata']
+__all__ = ['PyJsParser', 'parse', 'extract', 'clear_cache', 'JsSyntaxError', 'pyjsparserdata']
 __author__ = 'Piotr Dabkowski'
 __version__ = '2.2.0'
-from .parser import PyJsParser, parse, JsSyntaxError
+from .parser import PyJsParser, parse, extract, clear_cache, JsSyntaxError
 from . import pyjsparserdata
\ No newline at end of file
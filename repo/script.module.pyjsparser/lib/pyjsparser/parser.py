@@ -20,12 +20,16 @@
 from __future__ import unicode_literals
 from .pyjsparserdata import *
 from .std_nodes import *
+from .std_nodes import _collector
 from pprint import pprint
+import hashlib
+import re
 import sys
+import threading
 
 __all__ = [
-    'PyJsParser', 'parse', 'ENABLE_JS2PY_ERRORS', 'ENABLE_PYIMPORT',
-    'JsSyntaxError'
+    'PyJsParser', 'parse', 'extract', 'clear_cache', 'ENABLE_JS2PY_ERRORS',
+    'ENABLE_PYIMPORT', 'JsSyntaxError'
 ]
 REGEXP_SPECIAL_SINGLE = ('\\', '^', '$', '*', '+', '?', '.', '[', ']', '(',
                          ')', '{', '{', '|', '-')
@@ -51,6 +55,22 @@ true = True
 false = False
 null = None
 
+# Regex fast paths for the scanner, they consume the common ascii runs and
+# leave everything else to the char by char code below.
+WHITE_SPACE_RUN = re.compile('[%s]+' % ''.join(unichr(c) for c in sorted(WHITE_SPACE)))
+LINE_TERMINATOR = re.compile('\r\n|[\n\r\u2028\u2029]')
+SINGLE_LINE_COMMENT_BODY = re.compile('[^\n\r\u2028\u2029]*')
+IDENTIFIER_TAIL = re.compile('[A-Za-z0-9_$]*')
+STRING_CHARS = {
+    '"': re.compile('[^"\\\\\n\r\u2028\u2029]+'),
+    "'": re.compile("[^'\\\\\n\r\u2028\u2029]+"),
+}
+DECIMAL_LITERAL = re.compile('(?:[0-9]+(?:\\.[0-9]*)?|\\.[0-9]+)(?:[eE][+-]?[0-9]+)?')
+
+# parse() memo, keyed by the sha1 of the source
+CACHE_SIZE = 64
+EXTRACT_TYPES = ('Literal', 'AssignmentExpression', 'CallExpression')
+
 
 class PyJsParser:
     """ Usage:
@@ -88,36 +108,29 @@ class PyJsParser:
     # 7.4 Comments
 
     def skipSingleLineComment(self, offset):
-        start = self.index - offset
-        while self.index < self.length:
+        self.index = SINGLE_LINE_COMMENT_BODY.match(self.source,
+                                                    self.index).end()
+        if self.index < self.length:
             ch = self.source[self.index]
             self.index += 1
-            if isLineTerminator(ch):
-                if (ord(ch) == 13 and ord(self.source[self.index]) == 10):
-                    self.index += 1
-                self.lineNumber += 1
-                self.hasLineTerminator = True
-                self.lineStart = self.index
-                return
+            if (ord(ch) == 13 and ord(self.source[self.index]) == 10):
+                self.index += 1
+            self.lineNumber += 1
+            self.hasLineTerminator = True
+            self.lineStart = self.index
 
     def skipMultiLineComment(self):
-        while self.index < self.length:
-            ch = ord(self.source[self.index])
-            if isLineTerminator(ch):
-                if (ch == 0x0D and ord(self.source[self.index + 1]) == 0x0A):
-                    self.index += 1
-                self.lineNumber += 1
-                self.index += 1
-                self.hasLineTerminator = True
-                self.lineStart = self.index
-            elif ch == 0x2A:
-                # Block comment ends with '*/'.
-                if ord(self.source[self.index + 1]) == 0x2F:
-                    self.index += 2
-                    return
-                self.index += 1
-            else:
-                self.index += 1
+        # Block comment ends with '*/'.
+        end = self.source.find('*/', self.index)
+        body_end = self.length if end < 0 else end
+        for m in LINE_TERMINATOR.finditer(self.source, self.index, body_end):
+            self.lineNumber += 1
+            self.hasLineTerminator = True
+            self.lineStart = m.end()
+        if end >= 0:
+            self.index = end + 2
+            return
+        self.index = self.length
         self.tolerateUnexpectedToken()
 
     def skipComment(self):
@@ -126,7 +139,8 @@ class PyJsParser:
         while self.index < self.length:
             ch = ord(self.source[self.index])
             if isWhiteSpace(ch):
-                self.index += 1
+                self.index = WHITE_SPACE_RUN.match(self.source,
+                                                   self.index).end()
             elif isLineTerminator(ch):
                 self.hasLineTerminator = True
                 self.index += 1
@@ -249,7 +263,7 @@ class PyJsParser:
 
     def getIdentifier(self):
         start = self.index
-        self.index += 1
+        self.index = IDENTIFIER_TAIL.match(self.source, start + 1).end()
         while (self.index < self.length):
             ch = self.ccode()
             if (ch == 0x5C):
@@ -456,6 +470,21 @@ class PyJsParser:
             ch == '.'
         ), 'Numeric literal must start with a decimal digit or a decimal point'
         start = self.index
+        if ch != '0' or self.source[self.index + 1] not in 'xXbBoO01234567':
+            m = DECIMAL_LITERAL.match(self.source, self.index)
+            if m:
+                self.index = m.end()
+                if (isIdentifierStart(self.source[self.index])):
+                    self.throwUnexpectedToken()
+                return {
+                    'type': Token.NumericLiteral,
+                    'value': float(m.group()),
+                    'raw': m.group(),
+                    'lineNumber': self.lineNumber,
+                    'lineStart': self.lineStart,
+                    'start': start,
+                    'end': self.index
+                }
         number = ''
         if ch != '.':
             number = self.source[self.index]
@@ -615,8 +644,13 @@ class PyJsParser:
         assert quote == '\'' or quote == '"', 'String literal must starts with a quote'
         start = self.index
         self.index += 1
+        plain = STRING_CHARS[quote].match
 
         while (self.index < self.length):
+            m = plain(self.source, self.index)
+            if m:
+                st += m.group()
+                self.index = m.end()
             ch = self.source[self.index]
             self.index += 1
             if (ch == quote):
@@ -2979,7 +3013,10 @@ class PyJsParser:
         if options:
             raise NotImplementedError(
                 'Options not implemented! You can only use default settings.')
+        return node_to_dict(self.parse_nodes(code))
 
+    def parse_nodes(self, code):
+        """Same as parse but returns the Node tree without turning it into dicts."""
         self.clean()
         self.source = unicode(
             code
@@ -3005,17 +3042,112 @@ class PyJsParser:
         self.sourceType = 'script'
         self.strict = false
         try:
-            program = self.parseProgram()
+            return self.parseProgram()
         except Ecma51NotSupported as e:
             raise self.createError(self.lineNumber, self.lastIndex, unicode(e))
-        return node_to_dict(program)
 
 
-def parse(javascript_code):
+_local = threading.local()
+_cache = {}
+_cache_order = []
+_cache_lock = threading.Lock()
+
+
+def _get_parser():
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = PyJsParser()
+    return parser
+
+
+def _source_key(javascript_code):
+    data = unicode(javascript_code).encode('utf-8', 'surrogatepass' if PY3 else 'strict')
+    return hashlib.sha1(data).hexdigest()
+
+
+def _copy_tree(node):
+    if isinstance(node, dict):
+        return dict((k, _copy_tree(v)) for k, v in node.items())
+    if isinstance(node, list):
+        return [_copy_tree(e) for e in node]
+    return node
+
+
+def _memo(key, build):
+    with _cache_lock:
+        if key in _cache:
+            _cache_order.remove(key)
+            _cache_order.append(key)
+            return _cache[key]
+    result = build()
+    with _cache_lock:
+        if key not in _cache:
+            _cache_order.append(key)
+        _cache[key] = result
+        while len(_cache_order) > CACHE_SIZE:
+            del _cache[_cache_order.pop(0)]
+    return result
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        del _cache_order[:]
+
+
+def parse(javascript_code, cache=True):
     """Returns syntax tree of javascript_code.
-       Same as PyJsParser().parse  For your convenience :) """
-    p = PyJsParser()
-    return p.parse(javascript_code)
+       Same as PyJsParser().parse  For your convenience :)
+       Trees are memoised by the sha1 of the source, every call gets its
+       own copy of the dicts and lists so callers may modify it. Pass
+       cache=False to skip the memo. """
+    if not cache:
+        return PyJsParser().parse(javascript_code)
+    return _copy_tree(_memo(_source_key(javascript_code),
+                            lambda: _get_parser().parse(javascript_code)))
+
+
+def _to_dicts(nodes, types):
+    # node_to_dict, but a node of types nested in another one is converted
+    # once and its dict shared. nodes come inner first, as finish() saw them
+    done = {}
+
+    def convert(node):
+        converted = {}
+        for k, v in node.__dict__.items():
+            if isinstance(v, BaseNode):
+                v = done.get(id(v)) or convert(v)
+            elif isinstance(v, list):
+                v = [(done.get(id(e)) or convert(e)) if isinstance(e, BaseNode) else node_to_dict(e)
+                     for e in v]
+            elif isinstance(v, dict):
+                v = node_to_dict(v)
+            converted[k] = v
+        if node.type in types:
+            done[id(node)] = converted
+        return converted
+
+    return [done.get(id(n)) or convert(n) for n in nodes]
+
+
+def extract(javascript_code, types=EXTRACT_TYPES):
+    """Returns only the nodes of the given types (literals, assignments and
+       calls by default) as dicts, in the order the parser completes them,
+       inner nodes first. The nodes are picked up as they are parsed and the
+       rest of the tree is never turned into dicts; a wanted node nested in
+       another one shares its dict. The picked nodes are memoised like
+       parse(), the dicts are built for every call. """
+    types = frozenset(types)
+
+    def build():
+        _collector.types, _collector.found = types, []
+        try:
+            _get_parser().parse_nodes(javascript_code)
+            return _collector.found
+        finally:
+            _collector.types, _collector.found = None, None
+
+    return _to_dicts(_memo(('extract', types, _source_key(javascript_code)), build), types)
 
 
 if __name__ == '__main__':
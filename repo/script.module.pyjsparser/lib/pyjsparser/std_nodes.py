@@ -1,4 +1,8 @@
 from .pyjsparserdata import *
+import threading
+
+# set by parser.extract(): finish() keeps the nodes of the wanted types
+_collector = threading.local()
 
 
 class Ecma51NotSupported(Exception):
@@ -13,7 +17,9 @@ class Ecma51NotSupported(Exception):
 
 class BaseNode:
     def finish(self):
-        pass
+        types = getattr(_collector, 'types', None)
+        if types is not None and self.type in types:
+            _collector.found.append(self)
 
     def finishArrayExpression(self, elements):
         self.type = Syntax.ArrayExpression
@@ -21,7 +21,7 @@ from resolveurl.lib import log_utils
 from resolveurl.lib.net import Net, get_ua  # @UnusedImport  # NOQA
 from resolveurl.lib import cache  # @UnusedImport  # NOQA
 from resolveurl.lib import kodi
-from resolveurl.lib import pyaes
+from resolveurl.lib import crypto
 from random import choice
 
 logger = log_utils.Logger.get_logger()
@@ -87,9 +87,7 @@ def decrypt_py(cipher_text, key):
         try:
             scraper_key = hashlib.sha256(key).digest()
             IV = '\0' * 16
-            decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(scraper_key, IV))
-            plain_text = decrypter.feed(cipher_text)
-            plain_text += decrypter.feed()
+            plain_text = crypto.aes_cbc_decrypt(scraper_key, IV, cipher_text)
             if 'import' not in plain_text:
                 plain_text = ''
         except Exception as e:
@@ -106,9 +104,7 @@ def encrypt_py(plain_text, key):
         try:
             scraper_key = hashlib.sha256(key).digest()
             IV = '\0' * 16
-            decrypter = pyaes.Encrypter(pyaes.AESModeOfOperationCBC(scraper_key, IV))
-            cipher_text = decrypter.feed(plain_text)
-            cipher_text += decrypter.feed()
+            cipher_text = crypto.aes_cbc_encrypt(scraper_key, IV, plain_text)
         except Exception as e:
             logger.log_warning('Exception during Py Encrypt: %s' % (e))
             cipher_text = ''
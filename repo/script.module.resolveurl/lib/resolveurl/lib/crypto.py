@@ -0,0 +1,328 @@
+"""
+    ResolveURL Addon for Kodi
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+    Crypto facade shared by the resolvers and the add-ons that import
+    resolveurl. Uses a native backend (pycryptodome(x) or cryptography)
+    when one can be imported and the bundled pure python code otherwise.
+
+    usage:
+
+    from resolveurl.lib import crypto
+    plain = crypto.aes_cbc_decrypt(key, iv, data)
+    plain = crypto.aes_gcm_decrypt(key, nonce, data_and_tag)
+    plain = crypto.evp_decrypt(b64_ciphertext, passphrase)
+"""
+import base64
+import hashlib
+
+BACKEND_CRYPTODOME = 'cryptodome'
+BACKEND_CRYPTOGRAPHY = 'cryptography'
+BACKEND_PYTHON = 'python'
+
+_loaded = set([BACKEND_PYTHON])
+
+
+def _load_cryptodome():
+    global _AES, _DES
+    try:
+        from Cryptodome.Cipher import AES as _AES, DES as _DES
+    except ImportError:
+        from Crypto.Cipher import AES as _AES, DES as _DES
+        if not hasattr(_AES, 'MODE_GCM'):
+            # the old pycrypto has no GCM
+            raise ImportError('pycrypto has no AES GCM, pycryptodome is needed')
+
+
+def _load_cryptography():
+    global default_backend, Cipher, algorithms, modes, AESGCM, TripleDES
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    try:
+        from cryptography.hazmat.decrepit.ciphers.algorithms import TripleDES
+    except ImportError:
+        # cryptography < 43
+        TripleDES = algorithms.TripleDES
+
+
+_LOADERS = {
+    BACKEND_CRYPTODOME: _load_cryptodome,
+    BACKEND_CRYPTOGRAPHY: _load_cryptography,
+}
+
+
+def _load(name):
+    if name not in _loaded:
+        _LOADERS[name]()
+        _loaded.add(name)
+
+
+BACKEND = BACKEND_PYTHON
+for _name in (BACKEND_CRYPTODOME, BACKEND_CRYPTOGRAPHY):
+    try:
+        _load(_name)
+        BACKEND = _name
+        break
+    except ImportError:
+        pass
+
+
+def _b(data):
+    if isinstance(data, bytearray):
+        return bytes(data)
+    if not isinstance(data, bytes):
+        return data.encode('utf-8')
+    return data
+
+
+def pkcs7_pad(data, block_size=16):
+    data = _b(data)
+    n = block_size - len(data) % block_size
+    return data + bytes(bytearray([n] * n))
+
+
+def pkcs7_unpad(data, block_size=16):
+    data = _b(data)
+    if not data:
+        return data
+    n = bytearray(data[-1:])[0]
+    if n < 1 or n > block_size:
+        raise ValueError('Invalid PKCS7 padding')
+    return data[:-n]
+
+
+class _PythonBackend(object):
+    """Bundled pure python code, imported on first use only."""
+
+    @staticmethod
+    def aes(key, mode, iv=None):
+        from resolveurl.lib import pyaes
+        if mode == 'cbc':
+            return pyaes.AESModeOfOperationCBC(key, iv)
+        return pyaes.AESModeOfOperationECB(key)
+
+    @classmethod
+    def aes_encrypt(cls, key, mode, iv, data):
+        cipher = cls.aes(key, mode, iv)
+        return b''.join(_b(cipher.encrypt(data[i:i + 16])) for i in range(0, len(data), 16))
+
+    @classmethod
+    def aes_decrypt(cls, key, mode, iv, data):
+        cipher = cls.aes(key, mode, iv)
+        return b''.join(_b(cipher.decrypt(data[i:i + 16])) for i in range(0, len(data), 16))
+
+    @staticmethod
+    def gcm_encrypt(key, nonce, data, aad):
+        from resolveurl.lib.aesgcm import python_aesgcm
+        return _b(python_aesgcm.new(bytearray(key)).seal(bytearray(nonce), bytearray(data), bytearray(aad)))
+
+    @staticmethod
+    def gcm_decrypt(key, nonce, data, aad):
+        from resolveurl.lib.aesgcm import python_aesgcm
+        plain = python_aesgcm.new(bytearray(key)).open(bytearray(nonce), bytearray(data), bytearray(aad))
+        return None if plain is None else _b(plain)
+
+    @staticmethod
+    def des(key, mode, iv=None):
+        from resolveurl.lib import pyDes
+        if mode == 'cbc':
+            return pyDes.des(key, pyDes.CBC, iv)
+        return pyDes.des(key, pyDes.ECB)
+
+    @classmethod
+    def des_encrypt(cls, key, mode, iv, data):
+        return _b(cls.des(key, mode, iv).encrypt(data))
+
+    @classmethod
+    def des_decrypt(cls, key, mode, iv, data):
+        return _b(cls.des(key, mode, iv).decrypt(data))
+
+
+class _CryptodomeBackend(object):
+
+    @staticmethod
+    def _new(module, key, mode, iv):
+        if mode == 'cbc':
+            return module.new(key, module.MODE_CBC, iv)
+        return module.new(key, module.MODE_ECB)
+
+    @classmethod
+    def aes_encrypt(cls, key, mode, iv, data):
+        return cls._new(_AES, key, mode, iv).encrypt(data)
+
+    @classmethod
+    def aes_decrypt(cls, key, mode, iv, data):
+        return cls._new(_AES, key, mode, iv).decrypt(data)
+
+    @staticmethod
+    def gcm_encrypt(key, nonce, data, aad):
+        cipher = _AES.new(key, _AES.MODE_GCM, nonce=nonce)
+        cipher.update(aad)
+        ct, tag = cipher.encrypt_and_digest(data)
+        return ct + tag
+
+    @staticmethod
+    def gcm_decrypt(key, nonce, data, aad):
+        if len(data) < 16:
+            return None
+        cipher = _AES.new(key, _AES.MODE_GCM, nonce=nonce)
+        cipher.update(aad)
+        try:
+            return cipher.decrypt_and_verify(data[:-16], data[-16:])
+        except ValueError:
+            return None
+
+    @classmethod
+    def des_encrypt(cls, key, mode, iv, data):
+        return cls._new(_DES, key, mode, iv).encrypt(data)
+
+    @classmethod
+    def des_decrypt(cls, key, mode, iv, data):
+        return cls._new(_DES, key, mode, iv).decrypt(data)
+
+
+class _CryptographyBackend(object):
+
+    @staticmethod
+    def _cipher(algorithm, mode, iv):
+        return Cipher(algorithm, modes.CBC(iv) if mode == 'cbc' else modes.ECB(), backend=default_backend())
+
+    @classmethod
+    def aes_encrypt(cls, key, mode, iv, data):
+        enc = cls._cipher(algorithms.AES(key), mode, iv).encryptor()
+        return enc.update(data) + enc.finalize()
+
+    @classmethod
+    def aes_decrypt(cls, key, mode, iv, data):
+        dec = cls._cipher(algorithms.AES(key), mode, iv).decryptor()
+        return dec.update(data) + dec.finalize()
+
+    @staticmethod
+    def gcm_encrypt(key, nonce, data, aad):
+        return AESGCM(key).encrypt(nonce, data, aad or None)
+
+    @staticmethod
+    def gcm_decrypt(key, nonce, data, aad):
+        from cryptography.exceptions import InvalidTag
+        try:
+            return AESGCM(key).decrypt(nonce, data, aad or None)
+        except InvalidTag:
+            return None
+
+    # cryptography dropped single DES, TripleDES with K1=K2=K3 is the same cipher
+    @classmethod
+    def des_encrypt(cls, key, mode, iv, data):
+        enc = cls._cipher(TripleDES(key * 3), mode, iv).encryptor()
+        return enc.update(data) + enc.finalize()
+
+    @classmethod
+    def des_decrypt(cls, key, mode, iv, data):
+        dec = cls._cipher(TripleDES(key * 3), mode, iv).decryptor()
+        return dec.update(data) + dec.finalize()
+
+
+_BACKENDS = {
+    BACKEND_CRYPTODOME: _CryptodomeBackend,
+    BACKEND_CRYPTOGRAPHY: _CryptographyBackend,
+    BACKEND_PYTHON: _PythonBackend,
+}
+
+
+def get_backend(name=None):
+    """
+    Returns the backend class, name defaults to the fastest importable one.
+    Raises ValueError for an unknown name and ImportError when the library
+    of the named backend is not installed.
+    """
+    name = name or BACKEND
+    if name not in _BACKENDS:
+        raise ValueError('Unknown crypto backend: {0}'.format(name))
+    try:
+        _load(name)
+    except ImportError as e:
+        raise ImportError('Crypto backend {0} is not available: {1}'.format(name, e))
+    return _BACKENDS[name]
+
+
+def aes_cbc_encrypt(key, iv, data, padding=True, backend=None):
+    data = pkcs7_pad(data) if padding else _b(data)
+    return get_backend(backend).aes_encrypt(_b(key), 'cbc', _b(iv), data)
+
+
+def aes_cbc_decrypt(key, iv, data, padding=True, backend=None):
+    plain = get_backend(backend).aes_decrypt(_b(key), 'cbc', _b(iv), _b(data))
+    return pkcs7_unpad(plain) if padding else plain
+
+
+def aes_ecb_encrypt(key, data, padding=False, backend=None):
+    data = pkcs7_pad(data) if padding else _b(data)
+    return get_backend(backend).aes_encrypt(_b(key), 'ecb', None, data)
+
+
+def aes_ecb_decrypt(key, data, padding=False, backend=None):
+    plain = get_backend(backend).aes_decrypt(_b(key), 'ecb', None, _b(data))
+    return pkcs7_unpad(plain) if padding else plain
+
+
+def aes_gcm_encrypt(key, nonce, data, aad=b'', backend=None):
+    """Returns the ciphertext with the 16 byte tag appended."""
+    return get_backend(backend).gcm_encrypt(_b(key), _b(nonce), _b(data), _b(aad))
+
+
+def aes_gcm_decrypt(key, nonce, data, aad=b'', backend=None):
+    """data is the ciphertext with the 16 byte tag appended. Returns None if the tag does not match."""
+    return get_backend(backend).gcm_decrypt(_b(key), _b(nonce), _b(data), _b(aad))
+
+
+def des_encrypt(key, data, iv=None, padding=True, backend=None):
+    data = pkcs7_pad(data, 8) if padding else _b(data)
+    return get_backend(backend).des_encrypt(_b(key), 'cbc' if iv else 'ecb', iv and _b(iv), data)
+
+
+def des_decrypt(key, data, iv=None, padding=True, backend=None):
+    plain = get_backend(backend).des_decrypt(_b(key), 'cbc' if iv else 'ecb', iv and _b(iv), _b(data))
+    return pkcs7_unpad(plain, 8) if padding else plain
+
+
+def evp_kdf(passwd, salt, key_size=32, iv_size=16, iterations=1, hash_algorithm='md5'):
+    """OpenSSL EVP_BytesToKey, returns (key, iv)."""
+    passwd = _b(passwd)
+    salt = _b(salt)
+    derived = b''
+    block = b''
+    while len(derived) < key_size + iv_size:
+        block = hashlib.new(hash_algorithm, block + passwd + salt).digest()
+        for _ in range(1, iterations):
+            block = hashlib.new(hash_algorithm, block).digest()
+        derived += block
+    return derived[:key_size], derived[key_size:key_size + iv_size]
+
+
+def evp_decrypt(ciphertext, passphrase, salt=None, backend=None):
+    """Decrypts a base64 CryptoJS/OpenSSL 'Salted__' AES-CBC payload."""
+    ciphertext = base64.b64decode(ciphertext)
+    if not salt:
+        salt = ciphertext[8:16]
+        ciphertext = ciphertext[16:]
+    key, iv = evp_kdf(passphrase, salt)
+    return aes_cbc_decrypt(key, iv, ciphertext, backend=backend)
+
+
+def evp_encrypt(plaintext, passphrase, salt=None, backend=None):
+    import os
+    salt = _b(salt) if salt else os.urandom(8)
+    key, iv = evp_kdf(passphrase, salt)
+    return base64.b64encode(b'Salted__' + salt + aes_cbc_encrypt(key, iv, plaintext, backend=backend))
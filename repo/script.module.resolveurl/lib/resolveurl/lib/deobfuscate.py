@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+    ResolveURL Addon for Kodi
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+    Javascript deobfuscation shared by the resolvers and the add-ons that
+    import resolveurl. One scan over the page finds the obfuscated blocks
+    (p.a.c.k.e.r, h.u.n.t.e.r, JuicyCodes, aaencode, jjencode, w.i.s.e) and
+    hands each one to its decoder. Decoded blocks are kept in an LRU keyed by
+    the hash of the block, so an embed page seen again is not decoded again.
+
+    usage:
+
+    from resolveurl.lib import deobfuscate
+    html += deobfuscate.unpack(html)          # packed blocks only
+    html += deobfuscate.scan(html)            # every known encoding
+    for kind, text in deobfuscate.iter_blocks(html):
+        ...
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+PACKER = 'packer'
+HUNTER = 'hunter'
+JUICY = 'juicy'
+JUICY2 = 'juicy2'
+AADECODE = 'aadecode'
+JJDECODE = 'jjdecode'
+UNWISE = 'unwise'
+
+KINDS = (PACKER, HUNTER, JUICY, JUICY2, AADECODE, JJDECODE, UNWISE)
+CACHE_SIZE = 128
+
+# cheap checks that tell which decoders have anything to do, the eval based
+# encodings are told apart by one regex with a literal prefix
+_EVAL_MARKER = re.compile(
+    r'eval\s*\(\s*function\s*\(\s*(?:(?P<packer>p\s*,\s*a\s*,\s*c\s*,\s*k\s*,\s*e)'
+    r'|(?P<hunter>h\s*,\s*u\s*,\s*n\s*,\s*t\s*,\s*e\s*,\s*r)|(?P<unwise>w\s*,\s*i\s*,\s*s\s*,\s*e))'
+)
+_LOWER_MARKERS = ((JUICY, 'juicycodes.run('), (JUICY2, '_juicycodes('))
+_MARKERS = ((AADECODE, u'ﾟωﾟﾉ'), (JJDECODE, '=~[];'))
+_BLOCKS = {
+    PACKER: re.compile(r'(eval\s*\(function\(p,a,c,k,e,.*?)</script>', re.S | re.I),
+    HUNTER: re.compile(r'(eval\s*\(\s*function\s*\(\s*h\s*,\s*u\s*,\s*n\s*,\s*t\s*,\s*e\s*,\s*r.*?)(?:</script>|$)', re.S),
+    JUICY: re.compile(r'(JuicyCodes\.Run.+?[;\n<])', re.S | re.I),
+    JUICY2: re.compile(r'(_juicycodes\(.+?[;\n<])', re.S | re.I),
+    AADECODE: re.compile(r'(ﾟωﾟﾉ\s*=.+?\(\'_\'\);)', re.S),
+    JJDECODE: re.compile(r'(?<![\w$])([\w$]{1,16}=~\[\];.+?\(\)\)\(\);)', re.S),
+    UNWISE: re.compile(r';?eval\s*\(\s*function\s*\(\s*w\s*,\s*i\s*,\s*s\s*,\s*e\s*\).+?[\"\']\s*\)\s*\)(?:\s*;)?', re.S),
+}
+_PACKER_START = re.compile(r'eval\s*\(function\(p,a,c,k,e,', re.S | re.I)
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _decode_packer(block):
+    from resolveurl.lib import jsunpack
+    # a block can hold several packed scripts back to back
+    if len(_PACKER_START.findall(block)) == 1:
+        parts = [block]
+    else:
+        parts = ['eval' + x for x in block.split('eval') if x]
+    return ''.join(jsunpack.unpack(part) for part in parts if jsunpack.detect(part))
+
+
+def _decode_hunter(block):
+    from resolveurl.lib import jsunhunt
+    return jsunhunt.unhunt(block)
+
+
+def _decode_juicy(block):
+    from resolveurl.lib import unjuice
+    return unjuice.run(block) if unjuice.test(block) else ''
+
+
+def _decode_juicy2(block):
+    from resolveurl.lib import unjuice2
+    return unjuice2.run(block) if unjuice2.test(block) else ''
+
+
+def _decode_aadecode(block):
+    from resolveurl.lib import aadecode
+    return aadecode.decode(block)
+
+
+def _decode_jjdecode(block):
+    from resolveurl.lib.jjdecode import JJDecoder
+    return JJDecoder(block).decode()
+
+
+def _decode_unwise(block):
+    from resolveurl.lib import unwise
+    return unwise.unwise_process(block)
+
+
+_DECODERS = {
+    PACKER: _decode_packer,
+    HUNTER: _decode_hunter,
+    JUICY: _decode_juicy,
+    JUICY2: _decode_juicy2,
+    AADECODE: _decode_aadecode,
+    JJDECODE: _decode_jjdecode,
+    UNWISE: _decode_unwise,
+}
+
+
+def _cache_key(kind, block):
+    data = block if isinstance(block, bytes) else block.encode('utf-8', 'ignore')
+    return kind, hashlib.sha1(data).hexdigest()
+
+
+def decode(kind, block):
+    """
+    Decodes one obfuscated block with the decoder for kind. Results are cached
+    by the hash of the block, decoder errors are raised and not cached.
+    """
+    key = _cache_key(kind, block)
+    with _cache_lock:
+        if key in _cache:
+            _cache[key] = _cache.pop(key)
+            return _cache[key]
+
+    text = _DECODERS[kind](block) or ''
+
+    with _cache_lock:
+        _cache[key] = text
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def detect(html, kinds=KINDS):
+    """Returns the kinds of obfuscation found in html."""
+    found = set(kind for kind, marker in _MARKERS if marker in html)
+    if 'eval' in html:
+        found.update(match.lastgroup for match in _EVAL_MARKER.finditer(html))
+    if 'uicy' in html or 'UICY' in html:
+        lowered = html.lower()
+        found.update(kind for kind, marker in _LOWER_MARKERS if marker in lowered)
+    return [kind for kind in kinds if kind in found]
+
+
+def iter_blocks(html, kinds=KINDS, strict=False):
+    """
+    Yields (kind, decoded text) for every obfuscated block in html. A block
+    that fails to decode is skipped unless strict is set.
+    """
+    for kind in detect(html, kinds):
+        regex = _BLOCKS[kind]
+        for match in regex.finditer(html):
+            try:
+                text = decode(kind, match.group(1) if regex.groups else match.group(0))
+            except Exception:
+                if strict:
+                    raise
+                continue
+            if text:
+                yield kind, text
+
+
+def scan(html, kinds=KINDS, strict=False):
+    """Returns the decoded text of every obfuscated block in html, joined."""
+    return ''.join(text for _, text in iter_blocks(html, kinds, strict))
+
+
+def unpack(html, strict=True):
+    """Returns the unpacked p.a.c.k.e.r blocks of html, joined."""
+    return scan(html, (PACKER,), strict)
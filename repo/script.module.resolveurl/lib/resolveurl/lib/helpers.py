@@ -20,7 +20,7 @@ import base64
 import re
 import six
 import xbmcgui
-from resolveurl.lib import jsunpack, unjuice, unjuice2
+from resolveurl.lib import deobfuscate
 from six.moves import urllib_parse, urllib_request, urllib_error
 from resolveurl import common
 from resolveurl.resolver import ResolverError
@@ -83,38 +83,15 @@ def append_headers(headers):
 
 
 def get_packed_data(html):
-    packed_data = ''
-    for match in re.finditer(r'''(eval\s*\(function\(p,a,c,k,e,.*?)</script>''', html, re.DOTALL | re.I):
-        r = match.group(1)
-        t = re.findall(r'(eval\s*\(function\(p,a,c,k,e,)', r, re.DOTALL | re.IGNORECASE)
-        if len(t) == 1:
-            if jsunpack.detect(r):
-                packed_data += jsunpack.unpack(r)
-        else:
-            t = r.split('eval')
-            t = ['eval' + x for x in t if x]
-            for r in t:
-                if jsunpack.detect(r):
-                    packed_data += jsunpack.unpack(r)
-    return packed_data
+    return deobfuscate.unpack(html)
 
 
 def get_juiced_data(html):
-    juiced_data = ''
-    for match in re.finditer(r'(JuicyCodes\.Run.+?[;\n<])', html, re.DOTALL | re.I):
-        if unjuice.test(match.group(1)):
-            juiced_data += unjuice.run(match.group(1))
-
-    return juiced_data
+    return deobfuscate.scan(html, (deobfuscate.JUICY,), strict=True)
 
 
 def get_juiced2_data(html):
-    juiced_data = ''
-    for match in re.finditer(r'(_juicycodes\(.+?[;\n<])', html, re.DOTALL | re.I):
-        if unjuice2.test(match.group(1)):
-            juiced_data += unjuice2.run(match.group(1))
-
-    return juiced_data
+    return deobfuscate.scan(html, (deobfuscate.JUICY2,), strict=True)
 
 
 def sort_sources_list(sources):
@@ -37,15 +37,16 @@ import re
 import binascii
 from six import PY2
 
+DETECT_RE = re.compile(
+    r"eval[ ]*\([ ]*function[ ]*\([ ]*p[ ]*,[ ]*a[ ]*,[ ]*c["
+    r" ]*,[ ]*k[ ]*,[ ]*e[ ]*,[ ]*"
+)
+ARGS_RE = re.compile(r"}\s*\('(.*)',\s*(.*?),\s*(\d+),\s*'(.*?)'\.split\('\|'\)", re.DOTALL)
+
 
 def detect(source):
     """Detects whether `source` is P.A.C.K.E.R. coded."""
-    mystr = re.search(
-        r"eval[ ]*\([ ]*function[ ]*\([ ]*p[ ]*,[ ]*a[ ]*,[ ]*c["
-        r" ]*,[ ]*k[ ]*,[ ]*e[ ]*,[ ]*",
-        source,
-    )
-    return mystr is not None
+    return DETECT_RE.search(source) is not None
 
 
 def unpack(source):
@@ -90,8 +91,7 @@ def unpack(source):
 
 def _filterargs(source):
     """Juice from a source file the four args needed by decoder."""
-    argsregex = r"}\s*\('(.*)',\s*(.*?),\s*(\d+),\s*'(.*?)'\.split\('\|'\)"
-    args = re.search(argsregex, source, re.DOTALL).groups()
+    args = ARGS_RE.search(source).groups()
 
     try:
         payload, radix, count, symtab = args
@@ -19,7 +19,7 @@
 import json
 from six.moves import urllib_parse
 from resolveurl.lib import helpers
-from resolveurl.lib.aesgcm import python_aesgcm
+from resolveurl.lib import crypto
 from resolveurl import common
 from resolveurl.resolver import ResolveUrl, ResolverError
 
@@ -50,8 +50,7 @@ class F16PxResolver(ResolveUrl):
             iv = self.ft(pd.get('iv'))
             key = self.xn(pd.get('key_parts'))
             pl = self.ft(pd.get('payload'))
-            cipher = python_aesgcm.new(key)
-            ct = cipher.open(iv, pl)
+            ct = crypto.aes_gcm_decrypt(key, iv, pl)
             ct = json.loads(ct.decode('latin-1'))
             sources = ct.get('sources')
             if sources:
@@ -83,7 +83,7 @@ class MoflixStreamResolver(ResolveUrl):
     def mf_decrypt(self, data):
         import base64
         import binascii
-        from resolveurl.lib import pyaes
+        from resolveurl.lib import crypto
         """
         (c) 2025 yogesh-hacker
         """
@@ -91,8 +91,6 @@ class MoflixStreamResolver(ResolveUrl):
         key = binascii.unhexlify('70736e63314a4c745836495465456a536967504e4855577947596f7856417a51')
         data = base64.b64decode(data)
         # Decrypt using AES-CBC
-        decryptor = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(key, data[:16]))
-        ddata = decryptor.feed(data[16:])
-        ddata += decryptor.feed()
+        ddata = crypto.aes_cbc_decrypt(key, data[:16], data[16:])
 
         return ddata.decode('utf-8')
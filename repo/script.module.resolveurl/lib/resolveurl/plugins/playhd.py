@@ -19,9 +19,10 @@
 import re
 import json
 import codecs
+import six
 from resolveurl import common
 from resolveurl.lib import helpers
-from resolveurl.lib.jscrypto import jscrypto
+from resolveurl.lib import crypto
 from resolveurl.resolver import ResolveUrl, ResolverError
 
 
@@ -42,7 +43,7 @@ class PlayHDResolver(ResolveUrl):
             data = json.loads(r.group(1))
             ct = data.get('ct', False)
             salt = codecs.decode(data.get('s'), 'hex')
-            html2 = jscrypto.decode(ct, 'GDPlayer-JASm(8234_)9312HJASi23lakka', salt)
+            html2 = six.ensure_str(crypto.evp_decrypt(ct, 'GDPlayer-JASm(8234_)9312HJASi23lakka', salt))
             html2 = html2[1:-1].replace('\\"', '"')
             s = re.search(r'{\s*url:\s*"([^"]+)', html2)
             if s:
@@ -54,11 +54,9 @@ class VidBasicResolver(ResolveUrl):
     @staticmethod
     def vb_decrypt(data):
         import six
-        from resolveurl.lib import pyaes
+        from resolveurl.lib import crypto
         data = helpers.b64decode(data, binary=True)
         key = six.b('94588293375053432799222445521289')
         iv = six.b('5259228356829423')
-        decryptor = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(key, iv))
-        ddata = decryptor.feed(data)
-        ddata += decryptor.feed()
+        ddata = crypto.aes_cbc_decrypt(key, iv, data)
         return ddata.decode('utf-8')
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+# ------------------------------------------------------------------------------- #
+
+CLEARANCE_COOKIES = ('cf_clearance', '__cfduid', '__cf_bm')
+CLEARANCE_FILE = 'cf_clearance.json'
+
+# cf_clearance without an expiry is kept this long
+DEFAULT_TTL = 30 * 60
+
+# one lock per file, shared by every ClearanceStore on that path
+_locks = {}
+_locks_lock = threading.Lock()
+
+# ------------------------------------------------------------------------------- #
+
+
+def _path_lock(path):
+    path = os.path.abspath(path)
+    with _locks_lock:
+        if path not in _locks:
+            _locks[path] = threading.Lock()
+        return _locks[path]
+
+# ------------------------------------------------------------------------------- #
+
+
+def default_path():
+    # special://temp is shared by every add-on, so a clearance solved by one
+    # scraper is reused by all the others
+    try:
+        import xbmcvfs
+        base = xbmcvfs.translatePath('special://temp')
+    except ImportError:
+        base = tempfile.gettempdir()
+    except AttributeError:
+        import xbmc
+        base = xbmc.translatePath('special://temp')
+
+    return os.path.join(base, CLEARANCE_FILE)
+
+# ------------------------------------------------------------------------------- #
+
+
+class ClearanceStore(object):
+    """
+    Cloudflare clearance cookies on disk, keyed by domain and User-Agent as
+    cf_clearance is only valid for the User-Agent that solved the challenge.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        self._lock = _path_lock(self.path)
+        self._stamp = None
+        self._entries = {}
+
+    # ------------------------------------------------------------------------------- #
+
+    @staticmethod
+    def key(domain, user_agent):
+        return '{}|{}'.format(domain, user_agent)
+
+    # ------------------------------------------------------------------------------- #
+
+    def _read(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._stamp, self._entries = None, {}
+            return self._entries
+
+        stamp = (st.st_mtime, st.st_size)
+        if stamp != self._stamp:
+            try:
+                with open(self.path, 'r') as f:
+                    self._entries = json.load(f)
+            except (IOError, OSError, ValueError):
+                self._entries = {}
+            self._stamp = stamp
+
+        return self._entries
+
+    # ------------------------------------------------------------------------------- #
+
+    def get(self, domain, user_agent):
+        with self._lock:
+            entry = self._read().get(self.key(domain, user_agent))
+
+        if not entry or entry.get('expires', 0) <= time.time():
+            return []
+
+        return entry.get('cookies', [])
+
+    # ------------------------------------------------------------------------------- #
+
+    def set(self, domain, user_agent, cookies):
+        now = time.time()
+        expires = min(
+            [c['expires'] for c in cookies if c['name'] == 'cf_clearance' and c.get('expires')] or [now + DEFAULT_TTL]
+        )
+
+        with self._lock:
+            entries = dict(
+                (k, v) for k, v in self._read().items() if v.get('expires', 0) > now
+            )
+            entries[self.key(domain, user_agent)] = {'expires': expires, 'cookies': cookies}
+
+            try:
+                fd, tmp = tempfile.mkstemp(
+                    prefix=os.path.basename(self.path) + '.', suffix='.tmp', dir=os.path.dirname(self.path) or '.'
+                )
+            except (IOError, OSError):
+                return
+
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp, self.path)
+            except (IOError, OSError):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return
+
+            self._entries, self._stamp = entries, None
@@ -20,7 +20,7 @@ import re, sys, gzip, time, random, base64, traceback
 
 import simplejson as json
 
-from resources.lib.modules import cache, dom_parser, log_utils, control, hunter
+from resources.lib.modules import cache, dom_parser, log_utils, control, hunter, transport
 
 import six
 from six.moves import range as x_range
@@ -28,7 +28,7 @@ from six.moves import range as x_range
 # Py2
 try:
     from urlparse import urlparse, urljoin
-    from urllib import quote, urlencode, quote_plus, addinfourl
+    from urllib import quote, urlencode, quote_plus
     import cookielib
     import urllib2
     from cStringIO import StringIO
@@ -43,7 +43,6 @@ except ImportError:
     import urllib.request as urllib2
     from io import StringIO
     from urllib.parse import urlparse, urljoin, quote, urlencode, quote_plus
-    from urllib.response import addinfourl
     from urllib.error import HTTPError
 
 finally:
@@ -144,81 +143,16 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
         post = bytes(post, encoding='utf-8')
 
     try:
-        handlers = []
-
-        if username is not None and password is not None and not proxy:
-
-            passmgr = urllib2.HTTPPasswordMgrWithDefaultRealm()
-            passmgr.add_password(None, uri=url, user=username, passwd=password)
-            handlers += [urllib2.HTTPBasicAuthHandler(passmgr)]
-            opener = urllib2.build_opener(*handlers)
-            urllib2.install_opener(opener)
-
-        if proxy is not None:
-
-            if username is not None and password is not None:
-
-                passmgr = urllib2.HTTPPasswordMgr()
-
-                passmgr.add_password(None, uri=url, user=username, passwd=password)
-
-                handlers += [
-                    urllib2.ProxyHandler({'http': '{0}'.format(proxy)}), urllib2.HTTPHandler,
-                    urllib2.ProxyBasicAuthHandler(passmgr)
-                ]
-            else:
-                handlers += [urllib2.ProxyHandler({'http':'{0}'.format(proxy)}), urllib2.HTTPHandler]
-            opener = urllib2.build_opener(*handlers)
-            urllib2.install_opener(opener)
-
+        cookies = None
         if output == 'cookie' or output == 'extended' or close is not True:
-
             cookies = cookielib.LWPCookieJar()
-            handlers += [urllib2.HTTPHandler(), urllib2.HTTPSHandler(), urllib2.HTTPCookieProcessor(cookies)]
-
-            opener = urllib2.build_opener(*handlers)
-            urllib2.install_opener(opener)
-
-        try:
-            import platform
-            is_XBOX = platform.uname()[1] == 'XboxOne'
-        except Exception:
-            is_XBOX = False
-
-        #if not verify and sys.version_info >= (2, 7, 12):
-        if not verify:
-            try:
-
-                import ssl
-                ssl_context = ssl._create_unverified_context()
-                handlers += [urllib2.HTTPSHandler(context=ssl_context)]
-                opener = urllib2.build_opener(*handlers)
-                urllib2.install_opener(opener)
 
-            except Exception:
-
-                pass
+        auth = None
+        if username is not None and password is not None:
+            auth = (url, username, password)
 
-        elif verify or is_XBOX:
-
-            try:
-
-                import ssl
-                try:
-                    import _ssl
-                    CERT_NONE = _ssl.CERT_NONE
-                except Exception:
-                    CERT_NONE = ssl.CERT_NONE
-                ssl_context = ssl.create_default_context()
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = CERT_NONE
-                handlers += [urllib2.HTTPSHandler(context=ssl_context)]
-                opener = urllib2.build_opener(*handlers)
-                urllib2.install_opener(opener)
-
-            except Exception:
-
-                pass
+        # certificates were never checked here, verify only chose how not to
+        opener = transport.opener(verify=False, redirect=redirect, proxy=proxy, cookies=cookies, auth=auth)
 
         try:
             headers.update(headers)
@@ -256,28 +190,10 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
         if 'Accept-Encoding' in headers:
             pass
         elif compression and limit is None:
-            headers['Accept-Encoding'] = 'gzip'
+            headers['Accept-Encoding'] = transport.ACCEPT_ENCODING
 
         if redirect is False:
 
-            class NoRedirectHandler(urllib2.HTTPRedirectHandler):
-
-                def http_error_302(self, reqst, fp, code, msg, head):
-
-                    infourl = addinfourl(fp, head, reqst.get_full_url())
-                    infourl.status = code
-                    infourl.code = code
-
-                    return infourl
-
-                http_error_300 = http_error_302
-                http_error_301 = http_error_302
-                http_error_303 = http_error_302
-                http_error_307 = http_error_302
-
-            opener = urllib2.build_opener(NoRedirectHandler())
-            urllib2.install_opener(opener)
-
             try:
                 del headers['Referer']
             except Exception:
@@ -288,7 +204,7 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
 
         try:
 
-            response = urllib2.urlopen(req, timeout=int(timeout))
+            response = opener.open(req, timeout=int(timeout))
 
         except HTTPError as response:
 
@@ -318,7 +234,7 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
                     #req = urllib2.Request(url, data=post, headers=headers)
                     req = Request(url, data=post, headers=headers)
 
-                    response = urllib2.urlopen(req, timeout=int(timeout))
+                    response = opener.open(req, timeout=int(timeout))
 
                 elif error is False:
                     return
@@ -373,7 +289,7 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
                 pass
 
             content = response.headers
-            result = response.read(5242880)
+            result = transport.decode(response.read(5242880), content)
 
             if not as_bytes:
 
@@ -407,7 +323,7 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
 
         elif output == 'json':
 
-            content = json.loads(response.read(5242880))
+            content = json.loads(transport.decode(response.read(5242880), response.headers))
 
             response.close()
 
@@ -423,7 +339,7 @@ def request(url, close=True, redirect=True, error=False, verify=True, proxy=None
                 else:
                     result = response.read(int(limit) * 1024)
             else:
-                result = response.read(5242880)
+                result = transport.decode(response.read(5242880), response.headers)
 
         if close is True:
             response.close()
@@ -870,14 +786,18 @@ class bfcookie:
 
     def _decrypt(self, msg, key, iv):
         from binascii import unhexlify, hexlify
-        import pyaes
         msg = unhexlify(msg)
         key = unhexlify(key)
         iv = unhexlify(iv)
         if len(iv) != 16: return False
-        decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(key, iv))
-        plain_text = decrypter.feed(msg)
-        plain_text += decrypter.feed()
+        try:
+            from resolveurl.lib import crypto
+            plain_text = crypto.aes_cbc_decrypt(key, iv, msg)
+        except ImportError:
+            import pyaes
+            decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(key, iv))
+            plain_text = decrypter.feed(msg)
+            plain_text += decrypter.feed()
         f = hexlify(plain_text)
         return f
 
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+'''
+ ***********************************************************
+ * The Crew Add-on
+ *
+ *
+ * @file hostindex.py
+ * @package script.module.thecrew
+ *
+ * @copyright (c) 2025, The Crew
+ * @license GNU General Public License, version 3 (GPL-3.0)
+ *
+ ********************************************************cm*
+'''
+
+'''
+    Index over a host list (hostDict / hostprDict) for source_utils.is_host_valid.
+
+    A url's host is valid when it is part of one of the domains. The index
+    answers that with a set lookup for exact and parent domains and falls
+    back to one substring search over all domains joined, instead of a
+    python loop over the whole list per url. Results are remembered per host
+    and per url, the index itself is built once per list.
+'''
+
+import re
+import threading
+
+from bisect import bisect_right
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+EXCLUDED = re.compile(r'\.(?:rar|zip|iso)\.|\.(?:rar|zip|idx|sub|srt)\Z|sample|trailer|zippyshare|facebook|youtu')
+NETLOC = re.compile(r'(?:https?:)?//([^/?#]+)')
+TOP_DOMAIN = re.compile(r'(?:www\.)?([\w\-]*\.[\w\-]{2,3}(?:\.[\w\-]{2,3})?)$')
+
+URL_CACHE_SIZE = 4096
+HOST_CACHE_SIZE = 8192
+MAX_INDEXES = 8
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def top_domain(url):
+    if not (url.startswith('//') or url.startswith('http://') or url.startswith('https://')):
+        url = '//' + url
+    netloc = NETLOC.match(url)
+    if netloc and '[' not in netloc.group(1):
+        domain = netloc.group(1)
+    else:
+        elements = urlparse(url)
+        domain = elements.netloc or elements.path
+    domain = domain.split('@')[-1].split(':')[0]
+    res = TOP_DOMAIN.search(domain)
+    if res: domain = res.group(1)
+    return domain.lower()
+
+
+class HostIndex(object):
+
+    def __init__(self, domains):
+        self.domains = [domain.lower() for domain in domains]
+        self.exact = set(self.domains)
+        self.suffixes = set()
+        for domain in self.domains:
+            parts = domain.split('.')
+            for i in range(1, len(parts) - 1):
+                self.suffixes.add('.'.join(parts[i:]))
+        self.joined = '\n'.join(self.domains)
+        self.starts = []
+        pos = 0
+        for domain in self.domains:
+            self.starts.append(pos)
+            pos += len(domain) + 1
+        self._hosts = {}
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def first_match(self, host):
+        '''Returns the first domain that contains host, None if there is none.'''
+        if '\n' in host:
+            return next((d for d in self.domains if host in d), None)
+        pos = self.joined.find(host)
+        if pos < 0:
+            return None
+        return self.domains[bisect_right(self.starts, pos) - 1]
+
+    def match(self, host):
+        '''
+        Returns a domain containing host or None. For hosts with a dot any
+        match will do, so exact and parent domains are answered from sets.
+        '''
+        try:
+            return self._hosts[host]
+        except KeyError:
+            pass
+        if '.' in host and (host in self.exact or host in self.suffixes):
+            domain = host
+        else:
+            domain = self.first_match(host)
+        if len(self._hosts) >= HOST_CACHE_SIZE:
+            self._hosts.clear()
+        self._hosts[host] = domain
+        return domain
+
+    def check(self, url):
+        if EXCLUDED.search(url):
+            return False, ''
+        host = top_domain(url)
+        domain = self.match(host) if host else None
+        if domain is None:
+            return False, host
+        if '.' not in host:
+            host = domain
+        if any(h in host for h in ('google', 'picasa', 'blogspot')):
+            host = 'gvideo'
+        if any(h in host for h in ('akamaized', 'ocloud')):
+            host = 'CDN'
+        return True, host
+
+    def is_valid(self, url):
+        '''Same result as the former is_host_valid for a lowercased url.'''
+        with self._lock:
+            result = self._urls.get(url)
+            if result is not None:
+                self._urls.move_to_end(url)
+                return result
+        result = self.check(url)
+        with self._lock:
+            self._urls[url] = result
+            if len(self._urls) > URL_CACHE_SIZE:
+                self._urls.popitem(last=False)
+        return result
+
+
+def get(domains):
+    '''Returns the index for a host list, built the first time the list is seen.'''
+    key = id(domains)
+    with _lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0] is domains and entry[1] == len(domains):
+            _indexes.move_to_end(key)
+            return entry[2]
+    index = HostIndex(domains)
+    with _lock:
+        _indexes[key] = (domains, len(domains), index)
+        if len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def _legacy_top_domain(url):
+    if not (url.startswith('//') or url.startswith('http://') or url.startswith('https://')):
+        url = '//' + url
+    elements = urlparse(url)
+    domain = elements.netloc or elements.path
+    domain = domain.split('@')[-1].split(':')[0]
+    res = re.search(r'(?:www\.)?([\w\-]*\.[\w\-]{2,3}(?:\.[\w\-]{2,3})?)$', domain)
+    if res: domain = res.group(1)
+    return domain.lower()
+
+
+def _legacy_is_host_valid(url, domains):
+    # is_host_valid before the index, kept for the benchmark
+    url = url.lower()
+    if any(x in url for x in ['.rar.', '.zip.', '.iso.']) or any(url.endswith(x) for x in ['.rar', '.zip', '.idx', '.sub', '.srt']):
+        return False, ''
+    if any(x in url for x in ['sample', 'trailer', 'zippyshare', 'facebook', 'youtu']):
+        return False, ''
+    host = _legacy_top_domain(url)
+    hosts = [domain.lower() for domain in domains if host and host in domain.lower()]
+    if hosts and '.' not in host:
+        host = hosts[0]
+    if hosts and any([h for h in ['google', 'picasa', 'blogspot'] if h in host]):
+        host = 'gvideo'
+    if hosts and any([h for h in ['akamaized','ocloud'] if h in host]):
+        host = 'CDN'
+    return any(hosts), host
+
+
+def benchmark(urls, domains):
+    '''Times the legacy scan against the index over urls and checks they agree.'''
+    import time
+
+    start = time.time()
+    legacy = [_legacy_is_host_valid(url, domains) for url in urls]
+    legacy_time = time.time() - start
+
+    start = time.time()
+    index = get(domains)
+    indexed = [index.is_valid(url.lower()) for url in urls]
+    indexed_time = time.time() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, indexed) if a != b)
+    print('%d urls, %d domains' % (len(urls), len(domains)))
+    print('legacy: %.3fs, index: %.3fs (%.1fx), %d mismatches' % (
+        legacy_time, indexed_time, legacy_time / max(indexed_time, 1e-9), mismatches))
+    return mismatches
+
+
+if __name__ == '__main__':
+    # python hostindex.py [urls.txt [domains.txt]], one entry per line. Without
+    # files a 20k url set is generated from the same shape scrapers return.
+    import random
+    import sys
+
+    def read(path):
+        with open(path) as f:
+            return [line.strip() for line in f if line.strip()]
+
+    rnd = random.Random(42)
+    if len(sys.argv) > 2:
+        domains = read(sys.argv[2])
+    else:
+        tlds = ['com', 'net', 'to', 'co', 'io', 'tv', 'cc', 'me', 'org', 'co.uk']
+        domains = ['%s%d.%s' % (rnd.choice(['vid', 'stream', 'up', 'file', 'mix', 'dood', 'fast']), i, rnd.choice(tlds))
+                   for i in range(600)]
+        domains += ['google.com', 'drive.google.com', 'ok.ru', 'mail.ru', 'akamaized.net']
+    if len(sys.argv) > 1:
+        urls = read(sys.argv[1])
+    else:
+        hosts = [rnd.choice(domains) for _ in range(300)] + ['unknown%d.com' % i for i in range(100)]
+        urls = []
+        for i in range(20000):
+            host = rnd.choice(hosts)
+            prefix = rnd.choice(['https://', 'http://www.', '//', 'https://cdn.'])
+            suffix = rnd.choice(['/e/%x' % rnd.getrandbits(40), '/movie.%d.mkv' % i, '/sample.mp4', '/f/%d.rar' % i, '/embed-%d.html' % i])
+            urls.append(prefix + host + suffix)
+    sys.exit(1 if benchmark(urls, domains) else 0)
@@ -662,14 +662,18 @@ class bfcookie:
 
     def _decrypt(self, msg, key, iv):
         from binascii import unhexlify, hexlify
-        import pyaes
         msg = unhexlify(msg)
         key = unhexlify(key)
         iv = unhexlify(iv)
         if len(iv) != 16: return False
-        decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(key, iv))
-        plain_text = decrypter.feed(msg)
-        plain_text += decrypter.feed()
+        try:
+            from resolveurl.lib import crypto
+            plain_text = crypto.aes_cbc_decrypt(key, iv, msg)
+        except ImportError:
+            import pyaes
+            decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(key, iv))
+            plain_text = decrypter.feed(msg)
+            plain_text += decrypter.feed()
         f = hexlify(plain_text)
         return f
 
@@ -22,11 +22,12 @@ import six
 
 
 
-from urllib.parse import urlparse, unquote, quote_plus
+from urllib.parse import unquote, quote_plus
 
 from resources.lib.modules import cleantitle
 from resources.lib.modules import client
 from resources.lib.modules import directstream
+from resources.lib.modules import hostindex
 from resources.lib.modules import trakt
 from resources.lib.modules import pyaes
 from resources.lib.modules import log_utils
@@ -391,36 +392,11 @@ def strip_domain(url):
 def is_host_valid(url, domains):
     try:
         url = six.ensure_str(url).lower()
-        if any(x in url for x in ['.rar.', '.zip.', '.iso.']) or any(url.endswith(x) for x in ['.rar', '.zip', '.idx', '.sub', '.srt']):
-            return False, ''
-        if any(x in url for x in ['sample', 'trailer', 'zippyshare', 'facebook', 'youtu']):
-            return False, ''
-        host = __top_domain(url)
-        hosts = [domain.lower() for domain in domains if host and host in domain.lower()]
-
-        if hosts and '.' not in host:
-            host = hosts[0]
-        if hosts and any([h for h in ['google', 'picasa', 'blogspot'] if h in host]):
-            host = 'gvideo'
-        if hosts and any([h for h in ['akamaized','ocloud'] if h in host]):
-            host = 'CDN'
-        return any(hosts), host
+        return hostindex.get(domains).is_valid(url)
     except:
         return False, ''
 
 
-def __top_domain(url):
-    if not (url.startswith('//') or url.startswith('http://') or url.startswith('https://')):
-        url = '//' + url
-    elements = urlparse(url)
-    domain = elements.netloc or elements.path
-    domain = domain.split('@')[-1].split(':')[0]
-    regex = "(?:www\.)?([\w\-]*\.[\w\-]{2,3}(?:\.[\w\-]{2,3})?)$"
-    res = re.search(regex, domain)
-    if res: domain = res.group(1)
-    domain = domain.lower()
-    return domain
-
 def aliases_to_array(aliases, filter=None):
     try:
         if not filter:
@@ -510,10 +486,14 @@ def evp_decode(cipher_text, passphrase, salt=None):
         salt = cipher_text[8:16]
         cipher_text = cipher_text[16:]
     data = evpKDF(passphrase, salt)
-    decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(data['key'], data['iv']))
-    plain_text = decrypter.feed(cipher_text)
-    plain_text += decrypter.feed()
-    return plain_text
+    try:
+        from resolveurl.lib import crypto
+        return crypto.aes_cbc_decrypt(data['key'], data['iv'], cipher_text)
+    except ImportError:
+        decrypter = pyaes.Decrypter(pyaes.AESModeOfOperationCBC(data['key'], data['iv']))
+        plain_text = decrypter.feed(cipher_text)
+        plain_text += decrypter.feed()
+        return plain_text
 
 
 def evpKDF(passwd, salt, key_size=8, iv_size=4, iterations=1, hash_algorithm="md5"):
@@ -39,6 +39,7 @@ from resources.lib.modules import debrid
 from resources.lib.modules import workers
 from resources.lib.modules import source_utils
 from resources.lib.modules import log_utils
+from resources.lib.sources import load, providers
 
 try:
     from sqlite3 import dbapi2 as database
@@ -358,24 +359,18 @@ class sources:
 
         self.prepareSources()
 
-        sourceDict = self.sourceDict
-
         progressDialog.update(0, control.lang(32600))
 
         content = 'movie' if tvshowtitle == None else 'episode'
         if content == 'movie':
-            sourceDict = [(i[0], i[1], getattr(i[1], 'movie', None)) for i in sourceDict]
             genres = trakt.getGenre('movie', 'imdb', imdb)
         else:
-            sourceDict = [(i[0], i[1], getattr(i[1], 'tvshow', None)) for i in sourceDict]
             genres = trakt.getGenre('show', 'imdb', imdb)
 
-        sourceDict = [(i[0], i[1], i[2]) for i in sourceDict if not hasattr(i[1], 'genre_filter') or not i[1].genre_filter or any(x in i[1].genre_filter for x in genres)]
-        sourceDict = [(i[0], i[1]) for i in sourceDict if not i[2] == None]
-
         language = self.getLanguage()
-        sourceDict = [(i[0], i[1], i[1].language) for i in sourceDict]
-        sourceDict = [(i[0], i[1]) for i in sourceDict if any(x in i[2] for x in language)]
+
+        # filtered on the provider manifest, so only providers that will run get imported
+        sourceDict = providers(content, genres, language)
 
         try:
             sourceDict = [(i[0], i[1], control.setting('provider.' + i[0])) for i in sourceDict]
@@ -383,7 +378,8 @@ class sources:
             sourceDict = [(i[0], i[1], 'true') for i in sourceDict]
         sourceDict = [(i[0], i[1]) for i in sourceDict if not i[2] == 'false']
 
-        sourceDict = [(i[0], i[1], i[1].priority) for i in sourceDict]
+        sourceDict = [(i[0], load(i[0]), i[1]) for i in sourceDict]
+        sourceDict = [i for i in sourceDict if i[1] is not None]
 
         random.shuffle(sourceDict)
         sourceDict = sorted(sourceDict, key=lambda i: i[2])
@@ -1148,7 +1144,8 @@ class sources:
             local = item.get('local', False)
 
             provider = item['provider']
-            call = [i[1] for i in self.sourceDict if i[0] == provider][0]
+            call = load(provider)
+            if call is None: raise Exception()
             u = url = call.resolve(url)
             #if url == None or (not '://' in str(url) and not local and 'magnet:' not in str(url)): raise Exception()
             if not url or (not '://' in url and not 'magnet' in url and not local ): raise Exception()
@@ -1416,10 +1413,6 @@ class sources:
 
         self.metaProperty = 'plugin.video.thecrew.container.meta'
 
-        from resources.lib.sources import sources
-
-        self.sourceDict = sources()
-
         try:
             self.hostDict = resolveurl.relevant_resolvers(order_matters=True)
             self.hostDict = [i.domains for i in self.hostDict if not '*' in i.domains]
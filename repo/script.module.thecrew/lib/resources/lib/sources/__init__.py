@@ -22,33 +22,162 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
-import pkgutil
+import importlib.util
+import json
 import os.path
+import pkgutil
+import sys
+import threading
+import time
 
+from resources.lib.modules import control
 from resources.lib.modules import log_utils
 
 __all__ = [x[1] for x in os.walk(os.path.dirname(__file__))][0]
 
+# What getSources filters on, per provider. Providers are only imported to
+# (re)describe them when their file changed, and for running.
+MANIFEST_VERSION = 1
+manifestFile = os.path.join(control.dataPath, 'providers.manifest.json')
+
+_loaded = {}
+_manifest = None
+_hosters = None
+_lock = threading.RLock()
+
+
+def _discover():
+    found = {}
+    for i in __all__:
+        folder = os.path.join(os.path.dirname(__file__), i)
+        for loader, module_name, is_pkg in pkgutil.iter_modules([folder]):
+            if is_pkg or module_name in found:
+                continue
+            path = os.path.join(folder, module_name + '.py')
+            try:
+                found[module_name] = (path, os.path.getmtime(path))
+            except OSError:
+                pass
+    return found
+
+
+def _import(module_name, path):
+    with _lock:
+        if module_name not in _loaded:
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                _loaded[module_name] = module.source()
+            except Exception as e:
+                log_utils.log('Could not load "%s": %s' % (module_name, e), log_utils.LOGDEBUG)
+                _loaded[module_name] = None
+        return _loaded[module_name]
+
+
+def _describe(source, path, mtime):
+    if source is None:
+        return {'path': path, 'mtime': mtime, 'broken': True}
+    return {
+        'path': path,
+        'mtime': mtime,
+        'language': list(getattr(source, 'language', None) or []),
+        'priority': getattr(source, 'priority', 1),
+        'genre_filter': list(getattr(source, 'genre_filter', None) or []),
+        'movie': getattr(source, 'movie', None) is not None,
+        'tvshow': getattr(source, 'tvshow', None) is not None
+    }
+
+
+def manifest():
+    global _manifest
+    with _lock:
+        if _manifest is not None:
+            return _manifest
+
+        start = time.time()
+        found = _discover()
+        try:
+            with open(manifestFile, 'r') as f:
+                saved = json.load(f)
+            if saved.get('version') != MANIFEST_VERSION:
+                raise ValueError()
+            saved = saved['providers']
+        except Exception:
+            saved = {}
+
+        entries = {}
+        described = 0
+        for module_name, (path, mtime) in found.items():
+            entry = saved.get(module_name)
+            if not entry or entry.get('path') != path or entry.get('mtime') != mtime:
+                entry = _describe(_import(module_name, path), path, mtime)
+                described += 1
+            entries[module_name] = entry
+
+        if described or len(entries) != len(saved):
+            try:
+                tmp = manifestFile + '.tmp'
+                with open(tmp, 'w') as f:
+                    json.dump({'version': MANIFEST_VERSION, 'providers': entries}, f)
+                os.replace(tmp, manifestFile)
+            except Exception:
+                pass
+
+        _manifest = entries
+        log_utils.log('Providers: %d found, %d imported to update the manifest, %.0f ms' % (
+            len(entries), described, (time.time() - start) * 1000))
+        return _manifest
+
+
+def providers(content=None, genres=None, language=None):
+    '''
+    Returns [(module_name, priority)] of the providers for content ('movie' or
+    'episode'), genres and language, decided from the manifest without
+    importing anything.
+    '''
+    result = []
+    for module_name, entry in manifest().items():
+        if entry.get('broken'):
+            continue
+        if content == 'movie' and not entry['movie']:
+            continue
+        if content == 'episode' and not entry['tvshow']:
+            continue
+        if genres is not None and entry['genre_filter'] and not any(x in entry['genre_filter'] for x in genres):
+            continue
+        if language is not None and not any(x in entry['language'] for x in language):
+            continue
+        result.append((module_name, entry['priority']))
+    return result
+
+
+def load(module_name):
+    '''Returns the source instance of a provider, imported once per interpreter.'''
+    entry = manifest().get(module_name)
+    if not entry or entry.get('broken'):
+        return None
+    return _import(module_name, entry['path'])
+
 
 def sources():
     try:
         sourceDict = []
-        for i in __all__:
-            for loader, module_name, is_pkg in pkgutil.walk_packages([os.path.join(os.path.dirname(__file__), i)]):
-                if is_pkg:
-                    continue
-
-                try:
-                    module = loader.find_module(module_name).load_module(module_name)
-                    sourceDict.append((module_name, module.source()))
-                except Exception as e:
-                    log_utils.log('Could not load "%s": %s' % (module_name, e), log_utils.LOGDEBUG)
+        for module_name in manifest():
+            source = load(module_name)
+            if source is not None:
+                sourceDict.append((module_name, source))
         return sourceDict
     except:
         return []
 
 
 def getAllHosters():
+    global _hosters
+    if _hosters is not None:
+        return list(_hosters)
+
     def _sources(sourceFolder, appendList):
         sourceFolderLocation = os.path.join(os.path.dirname(__file__), sourceFolder)
         sourceSubFolders = [x[1] for x in os.walk(sourceFolderLocation)][0]
@@ -66,4 +195,5 @@ def getAllHosters():
     for item in sourceSubFolders:
         if item != 'modules':
             _sources(item, appendList)
-    return list(set(appendList))
+    _hosters = list(set(appendList))
+    return list(_hosters)